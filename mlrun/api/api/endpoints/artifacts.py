@@ -7,7 +7,7 @@ from sqlalchemy.orm import Session
 
 from mlrun.api import schemas
 from mlrun.api.api import deps
-from mlrun.api.api.utils import log_and_raise
+from mlrun.api.api.utils import get_page_size, log_and_raise
 from mlrun.api.utils.singletons.db import get_db
 from mlrun.config import config
 from mlrun.utils import logger
@@ -48,6 +48,32 @@ async def store_artifact(
     return {}
 
 
+# curl -d '{"artifacts": [{"key": "k", "uid": "7", "artifact": {...}}]}' http://localhost:8080/projects/p1/artifacts
+@router.post("/projects/{project}/artifacts")
+async def store_artifacts(
+    request: Request,
+    project: str,
+    auth_verifier: deps.AuthVerifier = Depends(deps.AuthVerifier),
+    db_session: Session = Depends(deps.get_db_session),
+):
+    data = None
+    try:
+        data = await request.json()
+    except ValueError:
+        log_and_raise(HTTPStatus.BAD_REQUEST.value, reason="bad JSON body")
+
+    artifacts = data.get("artifacts", [])
+    logger.debug("Storing artifacts", project=project, count=len(artifacts))
+    await run_in_threadpool(
+        get_db().store_artifacts,
+        db_session,
+        project,
+        artifacts,
+        leader_session=auth_verifier.auth_info.session,
+    )
+    return {}
+
+
 # curl http://localhost:8080/artifact/p1/tags
 @router.get("/projects/{project}/artifact-tags")
 def list_artifact_tags(
@@ -99,19 +125,31 @@ def list_artifacts(
     labels: List[str] = Query([], alias="label"),
     iter: int = Query(None, ge=0),
     best_iteration: bool = Query(False, alias="best-iteration"),
+    page_size: int = Query(None, gt=0),
+    page_token: str = None,
     db_session: Session = Depends(deps.get_db_session),
 ):
-    artifacts = get_db().list_artifacts(
-        db_session,
-        name,
-        project,
-        tag,
-        labels,
+    filters = dict(
+        name=name,
+        project=project,
+        tag=tag,
+        labels=labels,
         kind=kind,
         category=category,
         iter=iter,
         best_iteration=best_iteration,
     )
+    if page_size or page_token:
+        # artifacts are listed last updated first, page by page
+        artifacts, next_page_token = get_db().list_artifacts_page(
+            db_session, get_page_size(page_size), page_token, **filters
+        )
+        return {
+            "artifacts": artifacts,
+            "next_page_token": next_page_token,
+        }
+
+    artifacts = get_db().list_artifacts(db_session, **filters)
     return {
         "artifacts": artifacts,
     }
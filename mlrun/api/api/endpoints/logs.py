@@ -1,9 +1,14 @@
+import typing
+
 from fastapi import APIRouter, Depends, Request, Response
 from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 import mlrun.api.crud as crud
+import mlrun.api.db.session
 from mlrun.api.api import deps
+from mlrun.api.utils.singletons.db import get_db
 
 router = APIRouter()
 
@@ -34,3 +39,29 @@ def get_log(
         "pod_status": run_state,
     }
     return Response(content=log, media_type="text/plain", headers=headers)
+
+
+# curl -N http://localhost:8080/log/prj/7/stream?offset=0
+@router.get("/log/{project}/{uid}/stream")
+async def stream_log(
+    project: str, uid: str, offset: int = 0, since_seconds: typing.Optional[int] = None,
+):
+    """
+    Follow the run log - the new log bytes (starting at offset) are sent as they are written (chunked response),
+    the response ends when the run reaches a terminal state or when the log is idle for a while (the client should
+    get the run state with get log and reconnect if the run is still running)
+    """
+    # fail (404) before the response starts if the run does not exist, the session is not held by the stream
+    await run_in_threadpool(_read_run, project, uid)
+    return StreamingResponse(
+        crud.Logs.stream_logs(project, uid, offset, since_seconds),
+        media_type="text/plain",
+    )
+
+
+def _read_run(project: str, uid: str):
+    db_session = mlrun.api.db.session.create_session()
+    try:
+        return get_db().read_run(db_session, uid, project)
+    finally:
+        mlrun.api.db.session.close_session(db_session)
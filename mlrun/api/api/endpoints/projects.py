@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 
 from mlrun.api import schemas
 from mlrun.api.api import deps
+from mlrun.api.utils.singletons.db import get_db
 from mlrun.api.utils.singletons.project_member import get_project_member
 
 router = fastapi.APIRouter()
@@ -157,3 +158,16 @@ def list_projects(
     return get_project_member().list_projects(
         db_session, owner, format_, labels, state, auth_verifier.auth_info.session
     )
+
+
+# curl -X POST http://localhost:8080/projects/counters/rebuild
+@router.post(
+    "/projects/counters/rebuild", status_code=HTTPStatus.NO_CONTENT.value,
+)
+def rebuild_projects_counters(
+    auth_verifier: deps.AuthVerifier = fastapi.Depends(deps.AuthVerifier),
+    db_session: Session = fastapi.Depends(deps.get_db_session),
+):
+    """recompute the projects resources counters (used for the projects summaries) from the resources"""
+    get_db().rebuild_project_resources_counters(db_session)
+    return fastapi.Response(status_code=HTTPStatus.NO_CONTENT.value)
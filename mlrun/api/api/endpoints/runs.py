@@ -1,13 +1,14 @@
 from http import HTTPStatus
 from typing import List
 
-from fastapi import APIRouter, Depends, Query, Request
+import orjson
+from fastapi import APIRouter, Depends, Query, Request, Response
 from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 import mlrun.api.crud
 from mlrun.api.api import deps
-from mlrun.api.api.utils import log_and_raise
+from mlrun.api.api.utils import get_page_size, log_and_raise
 from mlrun.api.utils.singletons.db import get_db
 from mlrun.utils import logger
 from mlrun.utils.helpers import datetime_from_iso
@@ -72,6 +73,31 @@ async def update_run(
     return {}
 
 
+# curl -X PATCH -d '{"runs": [{"uid": "3", "iter": 0, "updates": {"status.state": "completed"}}]}'
+#   http://localhost:8080/projects/p1/runs
+@router.patch("/projects/{project}/runs")
+async def update_runs(
+    request: Request,
+    project: str,
+    auth_verifier: deps.AuthVerifier = Depends(deps.AuthVerifier),
+    db_session: Session = Depends(deps.get_db_session),
+):
+    data = None
+    try:
+        data = await request.json()
+    except ValueError:
+        log_and_raise(HTTPStatus.BAD_REQUEST.value, reason="bad JSON body")
+
+    await run_in_threadpool(
+        mlrun.api.crud.Runs().update_runs,
+        db_session,
+        project,
+        data.get("runs", []),
+        auth_verifier.auth_info.session,
+    )
+    return {}
+
+
 # curl http://localhost:8080/run/p1/3
 @router.get("/run/{project}/{uid}")
 def read_run(
@@ -113,26 +139,39 @@ def list_runs(
     start_time_to: str = None,
     last_update_time_from: str = None,
     last_update_time_to: str = None,
+    page_size: int = Query(None, gt=0),
+    page_token: str = None,
     db_session: Session = Depends(deps.get_db_session),
 ):
-    runs = get_db().list_runs(
-        db_session,
+    filters = dict(
         name=name,
         uid=uid,
         project=project,
         labels=labels,
         state=state,
-        sort=sort,
-        last=last,
         iter=iter,
         start_time_from=datetime_from_iso(start_time_from),
         start_time_to=datetime_from_iso(start_time_to),
         last_update_time_from=datetime_from_iso(last_update_time_from),
         last_update_time_to=datetime_from_iso(last_update_time_to),
     )
-    return {
-        "runs": runs,
-    }
+    # the runs are returned as the (JSON) bodies stored in the DB, without decoding and encoding them
+    if page_size or page_token:
+        # runs are listed newest first, page by page
+        runs, next_page_token = get_db().list_runs_page_json(
+            db_session, get_page_size(page_size), page_token, **filters
+        )
+        content = (
+            b'{"runs":'
+            + runs
+            + b',"next_page_token":'
+            + orjson.dumps(next_page_token)
+            + b"}"
+        )
+    else:
+        runs = get_db().list_runs_json(db_session, sort=sort, last=last, **filters)
+        content = b'{"runs":' + runs + b"}"
+    return Response(content=content, media_type="application/json")
 
 
 # curl -X DELETE http://localhost:8080/runs?project=p1&name=x&days_ago=3
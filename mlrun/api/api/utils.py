@@ -29,6 +29,14 @@ def log_and_raise(status=HTTPStatus.BAD_REQUEST.value, **kw):
     raise HTTPException(status_code=status, detail=kw)
 
 
+def get_page_size(page_size: int = None) -> int:
+    """the requested list page size, up to the configured max page size"""
+    pagination = config.httpdb.pagination
+    return min(
+        page_size or int(pagination.default_page_size), int(pagination.max_page_size)
+    )
+
+
 def log_path(project, uid) -> Path:
     return get_logs_dir() / project / uid
 
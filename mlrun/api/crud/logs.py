@@ -1,13 +1,24 @@
+import asyncio
+import concurrent.futures
+import threading
+import time
 import typing
 from http import HTTPStatus
 
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
+import mlrun.api.db.session
+import mlrun.errors
 from mlrun.api.api.utils import log_and_raise, log_path
 from mlrun.api.constants import LogSources
 from mlrun.api.utils.singletons.db import get_db
 from mlrun.api.utils.singletons.k8s import get_k8s
-from mlrun.runtimes.constants import PodPhases
+from mlrun.config import config
+from mlrun.runtimes.constants import PodPhases, RunStates
+
+# the number of pod log chunks which are read ahead of the stream response
+pod_log_queue_size = 16
 
 
 # TODO: changed to be under a singleton like projects and runtimes
@@ -55,6 +66,153 @@ class Logs:
                             out = resp.encode()[offset:]
         return run_state, out
 
+    @staticmethod
+    async def stream_logs(
+        project: str,
+        uid: str,
+        offset: int = 0,
+        since_seconds: typing.Optional[int] = None,
+        source: LogSources = LogSources.AUTO,
+    ) -> typing.AsyncIterator[bytes]:
+        """
+        Follow the log of a run, yields the new log bytes (starting at offset) as they are written, until the run
+        reaches a terminal state (or the log is idle for httpdb.logs.stream_idle_timeout seconds).
+        The persisted log file is followed from the offset, otherwise the log of the run pod is followed (offset is
+        relative to since_seconds, when given), so every chunk costs only its own size (no re-reads of the log).
+        The stream is not bound to a DB session (sessions are opened only for the run state checks) and it waits on
+        the event loop, the pod log stream is read (blocking) on a dedicated thread.
+        """
+        log_file = log_path(project, uid)
+        if log_file.exists() and source in [LogSources.AUTO, LogSources.PERSISTENCY]:
+            chunks = Logs._follow_log_file(project, uid, log_file, offset)
+        elif source in [LogSources.AUTO, LogSources.K8S] and get_k8s():
+            chunks = Logs._follow_pod_log(project, uid, offset, since_seconds)
+        else:
+            return
+        async for chunk in chunks:
+            yield chunk
+
+    @staticmethod
+    async def _follow_log_file(project: str, uid: str, log_file, offset: int):
+        chunk_size = int(config.httpdb.logs.stream_chunk_size)
+        poll_interval = float(config.httpdb.logs.stream_poll_interval)
+        idle_timeout = float(config.httpdb.logs.stream_idle_timeout)
+        with log_file.open("rb") as fp:
+            fp.seek(offset)
+            idle_since = time.monotonic()
+            while True:
+                chunk = await run_in_threadpool(fp.read, chunk_size)
+                if chunk:
+                    idle_since = time.monotonic()
+                    yield chunk
+                    continue
+                if await run_in_threadpool(Logs._is_run_terminated, project, uid):
+                    # read what was written before the run terminated
+                    while True:
+                        chunk = await run_in_threadpool(fp.read, chunk_size)
+                        if not chunk:
+                            return
+                        yield chunk
+                if time.monotonic() - idle_since > idle_timeout:
+                    return
+                await asyncio.sleep(poll_interval)
+
+    @staticmethod
+    async def _follow_pod_log(
+        project: str, uid: str, offset: int, since_seconds: typing.Optional[int]
+    ):
+        poll_interval = float(config.httpdb.logs.stream_poll_interval)
+        idle_timeout = float(config.httpdb.logs.stream_idle_timeout)
+        waiting_since = time.monotonic()
+        while True:
+            pods = await run_in_threadpool(get_k8s().get_logger_pods, project, uid)
+            if not pods:
+                return
+            pod, pod_phase = list(pods.items())[0]
+            if pod_phase != PodPhases.pending:
+                break
+            if (
+                await run_in_threadpool(Logs._is_run_terminated, project, uid)
+                or time.monotonic() - waiting_since > idle_timeout
+            ):
+                return
+            await asyncio.sleep(poll_interval)
+
+        # one pod log stream is followed, it ends when the pod container terminates or after idle_timeout seconds
+        # without new bytes. it is read on a dedicated thread (a quiet log does not hold a threadpool worker)
+        loop = asyncio.get_running_loop()
+        chunks = asyncio.Queue(maxsize=pod_log_queue_size)
+        stop = threading.Event()
+        threading.Thread(
+            target=Logs._read_pod_log,
+            args=(pod, since_seconds, idle_timeout, loop, chunks, stop),
+            name=f"pod-log-{uid}",
+            daemon=True,
+        ).start()
+        # the pod log can not be read from an offset, skip the bytes the client already has
+        position = 0
+        try:
+            while True:
+                chunk = await chunks.get()
+                if chunk is None:
+                    return
+                if isinstance(chunk, Exception):
+                    raise chunk
+                chunk_start, position = position, position + len(chunk)
+                if position <= offset:
+                    continue
+                yield chunk[max(offset - chunk_start, 0) :]
+        finally:
+            stop.set()
+
+    @staticmethod
+    def _read_pod_log(pod, since_seconds, idle_timeout, loop, chunks, stop):
+        """read the pod log stream into the chunks (asyncio) queue, ends with None (or the read error)"""
+
+        def put(item):
+            try:
+                future = asyncio.run_coroutine_threadsafe(chunks.put(item), loop)
+            except RuntimeError:
+                # the loop was closed
+                return False
+            while not stop.is_set():
+                try:
+                    future.result(timeout=1)
+                    return True
+                except concurrent.futures.TimeoutError:
+                    pass
+            future.cancel()
+            return False
+
+        try:
+            pod_log = get_k8s().stream_logs(
+                pod,
+                since_seconds=since_seconds,
+                idle_timeout=idle_timeout,
+                chunk_size=int(config.httpdb.logs.stream_chunk_size),
+            )
+            try:
+                for chunk in pod_log:
+                    if not put(chunk):
+                        return
+            finally:
+                pod_log.close()
+        except Exception as exc:
+            put(exc)
+            return
+        put(None)
+
+    @staticmethod
+    def _is_run_terminated(project: str, uid: str) -> bool:
+        db_session = mlrun.api.db.session.create_session()
+        try:
+            data = get_db().read_run(db_session, uid, project)
+        except mlrun.errors.MLRunNotFoundError:
+            return True
+        finally:
+            mlrun.api.db.session.close_session(db_session)
+        return data.get("status", {}).get("state", "") in RunStates.terminal_states()
+
     @staticmethod
     def get_log_mtime(project: str, uid: str) -> int:
         log_file = log_path(project, uid)
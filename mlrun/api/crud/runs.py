@@ -58,3 +58,21 @@ class Runs(metaclass=mlrun.utils.singleton.Singleton,):
         mlrun.api.utils.singletons.db.get_db().update_run(
             session, data, uid, project, iter
         )
+
+    def update_runs(
+        self,
+        session: sqlalchemy.orm.Session,
+        project: str,
+        runs: typing.List[dict],
+        leader_session: typing.Optional[str] = None,
+    ):
+        """update multiple runs of the project, each run is a dict with uid, iter and updates (see update_run)"""
+        for run in runs:
+            self.update_run(
+                session,
+                project,
+                run["uid"],
+                run.get("iter", 0),
+                run.get("updates"),
+                leader_session,
+            )
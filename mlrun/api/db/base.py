@@ -12,9 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 import warnings
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from mlrun.api import schemas
 
@@ -83,6 +84,26 @@ class DBInterface(ABC):
     ):
         pass
 
+    def list_runs_page(
+        self, session, page_size: int, page_token: str = None, **filters
+    ) -> Tuple[List[dict], Optional[str]]:
+        """list a page of runs, return the runs and the next page token (None when there are
+        no more runs), DBs without pagination support return all the runs in one page"""
+        return self.list_runs(session, **filters), None
+
+    def list_runs_json(self, session, **filters) -> bytes:
+        """list_runs() as a JSON array, DBs which store the runs as JSON return them as is"""
+        return json.dumps(self.list_runs(session, **filters), default=str).encode()
+
+    def list_runs_page_json(
+        self, session, page_size: int, page_token: str = None, **filters
+    ) -> Tuple[bytes, Optional[str]]:
+        """list_runs_page() with the runs as a JSON array, see list_runs_json()"""
+        runs, next_page_token = self.list_runs_page(
+            session, page_size, page_token, **filters
+        )
+        return json.dumps(runs, default=str).encode(), next_page_token
+
     @abstractmethod
     def del_run(self, session, uid, project="", iter=0):
         pass
@@ -105,6 +126,20 @@ class DBInterface(ABC):
     ):
         pass
 
+    def store_artifacts(
+        self,
+        session,
+        project: str,
+        artifacts: List[dict],
+        leader_session: Optional[str] = None,
+    ):
+        """store multiple artifacts of the project, each artifact is a dict with the store_artifact() arguments
+        (key, artifact, uid, iter, tag)"""
+        for artifact in artifacts:
+            self.store_artifact(
+                session, project=project, leader_session=leader_session, **artifact
+            )
+
     @abstractmethod
     def read_artifact(self, session, key, tag="", iter=None, project=""):
         pass
@@ -126,6 +161,12 @@ class DBInterface(ABC):
     ):
         pass
 
+    def list_artifacts_page(
+        self, session, page_size: int, page_token: str = None, **filters
+    ) -> Tuple[List[dict], Optional[str]]:
+        """list a page of artifacts, see list_runs_page()"""
+        return self.list_artifacts(session, **filters), None
+
     @abstractmethod
     def del_artifact(self, session, key, tag="", project=""):
         pass
@@ -222,6 +263,11 @@ class DBInterface(ABC):
     ) -> List[schemas.ProjectSummary]:
         pass
 
+    def rebuild_project_resources_counters(self, session):
+        """recompute the persisted project resources counters (used by generate_projects_summaries) from the
+        resources, for DBs which do not persist them this is a no-op"""
+        pass
+
     @abstractmethod
     def delete_project_related_resources(self, session, name: str):
         pass
@@ -1,10 +1,11 @@
+import base64
 import collections
+import json
 import re
 from copy import deepcopy
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-import humanfriendly
 import mergedeep
 import pytz
 from sqlalchemy import and_, distinct, func, or_
@@ -19,6 +20,8 @@ from mlrun.api.db.sqldb.helpers import (
     generate_query_predicate_for_name,
     label_set,
     run_labels,
+    run_last_update,
+    run_name,
     run_start_time,
     run_state,
     update_labels,
@@ -31,7 +34,9 @@ from mlrun.api.db.sqldb.models import (
     FeatureVector,
     Function,
     Log,
+    LogChunk,
     Project,
+    ProjectResourcesCounters,
     Run,
     Schedule,
     User,
@@ -44,13 +49,14 @@ from mlrun.lists import ArtifactList, FunctionList, RunList
 from mlrun.model import RunObject
 from mlrun.utils import (
     as_list,
+    datetime_from_iso,
+    datetime_to_iso,
     fill_function_hash,
     fill_object_hash,
     generate_artifact_uri,
     generate_object_uri,
     get_in,
     logger,
-    match_times,
     update_in,
 )
 
@@ -62,9 +68,6 @@ unversioned_tagged_object_uid_prefix = "unversioned-"
 class SQLDB(mlrun.api.utils.projects.remotes.follower.Member, DBInterface):
     def __init__(self, dsn):
         self.dsn = dsn
-        self._cache = {
-            "project_resources_counters": {"value": None, "ttl": datetime.min}
-        }
         self._name_with_iter_regex = re.compile("^[0-9]+-.+$")
 
     def initialize(self, session):
@@ -85,13 +88,48 @@ class SQLDB(mlrun.api.utils.projects.remotes.follower.Member, DBInterface):
         )
         log = self._query(session, Log, uid=uid, project=project).one_or_none()
         if not log:
-            log = Log(uid=uid, project=project, body=body)
-        elif body:
+            log = Log(uid=uid, project=project)
+            self._upsert(session, log)
+        elif log.body is not None and body:
+            # legacy single blob log, move it to the chunks table (once)
             if append:
-                log.body += body
-            else:
-                log.body = body
-        self._upsert(session, log)
+                self._append_log_chunks(session, uid, project, log.body)
+            log.body = None
+            self._upsert(session, log)
+
+        if not body:
+            return
+        if not append:
+            self._delete(session, LogChunk, project=project, uid=uid)
+        self._append_log_chunks(session, uid, project, body)
+
+    def _append_log_chunks(self, session, uid, project, body):
+        # only the last chunk is queried, appends do not depend on the log size
+        last_chunk = (
+            session.query(LogChunk.sequence, LogChunk.offset, LogChunk.size)
+            .filter(LogChunk.project == project, LogChunk.uid == uid)
+            .order_by(LogChunk.sequence.desc())
+            .first()
+        )
+        sequence, offset = 0, 0
+        if last_chunk:
+            sequence = last_chunk.sequence + 1
+            offset = last_chunk.offset + last_chunk.size
+
+        max_chunk_size = int(config.httpdb.logs.max_chunk_size)
+        for start in range(0, len(body), max_chunk_size):
+            chunk_body = body[start : start + max_chunk_size]
+            chunk = LogChunk(
+                uid=uid,
+                project=project,
+                sequence=sequence,
+                offset=offset,
+                size=len(chunk_body),
+                body=chunk_body,
+            )
+            self._upsert(session, chunk)
+            sequence += 1
+            offset += len(chunk_body)
 
     def get_log(self, session, uid, project="", offset=0, size=0):
         project = project or config.default_project
@@ -99,10 +137,30 @@ class SQLDB(mlrun.api.utils.projects.remotes.follower.Member, DBInterface):
         if not log:
             return None, None
         end = None if size == 0 else offset + size
-        return "", log.body[offset:end]
+        if log.body is not None:
+            return "", log.body[offset:end]
+
+        # fetch only the chunks which overlap the requested range
+        query = self._query(session, LogChunk).filter(
+            LogChunk.project == project,
+            LogChunk.uid == uid,
+            LogChunk.offset + LogChunk.size > offset,
+        )
+        if end is not None:
+            query = query.filter(LogChunk.offset < end)
+        chunks = query.order_by(LogChunk.sequence).all()
+        if not chunks:
+            return "", b""
+        body = b"".join(chunk.body for chunk in chunks)
+        first_offset = chunks[0].offset
+        return (
+            "",
+            body[offset - first_offset : None if end is None else end - first_offset],
+        )
 
     def delete_log(self, session: Session, project: str, uid: str):
         project = project or config.default_project
+        self._delete(session, LogChunk, project=project, uid=uid)
         self._delete(session, Log, project=project, uid=uid)
 
     def _delete_logs(self, session: Session, project: str):
@@ -130,6 +188,7 @@ class SQLDB(mlrun.api.utils.projects.remotes.follower.Member, DBInterface):
             session, project, leader_session=leader_session
         )
         run = self._get_run(session, uid, project, iter)
+        previous_name_and_state = None
         if not run:
             run = Run(
                 uid=uid,
@@ -138,13 +197,21 @@ class SQLDB(mlrun.api.utils.projects.remotes.follower.Member, DBInterface):
                 state=run_state(run_data),
                 start_time=run_start_time(run_data) or datetime.now(timezone.utc),
             )
+        else:
+            previous_name_and_state = (run.name, run.state)
         labels = run_labels(run_data)
         new_state = run_state(run_data)
         if new_state:
             run.state = new_state
+        run.name = run_name(run_data)
+        run.updated = run_last_update(run_data)
         update_labels(run, labels)
         run.struct = run_data
         self._upsert(session, run, ignore=True)
+        if previous_name_and_state != (run.name, run.state):
+            self._update_project_resources_counters(
+                session, project, "runs_running_count"
+            )
 
     def update_run(self, session, updates: dict, uid, project="", iter=0):
         project = project or config.default_project
@@ -152,6 +219,7 @@ class SQLDB(mlrun.api.utils.projects.remotes.follower.Member, DBInterface):
         if not run:
             run_uri = RunObject.create_uri(project, uid, iter)
             raise mlrun.errors.MLRunNotFoundError(f"Run {run_uri} not found")
+        previous_name_and_state = (run.name, run.state)
         struct = run.struct
         for key, val in updates.items():
             update_in(struct, key, val)
@@ -159,6 +227,8 @@ class SQLDB(mlrun.api.utils.projects.remotes.follower.Member, DBInterface):
         new_state = run_state(struct)
         if new_state:
             run.state = new_state
+        run.name = run_name(struct)
+        run.updated = run_last_update(struct)
         start_time = run_start_time(struct)
         if start_time:
             run.start_time = start_time
@@ -169,6 +239,10 @@ class SQLDB(mlrun.api.utils.projects.remotes.follower.Member, DBInterface):
         session.merge(run)
         session.commit()
         self._delete_empty_labels(session, Run.Label)
+        if previous_name_and_state != (run.name, run.state):
+            self._update_project_resources_counters(
+                session, project, "runs_running_count"
+            )
 
     def read_run(self, session, uid, project=None, iter=0):
         project = project or config.default_project
@@ -192,48 +266,150 @@ class SQLDB(mlrun.api.utils.projects.remotes.follower.Member, DBInterface):
         start_time_to=None,
         last_update_time_from=None,
         last_update_time_to=None,
+    ):
+        runs = RunList()
+        for run in self._list_runs_records(
+            session,
+            name,
+            uid,
+            project,
+            labels,
+            state,
+            sort,
+            last,
+            iter,
+            start_time_from,
+            start_time_to,
+            last_update_time_from,
+            last_update_time_to,
+        ):
+            runs.append(run.struct)
+
+        return runs
+
+    def list_runs_json(self, session, **filters) -> bytes:
+        """list_runs() as a JSON array, the runs bodies are not decoded"""
+        return self._records_to_json(self._list_runs_records(session, **filters))
+
+    def _list_runs_records(
+        self,
+        session,
+        name=None,
+        uid=None,
+        project=None,
+        labels=None,
+        state=None,
+        sort=True,
+        last=0,
+        iter=False,
+        start_time_from=None,
+        start_time_to=None,
+        last_update_time_from=None,
+        last_update_time_to=None,
     ):
         project = project or config.default_project
-        query = self._find_runs(session, uid, project, labels)
-        if start_time_from:
-            query = query.filter(Run.start_time >= start_time_from)
-        if start_time_to:
-            query = query.filter(Run.start_time <= start_time_to)
+        query = self._find_runs_query(
+            session,
+            uid,
+            project,
+            labels,
+            name,
+            state,
+            iter,
+            start_time_from,
+            start_time_to,
+            last_update_time_from,
+            last_update_time_to,
+        )
         if sort:
             query = query.order_by(Run.start_time.desc())
         if last:
             query = query.limit(last)
-        if not iter:
-            query = query.filter(Run.iteration == 0)
+        return query
 
-        filtered_runs = self._post_query_runs_filter(
-            query, name, state, last_update_time_from, last_update_time_to
-        )
+    def list_runs_page(
+        self, session, page_size: int, page_token: str = None, **filters
+    ) -> Tuple[RunList, Optional[str]]:
+        """list a page of runs (newest first), return the runs and the next page token
+        (None when there are no more runs), the filters are the list_runs() filters (except
+        sort and last)
 
+        keyset pagination, the page token is the (start_time, id) position of the last run
+        in the previous page, so every page is a bounded query regardless of the page number
+        """
+        records, next_page_token = self._list_runs_page_records(
+            session, page_size, page_token, **filters
+        )
         runs = RunList()
-        for run in filtered_runs:
+        for run in records:
             runs.append(run.struct)
+        return runs, next_page_token
+
+    def list_runs_page_json(
+        self, session, page_size: int, page_token: str = None, **filters
+    ) -> Tuple[bytes, Optional[str]]:
+        """list_runs_page() with the runs as a JSON array, the runs bodies are not decoded"""
+        records, next_page_token = self._list_runs_page_records(
+            session, page_size, page_token, **filters
+        )
+        return self._records_to_json(records), next_page_token
 
-        return runs
+    def _list_runs_page_records(
+        self,
+        session,
+        page_size: int,
+        page_token: str = None,
+        name=None,
+        uid=None,
+        project=None,
+        labels=None,
+        state=None,
+        iter=False,
+        start_time_from=None,
+        start_time_to=None,
+        last_update_time_from=None,
+        last_update_time_to=None,
+    ):
+        project = project or config.default_project
+        query = self._find_runs_query(
+            session,
+            uid,
+            project,
+            labels,
+            name,
+            state,
+            iter,
+            start_time_from,
+            start_time_to,
+            last_update_time_from,
+            last_update_time_to,
+        )
+        return self._list_page(query, Run.start_time, Run.id, page_size, page_token)
+
+    @staticmethod
+    def _records_to_json(records) -> bytes:
+        return b"[" + b",".join(record.struct_json for record in records) + b"]"
 
     def del_run(self, session, uid, project=None, iter=0):
         project = project or config.default_project
         # We currently delete *all* iterations
         self._delete(session, Run, uid=uid, project=project)
+        self._update_project_resources_counters(session, project, "runs_running_count")
 
     def del_runs(
         self, session, name=None, project=None, labels=None, state=None, days_ago=0
     ):
-        # FIXME: Run has no `name`
         project = project or config.default_project
-        query = self._find_runs(session, None, project, labels)
+        since = None
         if days_ago:
             since = datetime.now(timezone.utc) - timedelta(days=days_ago)
-            query = query.filter(Run.start_time >= since)
-        filtered_runs = self._post_query_runs_filter(query, name, state)
-        for run in filtered_runs:  # Can not use query.delete with join
+        query = self._find_runs_query(
+            session, None, project, labels, name, state, True, since
+        )
+        for run in query:  # Can not use query.delete with join
             session.delete(run)
         session.commit()
+        self._update_project_resources_counters(session, project, "runs_running_count")
 
     def store_artifact(
         self,
@@ -257,6 +433,22 @@ class SQLDB(mlrun.api.utils.projects.remotes.follower.Member, DBInterface):
             leader_session=leader_session,
         )
 
+    def store_artifacts(
+        self,
+        session,
+        project: str,
+        artifacts: List[dict],
+        leader_session: Optional[str] = None,
+    ):
+        project = project or config.default_project
+        get_project_member().ensure_project(
+            session, project, leader_session=leader_session
+        )
+        for artifact in artifacts:
+            self._store_artifact(
+                session, project=project, ensure_project=False, **artifact
+            )
+
     def _store_artifact(
         self,
         session,
@@ -285,6 +477,7 @@ class SQLDB(mlrun.api.utils.projects.remotes.follower.Member, DBInterface):
         labels = artifact.get("labels", {})
         if not art:
             art = Artifact(key=key, uid=uid, updated=updated, project=project)
+        art.kind = artifact.get("kind")
         update_labels(art, labels)
 
         # Ensure there is no "tag" field in the object, to avoid inconsistent situations between
@@ -296,14 +489,17 @@ class SQLDB(mlrun.api.utils.projects.remotes.follower.Member, DBInterface):
         if tag_artifact:
             tag = tag or "latest"
             self.tag_artifacts(session, [art], project, tag)
+        if self._is_model_key(session, project, key):
+            self._update_project_resources_counters(session, project, "models_count")
 
     def _add_tags_to_artifact_struct(
         self, session, artifact_struct, artifact_id, tag=None
     ):
         artifacts = []
         if tag and tag != "*":
-            artifact_struct["tag"] = tag
-            artifacts.append(artifact_struct)
+            artifact_with_tag = artifact_struct.copy()
+            artifact_with_tag["tag"] = tag
+            artifacts.append(artifact_with_tag)
         else:
             tag_results = self._query(session, Artifact.Tag, obj_id=artifact_id).all()
             if not tag_results:
@@ -368,7 +564,74 @@ class SQLDB(mlrun.api.utils.projects.remotes.follower.Member, DBInterface):
         best_iteration: bool = False,
     ):
         project = project or config.default_project
+        ids = self._resolve_list_artifacts_ids(
+            session, project, tag, iter, best_iteration
+        )
+        artifact_records = self._find_artifacts(
+            session, project, ids, labels, since, until, name, kind, category, iter
+        )
+        indexed_artifacts = {artifact.key: artifact for artifact in artifact_records}
+        return self._artifact_records_to_list(
+            session,
+            artifact_records,
+            indexed_artifacts.get,
+            ids,
+            tag,
+            iter,
+            best_iteration,
+        )
+
+    def list_artifacts_page(
+        self,
+        session,
+        page_size: int,
+        page_token: str = None,
+        name=None,
+        project=None,
+        tag=None,
+        labels=None,
+        since=None,
+        until=None,
+        kind=None,
+        category: schemas.ArtifactCategories = None,
+        iter: int = None,
+        best_iteration: bool = False,
+    ) -> Tuple[ArtifactList, Optional[str]]:
+        """list a page of artifacts (last updated first), return the artifacts and the next
+        page token (None when there are no more artifacts), see list_runs_page()"""
+        project = project or config.default_project
+        ids = self._resolve_list_artifacts_ids(
+            session, project, tag, iter, best_iteration
+        )
+        query = self._find_artifacts_query(
+            session, project, ids, labels, since, until, name, kind, category, iter
+        )
+        records, next_page_token = self._list_page(
+            query,
+            Artifact.updated,
+            Artifact.id,
+            page_size,
+            page_token,
+            self._artifacts_batch_filter(query, kind, category, iter, best_iteration),
+        )
+        indexed_artifacts = {artifact.key: artifact for artifact in records}
+        if best_iteration:
+            # the linked artifacts can be in other pages, read them with a single query
+            linked_keys = set(_linked_artifact_keys(records)) - set(indexed_artifacts)
+            if linked_keys:
+                linked_artifacts = query.filter(Artifact.key.in_(linked_keys)).order_by(
+                    Artifact.updated.asc()
+                )
+                # the last updated artifact of every key wins
+                for artifact in linked_artifacts:
+                    indexed_artifacts[artifact.key] = artifact
+
+        artifacts = self._artifact_records_to_list(
+            session, records, indexed_artifacts.get, ids, tag, iter, best_iteration
+        )
+        return artifacts, next_page_token
 
+    def _resolve_list_artifacts_ids(self, session, project, tag, iter, best_iteration):
         if best_iteration and iter is not None:
             raise mlrun.errors.MLRunInvalidArgumentError(
                 "best-iteration cannot be used when iter is specified"
@@ -384,12 +647,19 @@ class SQLDB(mlrun.api.utils.projects.remotes.follower.Member, DBInterface):
                 ids = tag
             else:
                 ids = self._resolve_tag(session, Artifact, project, tag)
+        return ids
 
+    def _artifact_records_to_list(
+        self,
+        session,
+        artifact_records,
+        get_linked_artifact,
+        ids,
+        tag,
+        iter,
+        best_iteration,
+    ):
         artifacts = ArtifactList()
-        artifact_records = self._find_artifacts(
-            session, project, ids, labels, since, until, name, kind, category, iter
-        )
-        indexed_artifacts = {artifact.key: artifact for artifact in artifact_records}
         for artifact in artifact_records:
             has_iteration = self._name_with_iter_regex.match(artifact.key)
 
@@ -399,10 +669,10 @@ class SQLDB(mlrun.api.utils.projects.remotes.follower.Member, DBInterface):
             if best_iteration:
                 if has_iteration:
                     continue
-                link_iteration = artifact.struct.get("link_iteration")
+                link_iteration = artifact.struct_view.get("link_iteration")
                 if link_iteration:
                     linked_key = f"{link_iteration}-{artifact.key}"
-                    linked_artifact = indexed_artifacts.get(linked_key)
+                    linked_artifact = get_linked_artifact(linked_key)
                     if linked_artifact:
                         artifact = linked_artifact
                     else:
@@ -438,7 +708,24 @@ class SQLDB(mlrun.api.utils.projects.remotes.follower.Member, DBInterface):
         if tag:
             kw["tag"] = tag
 
+        is_model_key = self._is_model_key(session, project, key)
         self._delete(session, Artifact, **kw)
+        if is_model_key:
+            self._update_project_resources_counters(session, project, "models_count")
+
+    @staticmethod
+    def _is_model_key(session, project, key):
+        import mlrun.artifacts
+
+        return session.query(
+            session.query(Artifact)
+            .filter(
+                Artifact.project == project,
+                Artifact.key == key,
+                Artifact.kind == mlrun.artifacts.model.ModelArtifact.kind,
+            )
+            .exists()
+        ).scalar()
 
     def _delete_artifact_tags(
         self, session, project, artifact_key, tag_name="", commit=True
@@ -505,6 +792,7 @@ class SQLDB(mlrun.api.utils.projects.remotes.follower.Member, DBInterface):
         updated = datetime.now(timezone.utc)
         update_in(function, "metadata.updated", updated)
         fn = self._get_class_instance_by_uid(session, Function, name, project, uid)
+        is_new_function = not fn
         if not fn:
             fn = Function(name=name, project=project, uid=uid,)
         fn.updated = updated
@@ -513,6 +801,8 @@ class SQLDB(mlrun.api.utils.projects.remotes.follower.Member, DBInterface):
         fn.struct = function
         self._upsert(session, fn)
         self.tag_objects_v2(session, [fn], project, tag)
+        if is_new_function:
+            self._update_project_resources_counters(session, project, "functions_count")
         return hash_key
 
     def get_function(self, session, name, project="", tag="", hash_key=""):
@@ -557,6 +847,7 @@ class SQLDB(mlrun.api.utils.projects.remotes.follower.Member, DBInterface):
             session, Function, project=project, name=name, commit=False
         )
         self._delete(session, Function, project=project, name=name)
+        self._update_project_resources_counters(session, project, "functions_count")
 
     def _delete_functions(self, session: Session, project: str):
         for function in self._list_project_functions(session, project):
@@ -938,130 +1229,143 @@ class SQLDB(mlrun.api.utils.projects.remotes.follower.Member, DBInterface):
                     )
         return schemas.ProjectsOutput(projects=projects)
 
-    def _get_project_resources_counters(self, session: Session):
-        now = datetime.now()
-        if (
-            not self._cache["project_resources_counters"]["ttl"]
-            or self._cache["project_resources_counters"]["ttl"] < now
-        ):
-            logger.debug(
-                "Project resources counter cache expired. Calculating",
-                ttl=self._cache["project_resources_counters"]["ttl"],
-            )
-            import mlrun.artifacts
-
-            functions_count_per_project = (
-                session.query(Function.project, func.count(distinct(Function.name)))
-                .group_by(Function.project)
-                .all()
-            )
-            project_to_function_count = {
-                result[0]: result[1] for result in functions_count_per_project
-            }
-            feature_sets_count_per_project = (
-                session.query(FeatureSet.project, func.count(distinct(FeatureSet.name)))
-                .group_by(FeatureSet.project)
-                .all()
-            )
-            project_to_feature_set_count = {
-                result[0]: result[1] for result in feature_sets_count_per_project
-            }
-            # The kind filter is applied post the query to the DB (manually in python code), so counting should be that
-            # way as well, therefore we're doing it here, and can't do it with sql as the above
-            # We're using the "latest" which gives us only one version of each artifact key, which is what we want to
-            # count (artifact count, not artifact versions count)
-            model_artifacts = self._find_artifacts(
-                session, None, "latest", kind=mlrun.artifacts.model.ModelArtifact.kind
-            )
-            project_to_models_count = collections.defaultdict(int)
-            for model_artifact in model_artifacts:
-                project_to_models_count[model_artifact.project] += 1
-            runs = self._find_runs(session, None, "*", None)
-            project_to_recent_failed_runs_count = collections.defaultdict(int)
-            project_to_running_runs_count = collections.defaultdict(int)
-            # we want to count unique run names, and not all occurrences of all runs, therefore we're keeping set of
-            # names and only count new names
-            project_to_recent_failed_run_names = collections.defaultdict(set)
-            project_to_running_run_names = collections.defaultdict(set)
-            runs = runs.all()
-            for run in runs:
-                run_json = run.struct
-                if self._is_run_matching_state(
-                    run,
-                    run_json,
-                    mlrun.runtimes.constants.RunStates.non_terminal_states(),
-                ):
-                    if (
-                        run_json.get("metadata", {}).get("name")
-                        and run_json["metadata"]["name"]
-                        not in project_to_running_run_names[run.project]
-                    ):
-                        project_to_running_run_names[run.project].add(
-                            run_json["metadata"]["name"]
-                        )
-                        project_to_running_runs_count[run.project] += 1
-                if self._is_run_matching_state(
-                    run,
-                    run_json,
-                    [
-                        mlrun.runtimes.constants.RunStates.error,
-                        mlrun.runtimes.constants.RunStates.aborted,
-                    ],
-                ):
-                    one_day_ago = datetime.now() - timedelta(hours=24)
-                    if run.start_time and run.start_time >= one_day_ago:
-                        if (
-                            run_json.get("metadata", {}).get("name")
-                            and run_json["metadata"]["name"]
-                            not in project_to_recent_failed_run_names[run.project]
-                        ):
-                            project_to_recent_failed_run_names[run.project].add(
-                                run_json["metadata"]["name"]
-                            )
-                            project_to_recent_failed_runs_count[run.project] += 1
-
-            self._cache["project_resources_counters"]["result"] = (
-                project_to_function_count,
-                project_to_feature_set_count,
-                project_to_models_count,
-                project_to_recent_failed_runs_count,
-                project_to_running_runs_count,
-            )
-            ttl_time = datetime.now() + timedelta(
-                seconds=humanfriendly.parse_timespan(
-                    config.httpdb.projects.counters_cache_ttl
-                )
-            )
-            self._cache["project_resources_counters"]["ttl"] = ttl_time
-
-        return self._cache["project_resources_counters"]["result"]
-
     def generate_projects_summaries(
         self, session: Session, projects: List[str]
     ) -> List[mlrun.api.schemas.ProjectSummary]:
-        (
-            project_to_function_count,
-            project_to_feature_set_count,
-            project_to_models_count,
-            project_to_recent_failed_runs_count,
-            project_to_running_runs_count,
-        ) = self._get_project_resources_counters(session)
+        counters_records = {
+            counters_record.project: counters_record
+            for counters_record in session.query(ProjectResourcesCounters)
+        }
+        # recent failed runs are counted on read since the count changes with time
+        project_to_recent_failed_runs_count = self._count_recent_failed_runs(session)
         project_summaries = []
         for project in projects:
+            counters_record = counters_records.get(project)
             project_summaries.append(
                 mlrun.api.schemas.ProjectSummary(
                     name=project,
-                    functions_count=project_to_function_count.get(project, 0),
-                    feature_sets_count=project_to_feature_set_count.get(project, 0),
-                    models_count=project_to_models_count.get(project, 0),
+                    functions_count=getattr(counters_record, "functions_count", 0),
+                    feature_sets_count=getattr(
+                        counters_record, "feature_sets_count", 0
+                    ),
+                    models_count=getattr(counters_record, "models_count", 0),
                     runs_failed_recent_count=project_to_recent_failed_runs_count.get(
                         project, 0
                     ),
-                    runs_running_count=project_to_running_runs_count.get(project, 0),
+                    runs_running_count=getattr(
+                        counters_record, "runs_running_count", 0
+                    ),
                 )
             )
         return project_summaries
 
+    def rebuild_project_resources_counters(self, session: Session):
+        """recompute the resources counters of all the projects"""
+        logger.info("Rebuilding project resources counters")
+        project_to_counters = collections.defaultdict(dict)
+        for counter, counts in [
+            ("functions_count", self._count_functions(session)),
+            ("feature_sets_count", self._count_feature_sets(session)),
+            ("models_count", self._count_models(session)),
+            ("runs_running_count", self._count_running_runs(session)),
+        ]:
+            for project, count in counts:
+                project_to_counters[project][counter] = count
+
+        session.query(ProjectResourcesCounters).delete()
+        for project, counters in project_to_counters.items():
+            session.add(ProjectResourcesCounters(project=project, **counters))
+        session.commit()
+
+    def _update_project_resources_counters(
+        self, session: Session, project: str, *counters: str
+    ):
+        """recompute the given resources counters of the project, with project scoped queries"""
+        counters_record = self._query(
+            session, ProjectResourcesCounters, project=project
+        ).one_or_none()
+        if not counters_record:
+            counters_record = ProjectResourcesCounters(project=project)
+        counters_queries = {
+            "functions_count": self._count_functions,
+            "feature_sets_count": self._count_feature_sets,
+            "models_count": self._count_models,
+            "runs_running_count": self._count_running_runs,
+        }
+        for counter in counters:
+            counts = counters_queries[counter](session, project)
+            setattr(counters_record, counter, counts[0][1] if counts else 0)
+        # counters can be rebuilt, no need to fail the resource update on conflicts
+        self._upsert(session, counters_record, ignore=True)
+
+    @staticmethod
+    def _count_functions(session: Session, project: str = None):
+        query = session.query(Function.project, func.count(distinct(Function.name)))
+        if project:
+            query = query.filter(Function.project == project)
+        return query.group_by(Function.project).all()
+
+    @staticmethod
+    def _count_feature_sets(session: Session, project: str = None):
+        query = session.query(FeatureSet.project, func.count(distinct(FeatureSet.name)))
+        if project:
+            query = query.filter(FeatureSet.project == project)
+        return query.group_by(FeatureSet.project).all()
+
+    @staticmethod
+    def _count_models(session: Session, project: str = None):
+        import mlrun.artifacts
+
+        # counting only the latest version of each artifact key (artifact count, not artifact versions count)
+        latest = session.query(
+            Artifact.project, Artifact.key, func.max(Artifact.updated).label("updated"),
+        )
+        if project:
+            latest = latest.filter(Artifact.project == project)
+        latest = latest.group_by(Artifact.project, Artifact.key).subquery("latest")
+        return (
+            session.query(Artifact.project, func.count(distinct(Artifact.key)))
+            .join(
+                latest,
+                and_(
+                    Artifact.project == latest.c.project,
+                    Artifact.key == latest.c.key,
+                    Artifact.updated == latest.c.updated,
+                ),
+            )
+            .filter(Artifact.kind == mlrun.artifacts.model.ModelArtifact.kind)
+            .group_by(Artifact.project)
+            .all()
+        )
+
+    @staticmethod
+    def _count_running_runs(session: Session, project: str = None):
+        # we want to count unique run names, and not all occurrences of all runs
+        query = session.query(Run.project, func.count(distinct(Run.name))).filter(
+            Run.state.in_(mlrun.runtimes.constants.RunStates.non_terminal_states())
+        )
+        if project:
+            query = query.filter(Run.project == project)
+        return query.group_by(Run.project).all()
+
+    @staticmethod
+    def _count_recent_failed_runs(session: Session) -> Dict[str, int]:
+        one_day_ago = datetime.now() - timedelta(hours=24)
+        return dict(
+            session.query(Run.project, func.count(distinct(Run.name)))
+            .filter(
+                Run.state.in_(
+                    [
+                        mlrun.runtimes.constants.RunStates.error,
+                        mlrun.runtimes.constants.RunStates.aborted,
+                    ]
+                ),
+                Run.start_time >= one_day_ago,
+            )
+            .group_by(Run.project)
+            .all()
+        )
+
     def _update_project_record_from_project(
         self, session: Session, project_record: Project, project: schemas.Project
     ):
@@ -1168,6 +1472,7 @@ class SQLDB(mlrun.api.utils.projects.remotes.follower.Member, DBInterface):
         # orphan resources
         self._delete_resources_tags(session, name)
         self._delete_resources_labels(session, name)
+        self._delete(session, ProjectResourcesCounters, project=name)
 
     @staticmethod
     def _verify_empty_list_of_project_related_resources(
@@ -1734,6 +2039,7 @@ class SQLDB(mlrun.api.utils.projects.remotes.follower.Member, DBInterface):
 
         self._upsert(session, db_feature_set)
         self.tag_objects_v2(session, [db_feature_set], project, tag)
+        self._update_project_resources_counters(session, project, "feature_sets_count")
 
         return uid
 
@@ -1808,6 +2114,7 @@ class SQLDB(mlrun.api.utils.projects.remotes.follower.Member, DBInterface):
 
     def delete_feature_set(self, session, project, name, tag=None, uid=None):
         self._delete_feature_store_object(session, FeatureSet, project, name, tag, uid)
+        self._update_project_resources_counters(session, project, "feature_sets_count")
 
     def create_feature_vector(
         self,
@@ -2056,6 +2363,42 @@ class SQLDB(mlrun.api.utils.projects.remotes.follower.Member, DBInterface):
         kw = {k: v for k, v in kw.items() if v is not None}
         return session.query(cls).filter_by(**kw)
 
+    @staticmethod
+    def _list_page(
+        query, time_column, id_column, page_size, page_token=None, batch_filter=None
+    ):
+        """keyset pagination, return up to page_size records (by time and id, newest first)
+        following the page token position, and the next page token (None when there are no
+        more records)
+
+        the records are read in batches of page_size, batch_filter is called with every
+        batch and returns the ids of the records to keep, when it drops records more
+        batches are read until the page is full
+        """
+        query = query.order_by(time_column.desc(), id_column.desc())
+        position = _decode_page_token(page_token)
+        records = []
+        while True:
+            batch_query = query
+            if position:
+                batch_query = query.filter(
+                    _after_page_position(time_column, id_column, *position)
+                )
+            batch = batch_query.limit(page_size).all()
+            matching_ids = batch_filter(batch) if batch_filter else None
+            for record in batch:
+                position = (
+                    getattr(record, time_column.key),
+                    getattr(record, id_column.key),
+                )
+                if matching_ids is not None and position[1] not in matching_ids:
+                    continue
+                records.append(record)
+                if len(records) == page_size:
+                    return records, _encode_page_token(*position)
+            if len(batch) < page_size:
+                return records, None
+
     def _function_latest_uid(self, session, project, name):
         # FIXME
         query = (
@@ -2148,85 +2491,43 @@ class SQLDB(mlrun.api.utils.projects.remotes.follower.Member, DBInterface):
         labels = label_set(labels)
         if project == "*":
             project = None
-        query = self._query(session, Run, uid=uid, project=project)
+        if isinstance(uid, list):
+            query = self._query(session, Run, project=project).filter(Run.uid.in_(uid))
+        else:
+            query = self._query(session, Run, uid=uid, project=project)
         return self._add_labels_filter(session, query, Run, labels)
 
-    def _post_query_runs_filter(
+    def _find_runs_query(
         self,
-        query,
+        session,
+        uid,
+        project,
+        labels,
         name=None,
         state=None,
+        iter=True,
+        start_time_from=None,
+        start_time_to=None,
         last_update_time_from=None,
         last_update_time_to=None,
     ):
-        """
-        This function is hacky and exists to cover on bugs we had with how we save our data in the DB
-        We're doing it the hacky way since:
-        1. SQLDB is about to be replaced
-        2. Schema + Data migration are complicated and as long we can avoid them, we prefer to (also because of 1)
-        name - the name is only saved in the json itself, therefore we can't use the SQL query filter and have to filter
-        it ourselves
-        state - the state is saved in a column, but, there was a bug in which the state was only getting updated in the
-        json itself, therefore, in field systems, most runs records will have an empty or not updated data in the state
-        column
-        """
-        if (
-            not name
-            and not state
-            and not last_update_time_from
-            and not last_update_time_to
-        ):
-            return query.all()
-
-        filtered_runs = []
-        for run in query:
-            run_json = run.struct
-            if name:
-                if not run_json or not isinstance(run_json, dict):
-                    continue
-
-                run_name = run_json.get("metadata", {}).get("name", "")
-                if name.startswith("~"):
-                    if name[1:].casefold() not in run_name.casefold():
-                        continue
-                elif name != run_name:
-                    continue
-            if state:
-                if not self._is_run_matching_state(run, run_json, state):
-                    continue
-            if last_update_time_from or last_update_time_to:
-                if not match_times(
-                    last_update_time_from,
-                    last_update_time_to,
-                    run_json,
-                    "status.last_update",
-                ):
-                    continue
-
-            filtered_runs.append(run)
-
-        return filtered_runs
-
-    def _is_run_matching_state(self, run, run_json, state):
-        requested_states = as_list(state)
-        record_state = run.state
-        json_state = None
-        if (
-            run_json
-            and isinstance(run_json, dict)
-            and run_json.get("status", {}).get("state")
-        ):
-            json_state = run_json.get("status", {}).get("state")
-        if not record_state and not json_state:
-            return False
-        # json_state has precedence over record state
-        if json_state:
-            if json_state in requested_states:
-                return True
-        else:
-            if record_state in requested_states:
-                return True
-        return False
+        """the runs query with all the list_runs() filters"""
+        query = self._find_runs(session, uid, project, labels)
+        if name:
+            query = query.filter(generate_query_predicate_for_name(Run.name, name))
+        if state:
+            query = query.filter(Run.state.in_(as_list(state)))
+        if not iter:
+            query = query.filter(Run.iteration == 0)
+        if start_time_from:
+            query = query.filter(Run.start_time >= start_time_from)
+        if start_time_to:
+            query = query.filter(Run.start_time <= start_time_to)
+        if last_update_time_from:
+            query = query.filter(Run.updated >= last_update_time_from)
+        if last_update_time_to:
+            query = query.filter(Run.updated <= last_update_time_to)
+        return query
 
     def _latest_uid_filter(self, session, query):
         # Create a sub query of latest uid (by updated) per (project,key)
@@ -2307,6 +2608,29 @@ class SQLDB(mlrun.api.utils.projects.remotes.follower.Member, DBInterface):
         2. ids == "latest" - in which we find the relevant uid by finding the latest artifact using the updated column
         3. ids is a string (different than "latest") - in which the meaning is actually a uid, so we add this filter
         """
+        query = self._find_artifacts_query(
+            session, project, ids, labels, since, until, name, kind, category, iter
+        )
+        if category and not kind:
+            # TODO - this is a hack needed since link artifacts will be returned even for artifacts of
+            #        the wrong category. Remove this when we refactor this area.
+            return self._filter_out_extra_link_artifacts(query.all())
+        return query.all()
+
+    def _find_artifacts_query(
+        self,
+        session,
+        project,
+        ids,
+        labels=None,
+        since=None,
+        until=None,
+        name=None,
+        kind=None,
+        category: schemas.ArtifactCategories = None,
+        iter=None,
+    ):
+        """the artifacts query of _find_artifacts(), without the link artifacts filter of the category"""
         if category and kind:
             message = "Category and Kind filters can't be given together"
             logger.warning(message, kind=kind, category=category)
@@ -2330,53 +2654,67 @@ class SQLDB(mlrun.api.utils.projects.remotes.follower.Member, DBInterface):
                 and_(Artifact.updated >= since, Artifact.updated <= until)
             )
 
-        query = self._add_artifact_name_and_iter_query(query, name, iter)
-
         if kind:
-            return self._filter_artifacts_by_kinds(query, [kind])
-
+            query = self._add_artifact_kinds_query(query, [kind])
         elif category:
-            filtered_artifacts = self._filter_artifacts_by_category(query, category)
-            # TODO - this is a hack needed since link artifacts will be returned even for artifacts of
-            #        the wrong category. Remove this when we refactor this area.
-            return self._filter_out_extra_link_artifacts(filtered_artifacts)
-        else:
-            return query.all()
+            query = self._add_artifact_kinds_query(query, *category.to_kinds_filter())
 
-    def _filter_artifacts_by_category(
-        self, artifacts, category: schemas.ArtifactCategories
-    ):
-        kinds, exclude = category.to_kinds_filter()
-        return self._filter_artifacts_by_kinds(artifacts, kinds, exclude)
+        return self._add_artifact_name_and_iter_query(query, name, iter)
 
-    def _filter_artifacts_by_kinds(
-        self, artifacts, kinds: List[str], exclude: bool = False
-    ):
+    @staticmethod
+    def _add_artifact_kinds_query(query, kinds: List[str], exclude: bool = False):
         """
         :param kinds - list of kinds to filter by
         :param exclude - if true then the filter will be "all except" - get all artifacts excluding the ones who have
          any of the given kinds
         """
-        # see docstring of _post_query_runs_filter for why we're filtering it manually
-        filtered_artifacts = []
-        for artifact in artifacts:
-            artifact_json = artifact.struct
-            if (
-                artifact_json
-                and isinstance(artifact_json, dict)
-                and (
-                    (
-                        not exclude
-                        and any([kind == artifact_json.get("kind") for kind in kinds])
-                    )
-                    or (
-                        exclude
-                        and all([kind != artifact_json.get("kind") for kind in kinds])
-                    )
+        if exclude:
+            return query.filter(
+                or_(Artifact.kind.is_(None), Artifact.kind.notin_(kinds))
+            )
+        return query.filter(Artifact.kind.in_(kinds))
+
+    def _artifacts_batch_filter(
+        self, query, kind=None, category=None, iter=None, best_iteration=False
+    ):
+        """return a (per batch of records) filter of the iteration and link artifacts
+        conditions of list_artifacts(), used when the records are read page by page"""
+
+        def matching_ids(artifacts):
+            artifacts = [
+                artifact
+                for artifact in artifacts
+                if not (
+                    (iter == 0 or best_iteration)
+                    and self._name_with_iter_regex.match(artifact.key)
                 )
-            ):
-                filtered_artifacts.append(artifact)
-        return filtered_artifacts
+            ]
+            if not category or kind:
+                return {artifact.id for artifact in artifacts}
+
+            # only keep link artifacts that point at "real" artifacts of the category,
+            # see _filter_out_extra_link_artifacts()
+            link_artifacts = [
+                artifact for artifact in artifacts if artifact.kind == "link"
+            ]
+            linked_keys = set(_linked_artifact_keys(link_artifacts))
+            existing_keys = set()
+            if linked_keys:
+                existing_keys = {
+                    key
+                    for key, in query.filter(
+                        Artifact.key.in_(linked_keys),
+                        or_(Artifact.kind.is_(None), Artifact.kind != "link"),
+                    ).with_entities(Artifact.key)
+                }
+            return {
+                artifact.id
+                for artifact in artifacts
+                if artifact.kind != "link"
+                or _linked_artifact_key(artifact) in existing_keys
+            }
+
+        return matching_ids
 
     # TODO - this is a hack needed since link artifacts will be returned even for artifacts of
     #        the wrong category. Remove this when we refactor this area.
@@ -2387,14 +2725,14 @@ class SQLDB(mlrun.api.utils.projects.remotes.follower.Member, DBInterface):
         link_artifacts = []
         filtered_artifacts = []
         for artifact in artifacts:
-            if artifact.struct.get("kind") != "link":
+            if artifact.kind != "link":
                 existing_keys.add(artifact.key)
                 filtered_artifacts.append(artifact)
             else:
                 link_artifacts.append(artifact)
 
         for link_artifact in link_artifacts:
-            link_iteration = link_artifact.struct.get("link_iteration")
+            link_iteration = link_artifact.struct_view.get("link_iteration")
             if not link_iteration:
                 continue
             linked_key = f"{link_iteration}-{link_artifact.key}"
@@ -2541,3 +2879,44 @@ class SQLDB(mlrun.api.utils.projects.remotes.follower.Member, DBInterface):
             return project
         # TODO: handle transforming the functions/workflows/artifacts references to real objects
         return schemas.Project(**project_record.full_object)
+
+
+def _encode_page_token(time_value: Optional[datetime], id_value: int) -> str:
+    position = {"time": datetime_to_iso(time_value), "id": id_value}
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def _decode_page_token(page_token: str):
+    if not page_token:
+        return None
+    try:
+        position = json.loads(base64.urlsafe_b64decode(page_token.encode()))
+        return datetime_from_iso(position["time"]), int(position["id"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise mlrun.errors.MLRunInvalidArgumentError(
+            f"invalid page token {page_token}"
+        ) from exc
+
+
+def _after_page_position(time_column, id_column, time_value, id_value):
+    # records are ordered by time and id (descending), records without time are last
+    if time_value is None:
+        return and_(time_column.is_(None), id_column < id_value)
+    return or_(
+        time_column < time_value,
+        and_(time_column == time_value, id_column < id_value),
+        time_column.is_(None),
+    )
+
+
+def _linked_artifact_key(artifact):
+    # the key of the best iteration artifact a link artifact points at (None if not a link)
+    link_iteration = artifact.struct_view.get("link_iteration")
+    return f"{link_iteration}-{artifact.key}" if link_iteration else None
+
+
+def _linked_artifact_keys(artifacts):
+    for artifact in artifacts:
+        linked_key = _linked_artifact_key(artifact)
+        if linked_key:
+            yield linked_key
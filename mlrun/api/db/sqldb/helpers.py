@@ -26,6 +26,17 @@ def run_start_time(run):
     return parser.parse(ts)
 
 
+def run_name(run):
+    return get_in(run, "metadata.name")
+
+
+def run_last_update(run):
+    ts = get_in(run, "status.last_update", "")
+    if not ts:
+        return None
+    return parser.parse(ts)
+
+
 def run_labels(run) -> dict:
     return get_in(run, "metadata.labels", {})
 
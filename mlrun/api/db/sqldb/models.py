@@ -22,8 +22,10 @@ from sqlalchemy import (
     BLOB,
     JSON,
     TIMESTAMP,
+    BigInteger,
     Column,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
@@ -33,10 +35,77 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import class_mapper, relationship
 
 from mlrun.api import schemas
+from mlrun.config import config
 
 Base = declarative_base()
 NULL = None  # Avoid flake8 issuing warnings when comparing in filter
 run_time_fmt = "%Y-%m-%dT%H:%M:%S.%fZ"
+_zstd_magic = b"\x28\xb5\x2f\xfd"
+_missing = object()
+
+
+def encode_struct(value) -> bytes:
+    """encode a struct as a record body, by default as (orjson) JSON, see config.httpdb.db.body_format and
+    body_compression, structs which JSON cannot restore as is are pickled (see to_lossless_json)"""
+    if config.httpdb.db.body_format == "pickle":
+        return pickle.dumps(value)
+    body = to_lossless_json(value)
+    if body is None:
+        return pickle.dumps(value)
+    if config.httpdb.db.body_compression == "zstd":
+        body = _get_zstandard().ZstdCompressor().compress(body)
+    return body
+
+
+def to_lossless_json(value):
+    """encode the value as JSON, return None when it is not JSON serializable (e.g. non str keys) or when
+    decoding the JSON would not return an equal value (e.g. NaN, datetime, tuple or numpy array values)"""
+    try:
+        body = orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY)
+        if orjson.loads(body) == value:
+            return body
+    except (TypeError, ValueError):
+        # not serializable, or values which cannot be compared (e.g. arrays)
+        pass
+    return None
+
+
+def decode_struct(body: bytes):
+    """decode a record body, bodies can be pickled (the legacy format), JSON or zstd compressed JSON"""
+    if body is None:
+        return None
+    if body[:1] == b"\x80":
+        # pickle protocol 2 and above
+        return pickle.loads(body)
+    return orjson.loads(_decompress_body(body))
+
+
+def struct_to_json(body: bytes) -> bytes:
+    """return a record body as JSON, JSON bodies are returned without decoding them"""
+    if body is None or body[:1] == b"\x80":
+        struct = decode_struct(body)
+        try:
+            return orjson.dumps(struct, option=orjson.OPT_SERIALIZE_NUMPY, default=str)
+        except TypeError:
+            # e.g. non str keys
+            return json.dumps(struct, default=str).encode()
+    return _decompress_body(body)
+
+
+def _decompress_body(body: bytes) -> bytes:
+    if body[:4] == _zstd_magic:
+        return _get_zstandard().ZstdDecompressor().decompress(body)
+    return body
+
+
+def _get_zstandard():
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise ImportError(
+            "zstd compressed bodies require the zstandard package, pip install zstandard"
+        ) from exc
+    return zstandard
 
 
 class BaseModel:
@@ -58,11 +127,27 @@ class BaseModel:
 class HasStruct(BaseModel):
     @property
     def struct(self):
-        return pickle.loads(self.body)
+        """the decoded body (a new object on every access, which the caller can change)"""
+        return decode_struct(self.body)
 
     @struct.setter
     def struct(self, value):
-        self.body = pickle.dumps(value)
+        self.body = encode_struct(value)
+
+    @property
+    def struct_view(self):
+        """the decoded body for reading only, decoded once per instance (and body) and shared by all the
+        accesses, it must not be changed (use struct for a copy)"""
+        body = self.body
+        if getattr(self, "_decoded_body", _missing) is not body:
+            self._decoded_struct = decode_struct(body)
+            self._decoded_body = body
+        return self._decoded_struct
+
+    @property
+    def struct_json(self) -> bytes:
+        """the body as JSON (bytes), without a decode/encode round trip of JSON bodies"""
+        return struct_to_json(self.body)
 
     def to_dict(self, exclude=None):
         """
@@ -129,6 +214,9 @@ with warnings.catch_warnings():
         __tablename__ = "artifacts"
         __table_args__ = (
             UniqueConstraint("uid", "project", "key", name="_artifacts_uc"),
+            Index("_artifacts_project_key_idx", "project", "key"),
+            Index("_artifacts_project_kind_idx", "project", "kind"),
+            Index("_artifacts_project_updated_idx", "project", "updated"),
         )
 
         Label = make_label(__tablename__)
@@ -139,6 +227,8 @@ with warnings.catch_warnings():
         project = Column(String)
         uid = Column(String)
         updated = Column(TIMESTAMP)
+        # kind is also in the body, kept as a column to filter by it in the query
+        kind = Column(String)
         # TODO: change to JSON, see mlrun/api/schemas/function.py::FunctionState for reasoning
         body = Column(BLOB)
         labels = relationship(Label)
@@ -168,12 +258,32 @@ with warnings.catch_warnings():
         uid = Column(String)
         project = Column(String)
         # TODO: change to JSON, see mlrun/api/schemas/function.py::FunctionState for reasoning
+        # legacy single blob logs, new logs are stored (appended) as LogChunk rows
+        body = Column(BLOB)
+
+    class LogChunk(Base, BaseModel):
+        __tablename__ = "log_chunks"
+        __table_args__ = (
+            UniqueConstraint("project", "uid", "sequence", name="_log_chunks_uc"),
+        )
+
+        id = Column(Integer, primary_key=True)
+        uid = Column(String)
+        project = Column(String)
+        sequence = Column(Integer)
+        # byte offset of the chunk in the log
+        offset = Column(BigInteger)
+        size = Column(Integer)
         body = Column(BLOB)
 
     class Run(Base, HasStruct):
         __tablename__ = "runs"
         __table_args__ = (
             UniqueConstraint("uid", "project", "iteration", name="_runs_uc"),
+            Index("_runs_project_name_idx", "project", "name"),
+            Index("_runs_project_state_idx", "project", "state"),
+            Index("_runs_project_start_time_idx", "project", "start_time"),
+            Index("_runs_project_updated_idx", "project", "updated"),
         )
 
         Label = make_label(__tablename__)
@@ -183,10 +293,14 @@ with warnings.catch_warnings():
         uid = Column(String)
         project = Column(String)
         iteration = Column(Integer)
+        # name, state and updated (status.last_update) are also in the body, kept as columns to filter by them in
+        # the query
+        name = Column(String)
         state = Column(String)
         # TODO: change to JSON, see mlrun/api/schemas/function.py::FunctionState for reasoning
         body = Column(BLOB)
         start_time = Column(TIMESTAMP)
+        updated = Column(TIMESTAMP)
         labels = relationship(Label)
 
     class Schedule(Base, BaseModel):
@@ -356,6 +470,22 @@ with warnings.catch_warnings():
         def full_object(self, value):
             self._full_object = json.dumps(value)
 
+    class ProjectResourcesCounters(Base, BaseModel):
+        """the persisted resources counters of the projects summaries, updated with every change of the project
+        resources (see SQLDB._update_project_resources_counters)"""
+
+        __tablename__ = "project_resources_counters"
+        __table_args__ = (
+            UniqueConstraint("project", name="_project_resources_counters_uc"),
+        )
+
+        id = Column(Integer, primary_key=True)
+        project = Column(String)
+        functions_count = Column(Integer, default=0)
+        feature_sets_count = Column(Integer, default=0)
+        models_count = Column(Integer, default=0)
+        runs_running_count = Column(Integer, default=0)
+
 
 # Must be after all table definitions
 _tagged = [cls for cls in Base.__subclasses__() if hasattr(cls, "Tag")]
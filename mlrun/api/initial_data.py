@@ -47,6 +47,7 @@ def _perform_data_migrations(
     _fill_project_state(db, db_session)
     _fix_artifact_tags_duplications(db, db_session)
     _fix_datasets_large_previews(db, db_session, leader_session)
+    _fill_project_resources_counters(db, db_session)
 
 
 def _fix_datasets_large_previews(
@@ -235,6 +236,15 @@ def _fill_project_state(
             db.store_project(db_session, project.metadata.name, project)
 
 
+def _fill_project_resources_counters(
+    db: mlrun.api.db.sqldb.db.SQLDB, db_session: sqlalchemy.orm.Session
+):
+    # the counters are maintained on every resource change, they only need to be built once (for existing DBs)
+    if db_session.query(mlrun.api.db.sqldb.models.ProjectResourcesCounters).first():
+        return
+    db.rebuild_project_resources_counters(db_session)
+
+
 def main() -> None:
     init_data()
 
@@ -1,9 +1,12 @@
 import logging
+import math
+import pickle
 
+import orjson
 import pytest
 from sqlalchemy.orm import sessionmaker
 
-from mlrun.api.db.sqldb.models import Schedule
+from mlrun.api.db.sqldb.models import Artifact, Run, Schedule
 from mlrun.config import config
 
 log = logging.getLogger(__name__)
@@ -21,6 +24,15 @@ class Constants:
     schedule_concurrency_limit_revision = "e1dd5983c06b"
     schedule_concurrency_limit_project = "schedule-concurrency-limit-project"
 
+    runs_table = "runs"
+    artifacts_table = "artifacts"
+
+    filter_columns_revision = "9d16de5f03a7"
+    filter_columns_project = "filter-columns-project"
+
+    json_bodies_revision = "c4af40b0bf61"
+    json_bodies_project = "json-bodies-project"
+
 
 @pytest.fixture
 def alembic_config():
@@ -50,6 +62,65 @@ def alembic_config():
                 }
                 for name in ["test-schedule5", "test-schedule6"]
             ],
+            Constants.filter_columns_revision: [
+                {
+                    "__tablename__": Constants.runs_table,
+                    "project": Constants.filter_columns_project,
+                    "uid": "test-run1",
+                    "iteration": 0,
+                    # the body state has precedence over the (not updated) record state
+                    "state": "running",
+                    "body": pickle.dumps(
+                        {
+                            "metadata": {"name": "test-run"},
+                            "status": {
+                                "state": "completed",
+                                "last_update": "2021-04-20T10:00:00.000000+00:00",
+                            },
+                        }
+                    ),
+                },
+                {
+                    "__tablename__": Constants.runs_table,
+                    "project": Constants.filter_columns_project,
+                    "uid": "test-run2",
+                    "iteration": 0,
+                    "state": "error",
+                    "body": pickle.dumps({"metadata": {}, "status": {}}),
+                },
+                {
+                    "__tablename__": Constants.artifacts_table,
+                    "project": Constants.filter_columns_project,
+                    "key": "test-artifact",
+                    "uid": "test-artifact-uid",
+                    "body": pickle.dumps({"kind": "model"}),
+                },
+            ],
+            Constants.json_bodies_revision: [
+                {
+                    "__tablename__": Constants.runs_table,
+                    "project": Constants.json_bodies_project,
+                    "uid": "test-run",
+                    "iteration": 0,
+                    "body": pickle.dumps({"metadata": {"name": "test-run"}}),
+                },
+                {
+                    "__tablename__": Constants.artifacts_table,
+                    "project": Constants.json_bodies_project,
+                    "key": "test-artifact",
+                    "uid": "test-artifact-uid",
+                    # not JSON serializable (non str keys), stays pickled
+                    "body": pickle.dumps({"kind": "model", 1: "one"}),
+                },
+                {
+                    "__tablename__": Constants.artifacts_table,
+                    "project": Constants.json_bodies_project,
+                    "key": "test-artifact-nan",
+                    "uid": "test-artifact-nan-uid",
+                    # JSON would not restore the NaN and the tuple, stays pickled
+                    "body": pickle.dumps({"kind": "model", "stats": (float("nan"), 1)}),
+                },
+            ],
         },
     }
 
@@ -121,3 +192,57 @@ def test_schedule_concurrency_limit_column(
             instance.concurrency_limit
             == config.httpdb.scheduling.default_concurrency_limit
         )
+
+
+@pytest.mark.alembic
+def test_runs_and_artifacts_filter_columns(
+    alembic_runner, alembic_session, alembic_config
+):
+    alembic_runner.migrate_up_to(Constants.filter_columns_revision)
+
+    runs = (
+        alembic_session.query(Run.uid, Run.name, Run.state, Run.updated)
+        .filter_by(project=Constants.filter_columns_project)
+        .order_by(Run.id)
+        .all()
+    )
+    assert [(run.uid, run.name, run.state) for run in runs] == [
+        ("test-run1", "test-run", "completed"),
+        ("test-run2", None, "error"),
+    ]
+    assert runs[0].updated.isoformat() == "2021-04-20T10:00:00"
+    assert runs[1].updated is None
+
+    artifact = (
+        alembic_session.query(Artifact.kind)
+        .filter_by(project=Constants.filter_columns_project)
+        .one()
+    )
+    assert artifact.kind == "model"
+
+
+@pytest.mark.alembic
+def test_json_bodies(alembic_runner, alembic_session, alembic_config):
+    alembic_runner.migrate_up_to(Constants.json_bodies_revision)
+
+    run = (
+        alembic_session.query(Run.body)
+        .filter_by(project=Constants.json_bodies_project)
+        .one()
+    )
+    assert orjson.loads(run.body) == {"metadata": {"name": "test-run"}}
+
+    artifact = (
+        alembic_session.query(Artifact.body)
+        .filter_by(project=Constants.json_bodies_project, key="test-artifact")
+        .one()
+    )
+    assert pickle.loads(artifact.body) == {"kind": "model", 1: "one"}
+
+    artifact = (
+        alembic_session.query(Artifact.body)
+        .filter_by(project=Constants.json_bodies_project, key="test-artifact-nan")
+        .one()
+    )
+    stats = pickle.loads(artifact.body)["stats"]
+    assert isinstance(stats, tuple) and math.isnan(stats[0])
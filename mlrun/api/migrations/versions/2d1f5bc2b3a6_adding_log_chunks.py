@@ -0,0 +1,54 @@
+"""Adding log chunks
+
+Revision ID: 2d1f5bc2b3a6
+Revises: e1dd5983c06b
+Create Date: 2021-04-12 10:21:43.318544
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "2d1f5bc2b3a6"
+down_revision = "e1dd5983c06b"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # existing (single blob) logs are moved to chunks when they are appended to
+    op.create_table(
+        "log_chunks",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("uid", sa.String(), nullable=True),
+        sa.Column("project", sa.String(), nullable=True),
+        sa.Column("sequence", sa.Integer(), nullable=True),
+        sa.Column("offset", sa.BigInteger(), nullable=True),
+        sa.Column("size", sa.Integer(), nullable=True),
+        sa.Column("body", sa.BLOB(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("project", "uid", "sequence", name="_log_chunks_uc"),
+    )
+
+
+def downgrade():
+    # move the chunked logs back to the (single blob) logs table
+    connection = op.get_bind()
+    chunks = connection.execute(
+        sa.text(
+            "SELECT project, uid, body FROM log_chunks ORDER BY project, uid, sequence"
+        )
+    )
+    bodies = {}
+    for project, uid, body in chunks:
+        bodies.setdefault((project, uid), []).append(body)
+    for (project, uid), parts in bodies.items():
+        connection.execute(
+            sa.text(
+                "UPDATE logs SET body = :body WHERE project = :project AND uid = :uid"
+            ),
+            body=b"".join(parts),
+            project=project,
+            uid=uid,
+        )
+    op.drop_table("log_chunks")
@@ -0,0 +1,34 @@
+"""Adding project resources counters
+
+Revision ID: 7b6c2e1a9f44
+Revises: c4af40b0bf61
+Create Date: 2021-04-28 11:24:08.313041
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7b6c2e1a9f44"
+down_revision = "c4af40b0bf61"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # the counters of existing projects are filled by the data migrations (see initial_data)
+    op.create_table(
+        "project_resources_counters",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("project", sa.String(), nullable=True),
+        sa.Column("functions_count", sa.Integer(), nullable=True),
+        sa.Column("feature_sets_count", sa.Integer(), nullable=True),
+        sa.Column("models_count", sa.Integer(), nullable=True),
+        sa.Column("runs_running_count", sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("project", name="_project_resources_counters_uc"),
+    )
+
+
+def downgrade():
+    op.drop_table("project_resources_counters")
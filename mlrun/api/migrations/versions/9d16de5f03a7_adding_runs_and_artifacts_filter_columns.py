@@ -0,0 +1,138 @@
+"""Adding runs and artifacts filter columns
+
+Revision ID: 9d16de5f03a7
+Revises: 2d1f5bc2b3a6
+Create Date: 2021-04-20 13:05:12.846113
+
+"""
+import pickle
+
+import sqlalchemy as sa
+from alembic import op
+from dateutil import parser
+
+# revision identifiers, used by Alembic.
+revision = "9d16de5f03a7"
+down_revision = "2d1f5bc2b3a6"
+branch_labels = None
+depends_on = None
+
+backfill_batch_size = 1000
+
+runs_indexes = {
+    "_runs_project_name_idx": ["project", "name"],
+    "_runs_project_state_idx": ["project", "state"],
+    "_runs_project_start_time_idx": ["project", "start_time"],
+    "_runs_project_updated_idx": ["project", "updated"],
+}
+artifacts_indexes = {
+    "_artifacts_project_key_idx": ["project", "key"],
+    "_artifacts_project_kind_idx": ["project", "kind"],
+    "_artifacts_project_updated_idx": ["project", "updated"],
+}
+
+
+def upgrade():
+    with op.batch_alter_table("runs") as batch_op:
+        batch_op.add_column(sa.Column("name", sa.String(), nullable=True))
+        batch_op.add_column(sa.Column("updated", sa.TIMESTAMP(), nullable=True))
+        for index_name, columns in runs_indexes.items():
+            batch_op.create_index(index_name, columns)
+
+    with op.batch_alter_table("artifacts") as batch_op:
+        batch_op.add_column(sa.Column("kind", sa.String(), nullable=True))
+        for index_name, columns in artifacts_indexes.items():
+            batch_op.create_index(index_name, columns)
+
+    _backfill_runs()
+    _backfill_artifacts()
+
+
+def downgrade():
+    with op.batch_alter_table("artifacts") as batch_op:
+        for index_name in artifacts_indexes:
+            batch_op.drop_index(index_name)
+        batch_op.drop_column("kind")
+
+    with op.batch_alter_table("runs") as batch_op:
+        for index_name in runs_indexes:
+            batch_op.drop_index(index_name)
+        batch_op.drop_column("updated")
+        batch_op.drop_column("name")
+
+
+def _backfill_runs():
+    runs = sa.table(
+        "runs",
+        sa.column("id", sa.Integer),
+        sa.column("body", sa.BLOB),
+        sa.column("name", sa.String),
+        sa.column("state", sa.String),
+        sa.column("updated", sa.TIMESTAMP),
+    )
+
+    def to_values(record_id, state, body):
+        metadata = body.get("metadata") or {}
+        status = body.get("status") or {}
+        last_update = status.get("last_update")
+        return {
+            "_id": record_id,
+            "_name": metadata.get("name"),
+            # there was a bug in which the state was only updated in the body, so the body state has precedence
+            "_state": status.get("state") or state,
+            "_updated": parser.parse(last_update) if last_update else None,
+        }
+
+    _backfill(
+        runs,
+        [runs.c.state],
+        to_values,
+        {
+            "name": sa.bindparam("_name"),
+            "state": sa.bindparam("_state"),
+            "updated": sa.bindparam("_updated"),
+        },
+    )
+
+
+def _backfill_artifacts():
+    artifacts = sa.table(
+        "artifacts",
+        sa.column("id", sa.Integer),
+        sa.column("body", sa.BLOB),
+        sa.column("kind", sa.String),
+    )
+
+    def to_values(record_id, body):
+        return {"_id": record_id, "_kind": body.get("kind")}
+
+    _backfill(artifacts, [], to_values, {"kind": sa.bindparam("_kind")})
+
+
+def _backfill(table, columns, to_values, values):
+    """fill the new columns of all the table records from their (pickled) body, reading the
+    records in batches of backfill_batch_size (by id)"""
+    connection = op.get_bind()
+    update = table.update().where(table.c.id == sa.bindparam("_id")).values(**values)
+    last_id = 0
+    while True:
+        records = connection.execute(
+            sa.select([table.c.id] + columns + [table.c.body])
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(backfill_batch_size)
+        ).fetchall()
+        if not records:
+            break
+        last_id = records[-1][0]
+        updates = []
+        for record in records:
+            try:
+                body = pickle.loads(record[-1])
+            except Exception:
+                # leave the columns empty, they are filled on the next store of the record
+                continue
+            if isinstance(body, dict):
+                updates.append(to_values(*record[:-1], body))
+        if updates:
+            connection.execute(update, updates)
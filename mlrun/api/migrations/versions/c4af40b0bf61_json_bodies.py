@@ -0,0 +1,88 @@
+"""JSON bodies
+
+Revision ID: c4af40b0bf61
+Revises: 9d16de5f03a7
+Create Date: 2021-04-26 09:12:37.530194
+
+"""
+import pickle
+
+import orjson
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c4af40b0bf61"
+down_revision = "9d16de5f03a7"
+branch_labels = None
+depends_on = None
+
+tables = ["runs", "artifacts", "functions"]
+batch_size = 1000
+zstd_magic = b"\x28\xb5\x2f\xfd"
+
+
+def upgrade():
+    # bodies which are not JSON serializable, or which JSON would not restore as is (e.g. NaN, datetime or
+    # tuple values), stay pickled (both formats are read)
+    for table in tables:
+        _convert_bodies(table, _pickle_to_json)
+
+
+def downgrade():
+    for table in tables:
+        _convert_bodies(table, _json_to_pickle)
+
+
+def _pickle_to_json(body):
+    if body[:1] != b"\x80":
+        return None
+    try:
+        value = pickle.loads(body)
+        json_body = orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY)
+        if orjson.loads(json_body) == value:
+            return json_body
+    except Exception:
+        pass
+    return None
+
+
+def _json_to_pickle(body):
+    if body[:1] == b"\x80":
+        return None
+    if body[:4] == zstd_magic:
+        import zstandard
+
+        body = zstandard.ZstdDecompressor().decompress(body)
+    return pickle.dumps(orjson.loads(body))
+
+
+def _convert_bodies(table_name, convert):
+    """convert the table bodies in batches (by id), convert returns None for bodies to keep"""
+    connection = op.get_bind()
+    table = sa.table(
+        table_name, sa.column("id", sa.Integer), sa.column("body", sa.BLOB)
+    )
+    update = (
+        table.update()
+        .where(table.c.id == sa.bindparam("_id"))
+        .values(body=sa.bindparam("_body"))
+    )
+    last_id = 0
+    while True:
+        records = connection.execute(
+            sa.select([table.c.id, table.c.body])
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(batch_size)
+        ).fetchall()
+        if not records:
+            break
+        last_id = records[-1][0]
+        updates = []
+        for record_id, body in records:
+            new_body = convert(body) if body else None
+            if new_body is not None:
+                updates.append({"_id": record_id, "_body": new_body})
+        if updates:
+            connection.execute(update, updates)
@@ -12,7 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import hashlib
+import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 import yaml
 
@@ -21,7 +23,12 @@ import mlrun.errors
 
 from ..datastore import get_store_uri, is_store_uri, store_manager
 from ..model import ModelObj
-from ..utils import StorePrefix, calculate_local_file_hash, generate_artifact_uri
+from ..utils import (
+    StorePrefix,
+    calculate_local_file_hash,
+    generate_artifact_uri,
+    logger,
+)
 
 calc_hash = True
 
@@ -180,26 +187,87 @@ class DirArtifact(Artifact):
         "tree",
         "src_path",
         "target_path",
+        "hash",
         "description",
+        "size",
         "db_key",
     ]
     kind = "dir"
 
+    # the files manifest (relative path -> hash and size) of the uploaded directory, stored in the target dir
+    manifest_file = ".mlrun-manifest.json"
+
     @property
     def is_dir(self):
         return True
 
     def upload(self):
+        """upload the local directory files (recursively) to the target directory
+
+        the files are hashed and uploaded in parallel (datastore.dir_upload_concurrency threads),
+        a manifest of the file hashes is stored in the target directory so when the directory
+        is logged again only the new/changed files are uploaded
+        """
         if not self.src_path:
             raise ValueError("local/source path not specified")
+        if not os.path.isdir(self.src_path):
+            raise ValueError(f"directory {self.src_path} not found, cant upload")
+
+        files = {}
+        for root, _, names in os.walk(self.src_path):
+            for name in names:
+                file_path = os.path.join(root, name)
+                relative_path = os.path.relpath(file_path, self.src_path)
+                relative_path = relative_path.replace(os.sep, "/")
+                if relative_path != self.manifest_file:
+                    files[relative_path] = file_path
+
+        concurrency = max(int(mlrun.mlconf.datastore.dir_upload_concurrency), 1)
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            hashes = executor.map(calculate_local_file_hash, files.values())
+            manifest = {
+                relative_path: {"hash": file_hash, "size": os.stat(file_path).st_size}
+                for (relative_path, file_path), file_hash in zip(files.items(), hashes)
+            }
+
+            previous_manifest = self._read_manifest()
+            changed_files = [
+                relative_path
+                for relative_path, file_info in manifest.items()
+                if previous_manifest.get(relative_path, {}).get("hash")
+                != file_info["hash"]
+            ]
+
+            def upload_file(relative_path):
+                store_manager.object(url=self._target_file(relative_path)).upload(
+                    files[relative_path]
+                )
+
+            # consume the results to raise the upload errors
+            for _ in executor.map(upload_file, changed_files):
+                pass
+
+        body = json.dumps(manifest, sort_keys=True)
+        store_manager.object(url=self._target_file(self.manifest_file)).put(body)
+        if calc_hash:
+            self.hash = blob_hash(body)
+        self.size = sum(file_info["size"] for file_info in manifest.values())
+        logger.debug(
+            f"uploaded {len(changed_files)} new/changed files out of {len(manifest)} "
+            f"to {self.target_path}"
+        )
 
-        files = os.listdir(self.src_path)
-        for f in files:
-            file_path = os.path.join(self.src_path, f)
-            if not os.path.isfile(file_path):
-                raise ValueError(f"file {file_path} not found, cant upload")
-            target = os.path.join(self.target_path, f)
-            store_manager.object(url=target).upload(file_path)
+    def _target_file(self, relative_path):
+        return self.target_path.rstrip("/") + "/" + relative_path
+
+    def _read_manifest(self):
+        """the manifest of the previous upload to the target directory (empty if there is none)"""
+        try:
+            return json.loads(
+                store_manager.object(url=self._target_file(self.manifest_file)).get()
+            )
+        except Exception:
+            return {}
 
 
 class LinkArtifact(Artifact):
@@ -65,6 +65,11 @@ class ArtifactManager:
         self.input_artifacts = {}
         self.artifacts = {}
 
+        # when set, the artifacts are stored in the db (in bulk) only by flush_db(), used by the run context to
+        # coalesce its db updates
+        self.coalesce_db_updates = False
+        self._pending_db_artifacts = {}
+
     def artifact_list(self, full=False):
         artifacts = []
         for artifact in self.artifacts.values():
@@ -166,10 +171,37 @@ class ArtifactManager:
         if self.artifact_db:
             if sources:
                 item.sources = [{"name": k, "path": str(v)} for k, v in sources.items()]
+            if self.coalesce_db_updates:
+                # the same artifact (version) logged again replaces the pending one
+                self._pending_db_artifacts[
+                    (project, key, item.tree, item.iter, tag)
+                ] = {
+                    "key": key,
+                    "artifact": item.to_dict(),
+                    "uid": item.tree,
+                    "iter": item.iter,
+                    "tag": tag,
+                }
+                return
             self.artifact_db.store_artifact(
                 key, item.to_dict(), item.tree, iter=item.iter, tag=tag, project=project
             )
 
+    @property
+    def has_pending_db_updates(self):
+        return bool(self._pending_db_artifacts)
+
+    def flush_db(self):
+        """store the pending (coalesced) artifacts in the db, with one bulk call per project"""
+        if not self._pending_db_artifacts:
+            return
+        pending, self._pending_db_artifacts = self._pending_db_artifacts, {}
+        project_artifacts = {}
+        for (project, *_), artifact in pending.items():
+            project_artifacts.setdefault(project, []).append(artifact)
+        for project, artifacts in project_artifacts.items():
+            self.artifact_db.store_artifacts(artifacts, project=project)
+
     def link_artifact(
         self,
         project,
@@ -74,6 +74,9 @@ default_config = {
     # log formatter (options: human | json)
     "log_formatter": "human",
     "submit_timeout": "180",  # timeout when submitting a new k8s resource
+    # minimal interval (in seconds) between the db updates of a run context, intermediate run updates (results,
+    # artifacts, etc.) are coalesced, the run state changes are always sent immediately
+    "run_db_updates_interval": "10",
     # runtimes cleanup interval in seconds
     "runtimes_cleanup_interval": "300",
     # runs monitoring interval in seconds
@@ -89,7 +92,25 @@ default_config = {
     #  configure this values on field systems, for newer system this will be configured correctly
     "v3io_api": "http://v3io-webapi:8081",
     "v3io_framesd": "http://framesd:8080",
-    "datastore": {"async_source_mode": "disabled"},
+    "datastore": {
+        "async_source_mode": "disabled",
+        # large objects are uploaded/downloaded in parts of transfer_part_size bytes (s3 multipart and ranged gets,
+        # v3io ranged gets and appends, azure blocks), with up to transfer_concurrency parallel parts
+        "transfer_part_size": 16 * 1024 * 1024,
+        "transfer_concurrency": 4,
+        # number of files which are uploaded in parallel when logging a directory artifact
+        "dir_upload_concurrency": 16,
+        # node local (on disk) cache of remote data items (used by DataItem local(), download() and as_df()),
+        # entries are keyed by the url and version (artifact hash or etag/modified), least recently used entries
+        # are evicted when the cache size exceeds max_size bytes, except for entries used in the last
+        # eviction_grace_period seconds. the path can be shared by the node processes
+        "cache": {
+            "mode": "disabled",
+            "path": "",
+            "max_size": 20 * 1024 * 1024 * 1024,
+            "eviction_grace_period": 300,
+        },
+    },
     # default node selector to be applied to all functions - json string base64 encoded format
     "default_function_node_selector": "e30=",
     "httpdb": {
@@ -101,11 +122,31 @@ default_config = {
         "password": "",
         "token": "",
         "logs_path": "/mlrun/db/logs",
+        # logs are stored (appended) in chunks of up to max_chunk_size bytes
+        # streamed logs (the log stream endpoint) are read in chunks of up to stream_chunk_size bytes, persisted log
+        # files are polled for new data every stream_poll_interval seconds, and the stream is ended (the client
+        # reconnects) after stream_idle_timeout seconds without new data
+        "logs": {
+            "max_chunk_size": 1024 * 1024,
+            "stream_chunk_size": 64 * 1024,
+            "stream_poll_interval": 1,
+            "stream_idle_timeout": 60,
+        },
+        # runs/artifacts list pages (keyset pagination), the client reads the lists page by page
+        "pagination": {"default_page_size": 200, "max_page_size": 1000},
         "data_volume": "",
         "real_path": "",
         "db_type": "sqldb",
         "max_workers": "",
-        "db": {"commit_retry_timeout": 30, "commit_retry_interval": 3},
+        "db": {
+            "commit_retry_timeout": 30,
+            "commit_retry_interval": 3,
+            # the format runs/artifacts/functions are stored in, one of json, pickle (both are read), bodies
+            # which json would not restore as is (e.g. NaN, datetime or tuple values) are pickled
+            "body_format": "json",
+            # compression of json bodies, one of none, zstd (requires the zstandard package)
+            "body_compression": "none",
+        },
         "authentication": {
             "mode": "none",  # one of none, basic, bearer, iguazio
             "basic": {"username": "", "password": ""},
@@ -156,7 +197,6 @@ default_config = {
             "followers": "",
             # This is used as the interval for the sync loop both when mlrun is leader and follower
             "periodic_sync_interval": "1 minute",
-            "counters_cache_ttl": "10 seconds",
             # access key to be used when the leader is iguazio and polling is done from it
             "iguazio_access_key": "",
             # the initial implementation was cache and was working great, now it's not needed because we get (read/list)
@@ -189,6 +229,16 @@ default_config = {
         "store_prefixes": {
             "default": "v3io:///projects/{project}/model-endpoints/{kind}"
         },
+        # the serving model logs are pushed to the stream by a background thread (mode "background", or "sync"),
+        # in batches of up to batch_size records which are sent at least every flush_interval seconds, when the
+        # queue (of queue_size records) is full new records are dropped (when_full "drop") or wait ("block")
+        "stream_pusher": {
+            "mode": "background",
+            "queue_size": 10000,
+            "batch_size": 100,
+            "flush_interval": 1,
+            "when_full": "drop",
+        },
     },
     "secret_stores": {
         "vault": {
@@ -221,6 +271,8 @@ default_config = {
         "default_targets": "parquet,nosql",
         "default_job_image": "mlrun/mlrun",
         "flush_interval": 300,
+        # max rows per DataFrame chunk passed through the pandas engine graph (0 = no chunking)
+        "pandas_chunk_size": 0,
     },
     "ui": {
         "projects_prefix": "projects",  # The UI link prefix for projects
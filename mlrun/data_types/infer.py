@@ -1,3 +1,5 @@
+import base64
+
 import numpy as np
 import pandas as pd
 import pyarrow
@@ -88,12 +90,7 @@ def get_df_stats(df, options, num_bins=None):
         stats_dict = {}
         for stat, val in values.dropna().items():
             if stat != "50%":
-                if isinstance(val, (float, np.floating, np.float64)):
-                    stats_dict[stat] = float(val)
-                elif isinstance(val, (int, np.integer, np.int64)):
-                    stats_dict[stat] = int(val)
-                else:
-                    stats_dict[stat] = str(val)
+                stats_dict[stat] = _stat_value(val)
 
         if InferOptions.get_common_options(
             options, InferOptions.Histogram
@@ -109,6 +106,417 @@ def get_df_stats(df, options, num_bins=None):
     return results_dict
 
 
+def _stat_value(val):
+    if isinstance(val, (float, np.floating, np.float64)):
+        return float(val)
+    elif isinstance(val, (int, np.integer, np.int64)):
+        return int(val)
+    return str(val)
+
+
+class DFStatsAccumulator:
+    """mergeable dataframe stats, accumulated over chunks/batches (e.g. in chunked ingestion)
+
+    the result (get_stats) has the same structure as get_df_stats(). every column is kept
+    as a small sketch: count, mean, M2 (for std), min and max are exact, histograms are kept
+    in fixed (power of 2 width) bins which are re-binned to num_bins on get_stats(), the
+    categorical top value is kept in bounded frequency counters and the number of unique
+    values is estimated with HyperLogLog (exact when there are up to max_values values).
+
+    sketches are updated in O(chunk) and can be merged (e.g. stats of parallel ingestion
+    tasks or of appended batches), and serialized with to_dict()/from_dict()
+
+    example::
+
+        stats = DFStatsAccumulator(InferOptions.all_stats())
+        for df in chunks:
+            stats.update(df)
+        stats.merge(DFStatsAccumulator.from_dict(featureset.status.stats_sketch))
+        featureset.status.stats = stats.get_stats()
+    """
+
+    def __init__(self, options=None, num_bins=None, max_values=200, max_bins=128):
+        if options is None:
+            options = InferOptions.Stats + InferOptions.Histogram
+        self.options = options
+        self.num_bins = num_bins or default_num_bins
+        self.max_values = max_values
+        self.max_bins = max_bins
+        self._columns = {}
+
+    def update(self, df):
+        """add the stats of a dataframe chunk"""
+        if (
+            InferOptions.get_common_options(self.options, InferOptions.Index)
+            and df.index.name
+        ):
+            df = df.reset_index()
+        for col in df.columns:
+            self._get_column(col).update(df[col], self.max_values, self.max_bins)
+        return self
+
+    def merge(self, other: "DFStatsAccumulator"):
+        """merge the stats accumulated by another accumulator (of other chunks)"""
+        for col, column_stats in other._columns.items():
+            self._get_column(col).merge(column_stats, self.max_values, self.max_bins)
+        return self
+
+    def get_stats(self):
+        """return the accumulated stats (in get_df_stats() structure)"""
+        with_histogram = InferOptions.get_common_options(
+            self.options, InferOptions.Histogram
+        )
+        return {
+            col: column_stats.get_stats(with_histogram, self.num_bins)
+            for col, column_stats in self._columns.items()
+        }
+
+    def to_dict(self):
+        """return the (json serializable) column sketches"""
+        return {col: sketch.to_dict() for col, sketch in self._columns.items()}
+
+    @classmethod
+    def from_dict(cls, struct: dict, options=None, num_bins=None, **kwargs):
+        """create an accumulator from column sketches (to_dict() output)"""
+        accumulator = cls(options, num_bins, **kwargs)
+        for col, column_struct in (struct or {}).items():
+            accumulator._columns[col] = _ColumnStats.from_dict(column_struct)
+        return accumulator
+
+    def _get_column(self, col):
+        column_stats = self._columns.get(col)
+        if column_stats is None:
+            column_stats = self._columns[col] = _ColumnStats()
+        return column_stats
+
+
+class _ColumnStats:
+    def __init__(self):
+        self.kind = None
+        self.tz = None
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        self.bins = None
+        self.counters = {}
+        self.reduced = False
+        self.distinct = None
+
+    def update(self, series: pd.Series, max_values, max_bins):
+        if self.kind is None:
+            self.kind = _column_kind(series)
+            if self.kind == "datetime":
+                self.tz = str(series.dt.tz) if series.dt.tz else None
+
+        if self.kind == "object":
+            series = series.dropna()
+            self.count += len(series)
+            counts = series.value_counts(sort=False)
+            self._add_counters(zip(counts.index, counts.values), max_values)
+            return
+
+        series = series.dropna()
+        if not len(series):
+            return
+        if self.kind == "datetime":
+            values = series.values.view("int64")
+        else:
+            values = series.values.astype("float64")
+
+        other = _ColumnStats()
+        other.kind = self.kind
+        other.count = len(values)
+        other.mean = float(values.mean())
+        other.m2 = float(((values - other.mean) ** 2).sum())
+        other.min, other.max = values.min().item(), values.max().item()
+        if self.kind == "numeric":
+            other.bins = _Bins.from_values(values, max_bins)
+        self.merge(other, max_values, max_bins)
+
+    def merge(self, other: "_ColumnStats", max_values, max_bins):
+        if self.kind is None:
+            self.kind, self.tz = other.kind, other.tz
+        elif other.kind not in [None, self.kind]:
+            raise ValueError(
+                f"cannot merge {other.kind} column stats into {self.kind} column stats"
+            )
+        if not other.count:
+            return
+
+        if self.kind == "object":
+            self.count += other.count
+            if other.reduced:
+                self.distinct = _HyperLogLog.merged(
+                    self._get_distinct(), other.distinct
+                )
+                self.reduced = True
+            self._add_counters(other.counters.items(), max_values)
+            return
+
+        # combine the means and M2 (Chan et al.)
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / total
+        self.count = total
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        if self.kind == "numeric":
+            if self.count == other.count:
+                # first values
+                self.bins = other.bins
+            else:
+                self.bins = _Bins.merged(
+                    self.bins, other.bins, self.min, self.max, max_bins
+                )
+
+    def _add_counters(self, value_counts, max_values):
+        counters = self.counters
+        values = []
+        for value, count in value_counts:
+            value = _json_value(value)
+            values.append(value)
+            counters[value] = counters.get(value, 0) + int(count)
+        if self.distinct is not None:
+            self.distinct.add(values)
+        if len(counters) > max_values:
+            # until the counters are reduced they hold all the distinct values
+            self.distinct = self._get_distinct()
+            # keep the most frequent values, decrease all the counters by the count of
+            # the first dropped value (Misra-Gries, mergeable frequent items summary)
+            threshold = sorted(counters.values(), reverse=True)[max_values]
+            self.counters = {
+                value: count - threshold
+                for value, count in counters.items()
+                if count > threshold
+            }
+            self.reduced = True
+
+    def _get_distinct(self):
+        if self.distinct is None:
+            self.distinct = _HyperLogLog()
+            self.distinct.add(list(self.counters))
+        return self.distinct
+
+    def get_stats(self, with_histogram=False, num_bins=None):
+        if self.kind == "object":
+            stats_dict = {"count": self.count}
+            if self.reduced:
+                stats_dict["unique"] = self.distinct.estimate()
+            else:
+                stats_dict["unique"] = len(self.counters)
+            if self.counters:
+                top = max(self.counters, key=self.counters.get)
+                stats_dict["top"] = (
+                    str(top) if isinstance(top, bool) else _stat_value(top)
+                )
+                stats_dict["freq"] = int(self.counters[top])
+            return stats_dict
+
+        if self.kind == "datetime":
+            stats_dict = {"count": self.count}
+            if self.count:
+                stats_dict["mean"] = str(pd.Timestamp(int(self.mean), tz=self.tz))
+                stats_dict["min"] = str(pd.Timestamp(self.min, tz=self.tz))
+                stats_dict["max"] = str(pd.Timestamp(self.max, tz=self.tz))
+            return stats_dict
+
+        stats_dict = {"count": float(self.count)}
+        if self.count:
+            stats_dict["mean"] = float(self.mean)
+            if self.count > 1:
+                stats_dict["std"] = float(np.sqrt(self.m2 / (self.count - 1)))
+            stats_dict["min"] = float(self.min)
+            stats_dict["max"] = float(self.max)
+            if with_histogram and self.bins:
+                stats_dict["hist"] = self.bins.histogram(
+                    self.min, self.max, num_bins or default_num_bins
+                )
+        return stats_dict
+
+    def to_dict(self):
+        struct = {"kind": self.kind, "count": self.count}
+        if self.kind == "object":
+            struct["counters"] = [[value, c] for value, c in self.counters.items()]
+            struct["reduced"] = self.reduced
+            if self.distinct is not None:
+                struct["distinct"] = self.distinct.to_str()
+            return struct
+        if self.count:
+            struct.update(
+                {"mean": self.mean, "m2": self.m2, "min": self.min, "max": self.max}
+            )
+        if self.tz:
+            struct["tz"] = self.tz
+        if self.bins:
+            struct["bins"] = self.bins.to_dict()
+        return struct
+
+    @classmethod
+    def from_dict(cls, struct: dict):
+        column_stats = cls()
+        column_stats.kind = struct.get("kind")
+        column_stats.tz = struct.get("tz")
+        column_stats.count = struct.get("count", 0)
+        column_stats.mean = struct.get("mean", 0.0)
+        column_stats.m2 = struct.get("m2", 0.0)
+        column_stats.min = struct.get("min")
+        column_stats.max = struct.get("max")
+        if struct.get("bins"):
+            column_stats.bins = _Bins(**struct["bins"])
+        column_stats.counters = {
+            value: count for value, count in struct.get("counters", [])
+        }
+        column_stats.reduced = struct.get("reduced", False)
+        if struct.get("distinct"):
+            column_stats.distinct = _HyperLogLog.from_str(struct["distinct"])
+        return column_stats
+
+
+def _column_kind(series: pd.Series):
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return "datetime"
+    if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(
+        series.dtype
+    ):
+        return "numeric"
+    return "object"
+
+
+def _json_value(value):
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    return str(value)
+
+
+class _Bins:
+    """histogram counts in fixed bins of width 2^exp, aligned to 0
+
+    the bins width is the smallest (power of 2) width in which [min, max] fits in
+    max_bins bins, so the bins of any set of values can be merged (with the wider bins)
+    and the result does not depend on the order of the updates
+    """
+
+    min_exp = -1074
+
+    def __init__(self, exp: int, start: int, counts: list):
+        self.exp = exp
+        self.start = start
+        self.counts = counts
+
+    @staticmethod
+    def get_exp(min_value, max_value, max_bins):
+        if not np.isfinite(min_value) or not np.isfinite(max_value):
+            return None
+        # keep the bin indexes well within the float precision of the values
+        magnitude = max(abs(min_value), abs(max_value))
+        exp = int(np.frexp(magnitude)[1]) - 44 if magnitude else _Bins.min_exp
+        exp = max(exp, _Bins.min_exp)
+        if max_value > min_value:
+            exp = max(exp, int(np.ceil(np.log2((max_value - min_value) / max_bins))))
+        while (
+            np.floor(max_value / 2.0 ** exp) - np.floor(min_value / 2.0 ** exp)
+            >= max_bins
+        ):
+            exp += 1
+        return exp
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, max_bins):
+        exp = cls.get_exp(values.min(), values.max(), max_bins)
+        if exp is None:
+            return None
+        indexes = np.floor(values / 2.0 ** exp).astype("int64")
+        start = int(indexes.min())
+        counts = np.bincount(indexes - start)
+        return cls(exp, start, counts.tolist())
+
+    @classmethod
+    def merged(cls, bins, other, min_value, max_value, max_bins):
+        exp = cls.get_exp(min_value, max_value, max_bins)
+        if exp is None or bins is None or other is None:
+            return None
+        start = int(np.floor(min_value / 2.0 ** exp))
+        stop = int(np.floor(max_value / 2.0 ** exp)) + 1
+        counts = np.zeros(stop - start, dtype="int64")
+        for item in [bins, other]:
+            # every (narrower) bin is contained in a single wider bin
+            indexes = (item.start + np.arange(len(item.counts))) >> (exp - item.exp)
+            np.add.at(counts, indexes - start, item.counts)
+        return cls(exp, start, counts.tolist())
+
+    def histogram(self, min_value, max_value, num_bins):
+        """re-bin the counts to num_bins (same bins as np.histogram), the values of
+        each bin are placed at its lower edge (exact for values which are multiples of
+        the bins width, e.g. integers)"""
+        if min_value == max_value:
+            bin_range = (min_value - 0.5, max_value + 0.5)
+        else:
+            bin_range = (min_value, max_value)
+        positions = (self.start + np.arange(len(self.counts))) * 2.0 ** self.exp
+        hist, bins = np.histogram(
+            np.clip(positions, min_value, max_value),
+            bins=num_bins,
+            range=bin_range,
+            weights=self.counts,
+        )
+        return [hist.astype("int64").tolist(), bins.tolist()]
+
+    def to_dict(self):
+        return {"exp": self.exp, "start": self.start, "counts": self.counts}
+
+
+class _HyperLogLog:
+    """approximate distinct count (HyperLogLog with 2^precision registers)"""
+
+    precision = 11
+
+    def __init__(self, registers: np.ndarray = None):
+        if registers is None:
+            registers = np.zeros(2 ** self.precision, dtype="uint8")
+        self.registers = registers
+
+    def add(self, values: list):
+        """add (json) values"""
+        if not values:
+            return
+        series = pd.Series(values, dtype="object")
+        hashes = pd.util.hash_pandas_object(series, index=False).values
+        bits = 64 - self.precision
+        indexes = (hashes >> np.uint64(bits)).astype("int64")
+        remainders = (hashes & np.uint64((1 << bits) - 1)).astype("float64")
+        # rank = position of the first 1 bit in the remaining bits
+        ranks = bits + 1 - np.frexp(remainders)[1]
+        np.maximum.at(self.registers, indexes, ranks.astype("uint8"))
+
+    @staticmethod
+    def merged(hll, other):
+        if hll is None or other is None:
+            return hll or other
+        return _HyperLogLog(np.maximum(hll.registers, other.registers))
+
+    def estimate(self) -> int:
+        size = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size ** 2 / np.sum(2.0 ** -self.registers.astype("float64"))
+        zeros = int((self.registers == 0).sum())
+        if estimate <= 2.5 * size and zeros:
+            # small range correction (linear counting)
+            estimate = size * np.log(size / zeros)
+        return int(round(estimate))
+
+    def to_str(self):
+        return base64.b64encode(self.registers.tobytes()).decode()
+
+    @classmethod
+    def from_str(cls, value: str):
+        return cls(np.frombuffer(base64.b64decode(value), dtype="uint8").copy())
+
+
 def get_df_preview(df, preview_lines=20):
     """capture preview data from df"""
     # record sample rows from the dataframe
@@ -19,6 +19,7 @@ __all__ = ["DataItem", "get_store_resource"]
 from ..platforms.iguazio import OutputStream, parse_v3io_path
 from ..utils import logger
 from .base import DataItem
+from .cache import data_cache
 from .datastore import StoreManager, in_memory_store, uri_to_ipython
 from .s3 import parse_s3_bucket_and_key
 from .store_resources import (
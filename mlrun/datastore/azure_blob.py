@@ -17,7 +17,7 @@ import time
 import fsspec
 from azure.storage.blob import BlobServiceClient
 
-from .base import DataStore, FileStats
+from .base import DataStore, FileStats, transfer_options
 
 # Azure blobs will be represented with the following URL: az://<container name>. The storage account is already
 # pointed to by the connection string, so the user is not expected to specify it in any way.
@@ -29,7 +29,15 @@ class AzureBlobStore(DataStore):
 
         con_string = self._get_secret_or_env("AZURE_STORAGE_CONNECTION_STRING")
         if con_string:
-            self.bsc = BlobServiceClient.from_connection_string(con_string)
+            part_size, _ = transfer_options()
+            # blobs larger than a part are transferred in blocks/ranges of part_size
+            self.bsc = BlobServiceClient.from_connection_string(
+                con_string,
+                max_single_put_size=part_size,
+                max_block_size=part_size,
+                max_single_get_size=part_size,
+                max_chunk_get_size=part_size,
+            )
 
     def get_filesystem(self, silent=True):
         """return fsspec file system object, if supported"""
@@ -58,8 +66,15 @@ class AzureBlobStore(DataStore):
     def upload(self, key, src_path):
         # Need to strip leading / from key
         blob_client = self.bsc.get_blob_client(container=self.endpoint, blob=key[1:])
+        _, concurrency = transfer_options()
         with open(src_path, "rb") as data:
-            blob_client.upload_blob(data, overwrite=True)
+            blob_client.upload_blob(data, overwrite=True, max_concurrency=concurrency)
+
+    def download(self, key, target_path):
+        blob_client = self.bsc.get_blob_client(container=self.endpoint, blob=key[1:])
+        _, concurrency = transfer_options()
+        with open(target_path, "wb") as fp:
+            blob_client.download_blob(max_concurrency=concurrency).readinto(fp)
 
     def get(self, key, size=None, offset=0):
         blob_client = self.bsc.get_blob_client(container=self.endpoint, blob=key[1:])
@@ -76,7 +91,7 @@ class AzureBlobStore(DataStore):
         props = blob_client.get_blob_properties()
         size = props.size
         modified = props.last_modified
-        return FileStats(size, time.mktime(modified.timetuple()))
+        return FileStats(size, time.mktime(modified.timetuple()), etag=props.etag)
 
     def listdir(self, key):
         if key and not key.endswith("/"):
@@ -11,34 +11,56 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import mmap
+import shutil
 import sys
 from base64 import b64encode
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
 from os import getenv, path, remove
 from tempfile import mktemp
 
 import fsspec
+import numpy as np
 import orjson
 import pandas as pd
+import pyarrow as pa
 import pyarrow.parquet as pq
 import requests
 import urllib3
 
 import mlrun.errors
+from mlrun.config import config
 from mlrun.utils import is_ipython, logger
 
+from .cache import data_cache
+from .utils import (
+    combine_filters,
+    filter_columns,
+    filter_df,
+    filter_row_groups,
+    read_parquet_file,
+)
+
 verify_ssl = False
+default_chunksize = 100000
 if not verify_ssl:
     urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 
 class FileStats:
-    def __init__(self, size, modified, content_type=None):
+    def __init__(self, size, modified, content_type=None, etag=None):
         self.size = size
         self.modified = modified
         self.content_type = content_type
+        self.etag = etag
 
     def __repr__(self):
-        return f"FileStats(size={self.size}, modified={self.modified}, type={self.content_type})"
+        return (
+            f"FileStats(size={self.size}, modified={self.modified}, type={self.content_type}, "
+            f"etag={self.etag})"
+        )
 
 
 class DataStore:
@@ -127,6 +149,30 @@ class DataStore:
     def upload(self, key, src_path):
         pass
 
+    def _download_in_parts(self, key, target_path, size=None):
+        """download with parallel ranged gets (of datastore.transfer_part_size bytes), written directly to their
+        position in the target file, memory is bounded by the part size * concurrency and not by the object size.
+        used by stores which support ranged gets (get with size/offset)"""
+        part_size, concurrency = transfer_options()
+        if size is None:
+            size = self.stat(key).size
+        if size <= part_size:
+            return DataStore.download(self, key, target_path)
+
+        with open(target_path, "wb") as fp:
+            fp.truncate(size)
+
+        def download_part(offset):
+            data = self.get(key, size=min(part_size, size - offset), offset=offset)
+            with open(target_path, "r+b") as fp:
+                fp.seek(offset)
+                fp.write(data)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            # consume the results to raise the parts errors
+            for _ in executor.map(download_part, range(0, size, part_size)):
+                pass
+
     def as_df(
         self,
         url,
@@ -137,18 +183,23 @@ class DataStore:
         start_time=None,
         end_time=None,
         time_column=None,
+        filters=None,
         **kwargs,
     ):
         df_module = df_module or pd
+        is_arrow_format = False
         if url.endswith(".csv") or format == "csv":
             if columns:
-                kwargs["usecols"] = columns
+                kwargs["usecols"] = _with_filter_columns(columns, filters)
             reader = df_module.read_csv
+            if filters:
+                reader = _filtered_reader(reader, filters, columns)
         elif url.endswith(".parquet") or url.endswith(".pq") or format == "parquet":
             if columns:
                 kwargs["columns"] = columns
 
             def reader(*args, **kwargs):
+                time_filters = []
                 if start_time or end_time:
                     if sys.version_info < (3, 7):
                         raise ValueError(
@@ -173,20 +224,39 @@ class DataStore:
                         ]
                     else:
                         partitions_time_attributes = []
-                    filters = []
                     find_filters(
                         partitions_time_attributes,
                         start_time,
                         end_time,
-                        filters,
+                        time_filters,
                         time_column,
                     )
-                    kwargs["filters"] = filters
+
+                all_filters = combine_filters(time_filters, filters)
+                if all_filters:
+                    kwargs["filters"] = all_filters
+                    if hasattr(args[0], "read"):
+                        # single file, skip row groups using the column statistics
+                        return read_parquet_file(
+                            args[0], columns=kwargs.get("columns"), filters=all_filters
+                        )
 
                 return df_module.read_parquet(*args, **kwargs)
 
+            is_arrow_format = True
+
+        elif url.endswith(".feather") or format == "feather":
+            if columns:
+                kwargs["columns"] = _with_filter_columns(columns, filters)
+            reader = df_module.read_feather
+            if filters:
+                reader = _filtered_reader(reader, filters, columns)
+            is_arrow_format = True
+
         elif url.endswith(".json") or format == "json":
             reader = df_module.read_json
+            if filters:
+                reader = _filtered_reader(reader, filters)
 
         else:
             raise Exception(f"file type unhandled {url}")
@@ -198,6 +268,11 @@ class DataStore:
                 if storage_options:
                     kwargs["storage_options"] = storage_options
                 return reader(url, **kwargs)
+            elif is_arrow_format and self.kind == "file":
+                # memory map local (or mounted) files, arrow reads the columns without copying them
+                # to python buffers first
+                with pa.memory_map(self._join(subpath)) as source:
+                    return reader(source, **kwargs)
             else:
                 # If not dir, use fs.open() to avoid regression when pandas < 1.2 and does not
                 # support the storage_options parameter.
@@ -209,6 +284,85 @@ class DataStore:
         remove(tmp)
         return df
 
+    def as_df_chunks(
+        self,
+        url,
+        subpath,
+        columns=None,
+        chunksize=None,
+        format="",
+        filters=None,
+        **kwargs,
+    ):
+        """return a generator of dataframe chunks (of up to chunksize rows)
+
+        csv files are read incrementally (in chunksize rows chunks) and parquet files/dirs
+        are read a row group at a time, so memory is bounded by the chunk/row group size,
+        other formats (or stores without a file system) are read whole and then split.
+        parquet row groups which do not match the filters are skipped (using statistics)
+        """
+        chunksize = chunksize or default_chunksize
+        is_csv = url.endswith(".csv") or format == "csv"
+        is_parquet = (
+            url.endswith(".parquet") or url.endswith(".pq") or format == "parquet"
+        )
+        fs = self.get_filesystem()
+        if not fs or not (is_csv or is_parquet):
+            df = self.as_df(
+                url, subpath, columns=columns, format=format, filters=filters, **kwargs
+            )
+            yield from split_df(df, chunksize)
+            return
+
+        if is_csv:
+            if columns:
+                kwargs["usecols"] = _with_filter_columns(columns, filters)
+            with fs.open(url) as fp:
+                for df in pd.read_csv(fp, chunksize=chunksize, **kwargs):
+                    if filters:
+                        df = filter_df(df, filters)
+                        if columns:
+                            df = df[columns]
+                    yield df
+            return
+
+        paths = [url]
+        # find() returns the paths without the protocol (e.g. s3://)
+        base_path = fs._strip_protocol(url)
+        if self.supports_isdir() and fs.isdir(url):
+            # data files of a (partitioned) dataset, skip metadata files (e.g. _SUCCESS)
+            paths = sorted(
+                file_path
+                for file_path in fs.find(url)
+                if not path.basename(file_path).startswith(("_", "."))
+            )
+        for file_path in paths:
+            with fs.open(file_path) as fp:
+                parquet_file = pq.ParquetFile(fp)
+                read_columns = _with_filter_columns(columns, filters)
+                file_columns = read_columns
+                if columns:
+                    # partition columns are not part of the file schema
+                    file_columns = [
+                        column
+                        for column in read_columns
+                        if column in parquet_file.schema.names
+                    ]
+                for index in filter_row_groups(parquet_file, filters):
+                    df = parquet_file.read_row_group(
+                        index, columns=file_columns, use_pandas_metadata=True
+                    ).to_pandas()
+                    _add_partition_columns(
+                        df,
+                        fs._strip_protocol(file_path)[len(base_path) :],
+                        read_columns,
+                    )
+                    if filters:
+                        df = filter_df(df, filters)
+                        if columns and read_columns != columns:
+                            df = df[[c for c in columns if c in df.columns]]
+                    yield from split_df(df, chunksize)
+
     def to_dict(self):
         return {
             "name": self.name,
@@ -221,6 +375,43 @@ class DataStore:
         self.get_filesystem().rm(path=path, recursive=recursive, maxdepth=maxdepth)
 
 
+def _with_filter_columns(columns, filters):
+    # the columns to read, including the columns needed to apply the filters
+    if not columns or not filters:
+        return columns
+    return list(columns) + [
+        column for column in filter_columns(filters) if column not in columns
+    ]
+
+
+def _filtered_reader(reader, filters, columns=None):
+    def filtered_reader(*args, **kwargs):
+        df = filter_df(reader(*args, **kwargs), filters)
+        return df[columns] if columns else df
+
+    return filtered_reader
+
+
+def _add_partition_columns(df, relative_path, columns=None):
+    # hive style partition values (e.g. /year=2021/) are not stored in the data files
+    for part in relative_path.strip("/").split("/")[:-1]:
+        if "=" not in part:
+            continue
+        name, value = part.split("=", 1)
+        if name not in df.columns and (not columns or name in columns):
+            df[name] = int(value) if value.isdigit() else value
+
+
+def split_df(df, chunksize):
+    """split a dataframe to chunks of up to chunksize rows"""
+    chunksize = chunksize or default_chunksize
+    if len(df) <= chunksize:
+        yield df
+        return
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start : start + chunksize]
+
+
 class DataItem:
     """Data input/output class abstracting access to various local/remote data sources
 
@@ -299,13 +490,24 @@ class DataItem:
         """DataItem url e.g. /dir/path, s3://bucket/path"""
         return self._url
 
-    def get(self, size=None, offset=0, encoding=None):
+    def get(self, size=None, offset=0, encoding=None, as_memoryview=False):
         """read all or a byte range and return the content
 
-        :param size:     number of bytes to get
-        :param offset:   fetch from offset (in bytes)
-        :param encoding: encoding (e.g. "utf-8") for converting bytes to str
+        example::
+
+            # read a large object without copying it to memory
+            view = item.get(as_memoryview=True)
+            array = np.frombuffer(view, dtype="float32")
+
+        :param size:          number of bytes to get
+        :param offset:        fetch from offset (in bytes)
+        :param encoding:      encoding (e.g. "utf-8") for converting bytes to str
+        :param as_memoryview: return a (read only) memoryview of the memory mapped local file, remote
+                              objects are downloaded (see local()) and then mapped
         """
+        if as_memoryview:
+            body = _memory_map(self.local(), size=size, offset=offset)
+            return str(body, encoding) if encoding else body
         body = self._store.get(self._path, size=size, offset=offset)
         if encoding and isinstance(body, bytes):
             body = body.decode(encoding)
@@ -316,6 +518,10 @@ class DataItem:
 
         :param target_path: local target path for the downloaded item
         """
+        cache_path = self._cache_path()
+        if cache_path:
+            shutil.copyfile(cache_path, target_path)
+            return
         self._store.download(self._path, target_path)
 
     def put(self, data, append=False):
@@ -350,12 +556,21 @@ class DataItem:
         return self._store.listdir(self._path)
 
     def local(self):
-        """get the local path of the file, download to tmp first if its a remote object"""
+        """get the local path of the file, download to tmp first if its a remote object
+
+        when the data cache is enabled (config.datastore.cache) the path of the (shared) cached
+        copy is returned, the file must not be modified
+        """
         if self.kind == "file":
             return self._path
         if self._local_path:
             return self._local_path
 
+        cache_path = self._cache_path()
+        if cache_path:
+            self._local_path = cache_path
+            return self._local_path
+
         dot = self._path.rfind(".")
         self._local_path = mktemp() if dot == -1 else mktemp(self._path[dot:])
         logger.info(f"downloading {self.url} to local tmp")
@@ -363,20 +578,92 @@ class DataItem:
         return self._local_path
 
     def as_df(
-        self, columns=None, df_module=None, format="", **kwargs,
+        self, columns=None, df_module=None, format="", filters=None, **kwargs,
     ):
         """return a dataframe object (generated from the dataitem).
 
+        example::
+
+            # read only the rows of two tickers (parquet row groups are skipped using statistics)
+            df = item.as_df(filters=[("ticker", "in", ["GOOG", "MSFT"]), ("bid", ">", 10)])
+
         :param columns:   optional, list of columns to select
         :param df_module: optional, dataframe class (e.g. pd, dd, cudf, ..)
         :param format:    file format, if not specified it will be deducted from the suffix
+        :param filters:   optional, row filters in pyarrow format, list of (column, op, value)
+                          predicates (AND) or a list of such lists (OR), ops: =, ==, !=, <, <=,
+                          >, >=, in, not in. pushed down to the parquet reader (partitions and
+                          row group statistics), applied after the read for other formats
         """
+        cache_path = self._cache_path()
+        if cache_path:
+            # import here to avoid circular imports
+            from .filestore import FileStore
+
+            return FileStore(None, "file", "file").as_df(
+                cache_path,
+                cache_path,
+                columns=columns,
+                df_module=df_module,
+                format=format,
+                filters=filters,
+                **kwargs,
+            )
         return self._store.as_df(
             self._url,
             self._path,
             columns=columns,
             df_module=df_module,
             format=format,
+            filters=filters,
+            **kwargs,
+        )
+
+    def _cache_path(self):
+        """the path of the item in the local data cache, None if the cache is disabled or cannot be used"""
+        if not data_cache.enabled or self.kind in ["file", "memory"]:
+            return None
+        try:
+            return data_cache.get(self)
+        except Exception as exc:
+            # e.g. a directory, read it directly
+            logger.debug(f"cannot cache {self.url}, {exc}")
+            return None
+
+    def as_ndarray(self, mmap_mode=None, allow_pickle=False):
+        """return a numpy array (or NpzFile for .npz files) loaded from the dataitem (numpy format)
+
+        example::
+
+            # map a large array instead of reading it to memory
+            array = item.as_ndarray(mmap_mode="r")
+
+        :param mmap_mode:    optional, memory map the (local) .npy file, "r" (read only), "r+" or "c"
+                             (copy on write), see numpy.load. remote objects are downloaded first
+        :param allow_pickle: allow loading pickled object arrays
+        """
+        return np.load(self.local(), mmap_mode=mmap_mode, allow_pickle=allow_pickle)
+
+    def as_df_chunks(
+        self, columns=None, chunksize=None, format="", filters=None, **kwargs
+    ):
+        """return a generator of dataframe chunks (generated from the dataitem).
+
+        csv and parquet data is read incrementally, so memory use is bounded by the
+        chunk size (or the parquet row group size) and not by the data size
+
+        :param columns:   optional, list of columns to select
+        :param chunksize: optional, max number of rows per chunk
+        :param format:    file format, if not specified it will be deducted from the suffix
+        :param filters:   optional, row filters in pyarrow format (see as_df)
+        """
+        return self._store.as_df_chunks(
+            self._url,
+            self._path,
+            columns=columns,
+            chunksize=chunksize,
+            format=format,
+            filters=filters,
             **kwargs,
         )
 
@@ -419,13 +706,34 @@ class DataItem:
         return f"'{self.url}'"
 
 
+def _memory_map(file_path, size=None, offset=0):
+    """return a read only memoryview of the (memory mapped) file or a byte range of it"""
+    with open(file_path, "rb") as fp:
+        if not path.getsize(file_path):
+            # empty files cannot be mapped
+            return memoryview(b"")
+        # the map stays open as long as the view is referenced
+        mapped = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    return view[offset : offset + size if size else None]
+
+
 def get_range(size, offset):
     byterange = f"bytes={offset}-"
     if size:
-        byterange += str(offset + size)
+        # the range end is inclusive
+        byterange += str(offset + size - 1)
     return byterange
 
 
+def transfer_options():
+    """the (part size, concurrency) of chunked uploads/downloads, see datastore.transfer_part_size"""
+    return (
+        int(config.datastore.transfer_part_size),
+        max(int(config.datastore.transfer_concurrency), 1),
+    )
+
+
 def basic_auth_header(user, password):
     username = user.encode("latin1")
     password = password.encode("latin1")
@@ -435,14 +743,29 @@ def basic_auth_header(user, password):
 
 
 def http_get(url, headers=None, auth=None):
+    return _http_get_response(url, headers, auth).content
+
+
+def _http_get_response(url, headers=None, auth=None, stream=False):
     try:
-        response = requests.get(url, headers=headers, auth=auth, verify=verify_ssl)
+        response = requests.get(
+            url, headers=headers, auth=auth, verify=verify_ssl, stream=stream
+        )
     except OSError as exc:
         raise OSError(f"error: cannot connect to {url}: {exc}")
 
     mlrun.errors.raise_for_status(response)
 
-    return response.content
+    return response
+
+
+def http_download(url, target_path, headers=None, auth=None):
+    """stream the response body to the target file (in datastore.transfer_part_size chunks)"""
+    part_size, _ = transfer_options()
+    with _http_get_response(url, headers, auth, stream=True) as response:
+        with open(target_path, "wb") as fp:
+            for chunk in response.iter_content(chunk_size=part_size):
+                fp.write(chunk)
 
 
 def http_head(url, headers=None, auth=None):
@@ -467,6 +790,15 @@ def http_put(url, data, headers=None, auth=None):
     mlrun.errors.raise_for_status(response)
 
 
+def http_delete(url, headers=None, auth=None):
+    try:
+        response = requests.delete(url, headers=headers, auth=auth, verify=verify_ssl)
+    except OSError as exc:
+        raise OSError(f"error: cannot connect to {url}: {exc}")
+
+    mlrun.errors.raise_for_status(response)
+
+
 def http_upload(url, file_path, headers=None, auth=None):
     with open(file_path, "rb") as data:
         http_put(url, data, headers, auth)
@@ -493,9 +825,27 @@ class HttpStore(DataStore):
         raise ValueError("unimplemented")
 
     def get(self, key, size=None, offset=0):
-        data = http_get(self.url + self._join(key), None, self.auth)
-        if offset:
-            data = data[offset:]
-        if size:
-            data = data[:size]
+        headers = None
+        if size or offset:
+            headers = {"Range": get_range(size, offset)}
+        response = _http_get_response(self.url + self._join(key), headers, self.auth)
+        data = response.content
+        if headers and response.status_code != HTTPStatus.PARTIAL_CONTENT.value:
+            # the server does not support ranges (returned the whole body)
+            if offset:
+                data = data[offset:]
+            if size:
+                data = data[:size]
         return data
+
+    def download(self, key, target_path):
+        http_download(self.url + self._join(key), target_path, None, self.auth)
+
+    def stat(self, key):
+        head = http_head(self.url + self._join(key), None, self.auth)
+        modified = head.get("Last-Modified")
+        if modified:
+            modified = parsedate_to_datetime(modified).timestamp()
+        return FileStats(
+            int(head.get("Content-Length", "0")), modified, etag=head.get("ETag"),
+        )
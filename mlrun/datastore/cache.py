@@ -0,0 +1,197 @@
+# Copyright 2018 Iguazio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import hashlib
+import os
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from os import path
+
+from mlrun.config import config
+from mlrun.utils import logger
+
+try:
+    import fcntl
+except ImportError:  # windows, the cache works without the cross process locks
+    fcntl = None
+
+default_cache_dir = path.expanduser("~/.mlrun/cache")
+_evict_lock_file = ".evict.lock"
+# entries are locked with a fixed set of (striped) lock files, which are never removed
+_entry_lock_stripes = 64
+
+
+class DataCache:
+    """node local (on disk) cache of remote data items, see config.datastore.cache
+
+    entries are content addressed by the item url and version (the artifact hash, or the
+    object etag/size/modified), so an updated object gets a new entry and stale entries are
+    never read. entries are written to a temp file and renamed, and downloads of the same
+    entry by different processes are serialized with file locks (so it is downloaded once), the
+    locks are striped over a fixed set of lock files (by the entry key).
+    the least recently used entries are evicted when the cache exceeds max_size, except for entries used in the
+    last eviction_grace_period seconds (which may have just been returned to another process)
+
+    cached files are shared, they must not be modified or deleted by their users
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return config.datastore.cache.mode == "enabled"
+
+    @property
+    def path(self):
+        return config.datastore.cache.path or default_cache_dir
+
+    def stats(self) -> dict:
+        """the cache hits/misses/evictions counters (of the current process)"""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def get(self, item) -> str:
+        """return the local path of the cached item (DataItem), download it on a miss
+
+        return None if the item cannot be cached (its version is not known)
+        """
+        version = _item_version(item)
+        if not version:
+            return None
+        key = hashlib.sha256(f"{item.url}\n{version}".encode()).hexdigest()
+        cache_dir = self.path
+        cache_path = path.join(cache_dir, key + item.suffix)
+        if _touch(cache_path):
+            self._count("hits")
+            return cache_path
+
+        os.makedirs(cache_dir, exist_ok=True)
+        with _file_lock(_entry_lock_path(cache_path)):
+            # another process may have downloaded it while we waited for the lock
+            if _touch(cache_path):
+                self._count("hits")
+                return cache_path
+            self._count("misses")
+            tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            logger.info(f"downloading {item.url} to the local cache")
+            try:
+                item.store.download(item._path, tmp_path)
+                os.replace(tmp_path, cache_path)
+            finally:
+                if path.isfile(tmp_path):
+                    os.remove(tmp_path)
+
+        self._evict(cache_dir, keep=cache_path)
+        return cache_path
+
+    def _evict(self, cache_dir, keep=None):
+        """remove the least recently used entries until the cache size is below max_size
+
+        an entry is not evicted while its lock (stripe) is taken, e.g. while it is downloaded again
+        """
+        max_size = int(config.datastore.cache.max_size)
+        grace_period = float(config.datastore.cache.eviction_grace_period)
+        with _file_lock(
+            path.join(cache_dir, _evict_lock_file), blocking=False
+        ) as locked:
+            if not locked:
+                # another process is evicting
+                return
+            entries = []
+            with os.scandir(cache_dir) as scanner:
+                for entry in scanner:
+                    if entry.name.startswith(".") or entry.name.endswith(
+                        (".lock", ".tmp")
+                    ):
+                        continue
+                    try:
+                        stats = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stats.st_mtime, stats.st_size, entry.path))
+
+            total_size = sum(size for _, size, _ in entries)
+            now = time.time()
+            for mtime, size, entry_path in sorted(entries):
+                if total_size <= max_size or now - mtime < grace_period:
+                    # the rest of the entries were used later
+                    break
+                if entry_path == keep:
+                    continue
+                with _file_lock(_entry_lock_path(entry_path), blocking=False) as locked:
+                    if not locked:
+                        # the entry (or another entry of the stripe) is being downloaded
+                        continue
+                    try:
+                        os.remove(entry_path)
+                    except FileNotFoundError:
+                        pass
+                total_size -= size
+                self._count("evictions")
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+def _item_version(item):
+    artifact_hash = getattr(item.meta, "hash", None)
+    if artifact_hash:
+        return f"hash:{artifact_hash}"
+    stats = item.stat()
+    if not stats or not (stats.etag or stats.modified):
+        return None
+    return f"{stats.etag}:{stats.size}:{stats.modified}"
+
+
+def _entry_lock_path(cache_path):
+    """return the path of the (striped) lock file of the entry (entry name hash mod stripes)"""
+    stripe = zlib.crc32(path.basename(cache_path).encode()) % _entry_lock_stripes
+    return path.join(path.dirname(cache_path), f".entry-{stripe}.lock")
+
+
+def _touch(cache_path):
+    """mark the entry as recently used, return False if it does not exist"""
+    try:
+        os.utime(cache_path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+@contextmanager
+def _file_lock(lock_path, blocking=True):
+    """exclusive (cross process) file lock, yields False if not blocking and the lock is taken"""
+    if not fcntl:
+        yield True
+        return
+    with open(lock_path, "a") as fp:
+        try:
+            fcntl.flock(
+                fp, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            )
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(fp, fcntl.LOCK_UN)
+
+
+data_cache = DataCache()
@@ -19,6 +19,7 @@ import pandas as pd
 import mlrun
 
 from .base import DataStore, FileStats
+from .utils import filter_df
 
 
 class InMemoryStore(DataStore):
@@ -58,10 +59,19 @@ class InMemoryStore(DataStore):
     def listdir(self, key):
         return []
 
-    def as_df(self, url, subpath, columns=None, df_module=None, format="", **kwargs):
+    def as_df(
+        self,
+        url,
+        subpath,
+        columns=None,
+        df_module=None,
+        format="",
+        filters=None,
+        **kwargs,
+    ):
         item = self._get_item(subpath)
         if hasattr(item, "to_csv"):  # detect if it is a dataframe type
-            return item
+            return filter_df(item, filters)
         if isinstance(item, str):
             item = StringIO(item)
         else:
@@ -81,4 +91,4 @@ class InMemoryStore(DataStore):
         else:
             raise mlrun.errors.MLRunInvalidArgumentError(f"file type unhandled {url}")
 
-        return reader(item, **kwargs)
+        return filter_df(reader(item, **kwargs), filters)
@@ -16,10 +16,11 @@ import time
 
 import boto3
 import fsspec
+from boto3.s3.transfer import TransferConfig
 
 import mlrun.errors
 
-from .base import DataStore, FileStats, get_range
+from .base import DataStore, FileStats, get_range, transfer_options
 
 
 class S3Store(DataStore):
@@ -63,9 +64,26 @@ class S3Store(DataStore):
             secret=self._get_secret_or_env("AWS_SECRET_ACCESS_KEY"),
         )
 
+    @staticmethod
+    def _transfer_config():
+        part_size, concurrency = transfer_options()
+        return TransferConfig(
+            multipart_threshold=part_size,
+            multipart_chunksize=part_size,
+            max_concurrency=concurrency,
+            use_threads=concurrency > 1,
+        )
+
     def upload(self, key, src_path):
-        self.s3.Object(self.endpoint, self._join(key)[1:]).put(
-            Body=open(src_path, "rb")
+        # multipart upload (parallel parts) for files larger than a part
+        self.s3.Object(self.endpoint, self._join(key)[1:]).upload_file(
+            src_path, Config=self._transfer_config()
+        )
+
+    def download(self, key, target_path):
+        # parallel ranged gets for objects larger than a part, streamed to the target file
+        self.s3.Object(self.endpoint, self._join(key)[1:]).download_file(
+            target_path, Config=self._transfer_config()
         )
 
     def get(self, key, size=None, offset=0):
@@ -81,7 +99,7 @@ class S3Store(DataStore):
         obj = self.s3.Object(self.endpoint, self._join(key)[1:])
         size = obj.content_length
         modified = obj.last_modified
-        return FileStats(size, time.mktime(modified.timetuple()))
+        return FileStats(size, time.mktime(modified.timetuple()), etag=obj.e_tag)
 
     def listdir(self, key):
         if not key.endswith("/"):
@@ -20,6 +20,7 @@ import mlrun
 from ..config import config
 from ..model import DataSource
 from ..utils import get_class
+from .base import split_df
 from .utils import store_path_to_spark
 
 
@@ -59,6 +60,10 @@ class BaseSourceDriver(DataSource):
     def to_dataframe(self):
         return mlrun.store_manager.object(url=self.path).as_df()
 
+    def to_dataframe_chunks(self, chunksize=None):
+        """return a generator of dataframe chunks (of up to chunksize rows) from the source"""
+        return split_df(self.to_dataframe(), chunksize)
+
     def to_spark_df(self, session, named_view=False):
         if self.support_spark:
             df = session.read.load(**self.get_spark_options())
@@ -135,6 +140,12 @@ class CSVSource(BaseSourceDriver):
             parse_dates=self._parse_dates
         )
 
+    def to_dataframe_chunks(self, chunksize=None):
+        """return a generator of dataframe chunks, the csv file is read chunksize rows at a time"""
+        return mlrun.store_manager.object(url=self.path).as_df_chunks(
+            chunksize=chunksize, format="csv", parse_dates=self._parse_dates
+        )
+
 
 class ParquetSource(BaseSourceDriver):
     kind = "parquet"
@@ -189,6 +200,12 @@ class ParquetSource(BaseSourceDriver):
     def to_dataframe(self):
         return mlrun.store_manager.object(url=self.path).as_df(format="parquet")
 
+    def to_dataframe_chunks(self, chunksize=None):
+        """return a generator of dataframe chunks, the parquet data is read a row group at a time"""
+        return mlrun.store_manager.object(url=self.path).as_df_chunks(
+            chunksize=chunksize, format="parquet"
+        )
+
 
 class CustomSource(BaseSourceDriver):
     kind = "custom"
@@ -238,6 +255,9 @@ class DataFrameSource:
     def to_dataframe(self):
         return self._df
 
+    def to_dataframe_chunks(self, chunksize=None):
+        return split_df(self._df, chunksize)
+
 
 class OnlineSource(BaseSourceDriver):
     """online data source spec"""
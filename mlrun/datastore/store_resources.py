@@ -144,6 +144,11 @@ def get_store_resource(uri, db=None, secrets=None, project=None):
         return db.get_feature_vector(name, project, tag, uid)
 
     elif StorePrefix.is_artifact(kind):
+        # import here to avoid circular imports
+        from mlrun.execution import flush_pending_db_artifacts
+
+        # the artifact may be logged by a local run context and not stored in the db yet
+        flush_pending_db_artifacts()
         project, key, iteration, tag, uid = parse_artifact_uri(
             uri, project or config.default_project
         )
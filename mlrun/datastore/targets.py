@@ -18,6 +18,10 @@ import warnings
 from collections import Counter
 from copy import copy
 
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
 import mlrun
 import mlrun.utils.helpers
 from mlrun.config import config
@@ -28,7 +32,8 @@ from mlrun.utils.v3io_clients import get_frames_client
 from .. import errors
 from ..data_types import ValueType
 from ..platforms.iguazio import parse_v3io_path, split_path
-from .utils import store_path_to_spark
+from .base import default_chunksize, split_df
+from .utils import filter_df, store_path_to_spark
 
 
 class TargetTypes:
@@ -348,10 +353,7 @@ class BaseStoreTarget(DataTargetBase):
         else:
             target_path = self._target_path
             fs = self._get_store().get_filesystem(False)
-            if fs.protocol == "file":
-                dir = os.path.dirname(target_path)
-                if dir:
-                    os.makedirs(dir, exist_ok=True)
+            self._makedirs(fs)
             self._write_dataframe(df, fs, target_path, **kwargs)
             try:
                 return fs.size(target_path)
@@ -362,6 +364,31 @@ class BaseStoreTarget(DataTargetBase):
     def _write_dataframe(df, fs, target_path, **kwargs):
         raise NotImplementedError()
 
+    def get_chunks_writer(self, **kwargs) -> "ChunksWriter":
+        """return a writer which appends dataframe chunks to the target
+
+        example::
+
+            writer = target.get_chunks_writer()
+            for df in chunks:
+                writer.write(df)
+            size = writer.close()
+        """
+        return BufferedChunksWriter(self, **kwargs)
+
+    def write_dataframe_chunks(self, dfs, **kwargs) -> typing.Optional[int]:
+        """write dataframe chunks (e.g. a generator) to the target, one chunk at a time"""
+        writer = self.get_chunks_writer(**kwargs)
+        for df in dfs:
+            writer.write(df)
+        return writer.close()
+
+    def _makedirs(self, fs):
+        if fs.protocol == "file":
+            dir = os.path.dirname(self._target_path)
+            if dir:
+                os.makedirs(dir, exist_ok=True)
+
     def set_secrets(self, secrets):
         self._secrets = secrets
 
@@ -440,6 +467,7 @@ class BaseStoreTarget(DataTargetBase):
         start_time=None,
         end_time=None,
         time_column=None,
+        filters=None,
     ):
         """return the target data as dataframe"""
         return mlrun.get_dataitem(self._target_path).as_df(
@@ -448,6 +476,13 @@ class BaseStoreTarget(DataTargetBase):
             start_time=start_time,
             end_time=end_time,
             time_column=time_column,
+            filters=filters,
+        )
+
+    def as_df_chunks(self, columns=None, chunksize=None, filters=None):
+        """return a generator of target data chunks (dataframes)"""
+        return mlrun.get_dataitem(self._target_path).as_df_chunks(
+            columns=columns, chunksize=chunksize, filters=filters
         )
 
     def get_spark_options(self, key_column=None, timestamp_key=None):
@@ -637,6 +672,7 @@ class ParquetTarget(BaseStoreTarget):
         start_time=None,
         end_time=None,
         time_column=None,
+        filters=None,
     ):
         """return the target data as dataframe"""
         return mlrun.get_dataitem(self._target_path).as_df(
@@ -646,8 +682,22 @@ class ParquetTarget(BaseStoreTarget):
             start_time=start_time,
             end_time=end_time,
             time_column=time_column,
+            filters=filters,
+        )
+
+    def as_df_chunks(self, columns=None, chunksize=None, filters=None):
+        """return a generator of target data chunks (dataframes)"""
+        return mlrun.get_dataitem(self._target_path).as_df_chunks(
+            columns=columns, chunksize=chunksize, format="parquet", filters=filters
         )
 
+    def get_chunks_writer(self, **kwargs) -> "ChunksWriter":
+        """return a writer which writes dataframe chunks incrementally, as parquet row groups
+
+        the file schema is taken from the first chunk, following chunks are cast to it
+        """
+        return ParquetChunksWriter(self, **kwargs)
+
     def is_single_file(self):
         if self.path:
             return self.path.endswith(".parquet") or self.path.endswith(".pq")
@@ -672,6 +722,10 @@ class CSVTarget(BaseStoreTarget):
         with fs.open(target_path, mode) as fp:
             df.to_csv(fp, **kwargs)
 
+    def get_chunks_writer(self, **kwargs) -> "ChunksWriter":
+        """return a writer which appends dataframe chunks to the csv file (header is written once)"""
+        return CSVChunksWriter(self, **kwargs)
+
     def add_writer_state(
         self, graph, after, features, key_columns=None, timestamp_key=None
     ):
@@ -719,8 +773,11 @@ class CSVTarget(BaseStoreTarget):
         start_time=None,
         end_time=None,
         time_column=None,
+        filters=None,
     ):
-        df = super().as_df(columns=columns, df_module=df_module, entities=entities)
+        df = super().as_df(
+            columns=columns, df_module=df_module, entities=entities, filters=filters
+        )
         df.set_index(keys=entities, inplace=True)
         return df
 
@@ -814,6 +871,10 @@ class NoSqlTarget(BaseStoreTarget):
 
             frames_client.write("kv", path, df, index_cols=key_column, **kwargs)
 
+    def get_chunks_writer(self, **kwargs) -> "ChunksWriter":
+        """return a writer which writes (upserts) every dataframe chunk to the table"""
+        return ChunksWriter(self, **kwargs)
+
 
 class StreamTarget(BaseStoreTarget):
     kind = TargetTypes.stream
@@ -928,6 +989,10 @@ class TSDBTarget(BaseStoreTarget):
             "tsdb", path, df, index_cols=new_index if new_index else None, **kwargs
         )
 
+    def get_chunks_writer(self, **kwargs) -> "ChunksWriter":
+        """return a writer which writes (upserts) every dataframe chunk to the table"""
+        return ChunksWriter(self, **kwargs)
+
 
 class CustomTarget(BaseStoreTarget):
     kind = "custom"
@@ -1027,8 +1092,120 @@ class DFTarget(BaseStoreTarget):
         start_time=None,
         end_time=None,
         time_column=None,
+        filters=None,
     ):
-        return self._df
+        return filter_df(self._df, filters)
+
+    def as_df_chunks(self, columns=None, chunksize=None, filters=None):
+        return split_df(filter_df(self._df, filters), chunksize or default_chunksize)
+
+
+class ChunksWriter:
+    """write dataframe chunks to a target, one chunk at a time
+
+    the base writer writes every chunk using target.write_dataframe(), which is
+    correct for targets that upsert rows (e.g. NoSQL tables)
+    """
+
+    def __init__(self, target: BaseStoreTarget, **kwargs):
+        self._target = target
+        self._kwargs = kwargs
+        self._size = None
+
+    def write(self, df: pd.DataFrame):
+        """write (append) a dataframe chunk"""
+        self._size = self._target.write_dataframe(df, **self._kwargs)
+
+    def close(self) -> typing.Optional[int]:
+        """complete the write, return the target size (if available)"""
+        return self._size
+
+
+class BufferedChunksWriter(ChunksWriter):
+    """collect the chunks and write them as one dataframe on close
+
+    used for targets which cannot append to existing data
+    """
+
+    def __init__(self, target: BaseStoreTarget, **kwargs):
+        super().__init__(target, **kwargs)
+        self._dfs = []
+
+    def write(self, df: pd.DataFrame):
+        self._dfs.append(df)
+
+    def close(self) -> typing.Optional[int]:
+        df = pd.concat(self._dfs) if self._dfs else pd.DataFrame()
+        self._dfs = []
+        return self._target.write_dataframe(df, **self._kwargs)
+
+
+class _FileChunksWriter(ChunksWriter):
+    mode = "wb"
+
+    def __init__(self, target: BaseStoreTarget, **kwargs):
+        super().__init__(target, **kwargs)
+        self._fs = target._get_store().get_filesystem(False)
+        target._makedirs(self._fs)
+        self._fp = self._fs.open(target._target_path, self.mode)
+
+    def _close_file(self):
+        self._fp.close()
+        try:
+            return self._fs.size(self._target._target_path)
+        except Exception:
+            return None
+
+
+class ParquetChunksWriter(_FileChunksWriter):
+    """write dataframe chunks as row groups of a parquet file"""
+
+    def __init__(self, target: BaseStoreTarget, **kwargs):
+        super().__init__(target, **kwargs)
+        self._writer = None
+
+    def write(self, df: pd.DataFrame):
+        if self._writer is None:
+            table = pa.Table.from_pandas(df)
+            # all null columns in the first chunk are stored as strings
+            schema = pa.schema(
+                [
+                    field.with_type(pa.string()) if field.type == pa.null() else field
+                    for field in table.schema
+                ],
+                metadata=table.schema.metadata,
+            )
+            table = table.cast(schema)
+            self._writer = pq.ParquetWriter(self._fp, schema, **self._kwargs)
+        else:
+            table = pa.Table.from_pandas(df, schema=self._writer.schema, safe=False)
+        self._writer.write_table(table)
+
+    def close(self) -> typing.Optional[int]:
+        if self._writer is None:
+            pd.DataFrame().to_parquet(self._fp)
+        else:
+            self._writer.close()
+        return self._close_file()
+
+
+class CSVChunksWriter(_FileChunksWriter):
+    """append dataframe chunks to a csv file, the header is written with the first chunk"""
+
+    # see CSVTarget._write_dataframe for the python 3.6 text mode workaround
+    mode = "wt" if sys.version_info[:2] == (3, 6) else "wb"
+
+    def __init__(self, target: BaseStoreTarget, **kwargs):
+        super().__init__(target, **kwargs)
+        self._header = kwargs.pop("header", True)
+        self._kwargs = kwargs
+
+    def write(self, df: pd.DataFrame):
+        df.to_csv(self._fp, header=self._header, **self._kwargs)
+        self._header = False
+
+    def close(self) -> typing.Optional[int]:
+        return self._close_file()
 
 
 kind_to_driver = {
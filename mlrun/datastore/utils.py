@@ -1,4 +1,178 @@
+from bisect import bisect_left
+
+
 def store_path_to_spark(path):
     if path.startswith("v3io:///"):
         path = "v3io:" + path[len("v3io:/") :]
     return path
+
+
+def normalize_filters(filters):
+    """return filters in disjunctive normal form (list of lists of predicates)
+
+    filters use the pyarrow (column, op, value) format, a flat list of predicates
+    is a single conjunction (AND), a list of lists is an OR of conjunctions
+    """
+    if not filters:
+        return []
+    if isinstance(filters[0], tuple):
+        return [list(filters)]
+    return [list(conjunction) for conjunction in filters]
+
+
+def combine_filters(filters, other_filters):
+    """combine (AND) two filter expressions, returns normalized (DNF) filters"""
+    filters = normalize_filters(filters)
+    other_filters = normalize_filters(other_filters)
+    if not filters or not other_filters:
+        return filters or other_filters
+    return [
+        conjunction + other_conjunction
+        for conjunction in filters
+        for other_conjunction in other_filters
+    ]
+
+
+def filter_columns(filters):
+    """return the columns which are used in the filters"""
+    columns = []
+    for conjunction in normalize_filters(filters):
+        for column, _, _ in conjunction:
+            if column not in columns:
+                columns.append(column)
+    return columns
+
+
+_in_sorted = "in (sorted)"
+
+
+def _sort_in_values(predicate):
+    # sorted "in" values are matched against the row group ranges using bisect
+    column, op, value = predicate
+    if op == "in":
+        try:
+            return column, _in_sorted, sorted(value)
+        except TypeError:
+            pass
+    return predicate
+
+
+def _may_match(op, value, min_value, max_value):
+    # can the predicate be true for a value in the [min_value, max_value] range
+    try:
+        if op in ["=", "=="]:
+            return min_value <= value <= max_value
+        if op == "in":
+            return any(min_value <= item <= max_value for item in value)
+        if op == _in_sorted:
+            position = bisect_left(value, min_value)
+            return position < len(value) and value[position] <= max_value
+        if op == "<":
+            return min_value < value
+        if op == "<=":
+            return min_value <= value
+        if op == ">":
+            return max_value > value
+        if op == ">=":
+            return max_value >= value
+    except TypeError:
+        # incomparable types (e.g. statistics in a different type), cannot skip
+        pass
+    return True
+
+
+def filter_row_groups(parquet_file, filters):
+    """return the indexes of the row groups which may match the filters
+
+    row groups are skipped based on their column (min/max) statistics
+    """
+    filters = [
+        [_sort_in_values(predicate) for predicate in conjunction]
+        for conjunction in normalize_filters(filters)
+    ]
+    metadata = parquet_file.metadata
+    row_groups = []
+    for index in range(metadata.num_row_groups):
+        row_group = metadata.row_group(index)
+        statistics = {}
+        for column_index in range(row_group.num_columns):
+            column = row_group.column(column_index)
+            if column.is_stats_set and column.statistics.has_min_max:
+                statistics[column.path_in_schema] = column.statistics
+        if not filters or any(
+            all(
+                column not in statistics
+                or _may_match(op, value, statistics[column].min, statistics[column].max)
+                for column, op, value in conjunction
+            )
+            for conjunction in filters
+        ):
+            row_groups.append(index)
+    return row_groups
+
+
+def _predicate_mask(series, op, value):
+    if op in ["=", "=="]:
+        return series == value
+    if op == "!=":
+        return series != value
+    if op == "<":
+        return series < value
+    if op == "<=":
+        return series <= value
+    if op == ">":
+        return series > value
+    if op == ">=":
+        return series >= value
+    if op == "in":
+        return series.isin(value)
+    if op == "not in":
+        return ~series.isin(value)
+    raise ValueError(f"unsupported filter operator {op}")
+
+
+def filter_df(df, filters):
+    """return the dataframe rows which match the filters (index levels can be used)"""
+    filters = normalize_filters(filters)
+    if not filters:
+        return df
+    mask = None
+    for conjunction in filters:
+        conjunction_mask = None
+        for column, op, value in conjunction:
+            if column in df.columns:
+                series = df[column]
+            else:
+                series = df.index.get_level_values(column)
+            predicate_mask = _predicate_mask(series, op, value)
+            conjunction_mask = (
+                predicate_mask
+                if conjunction_mask is None
+                else conjunction_mask & predicate_mask
+            )
+        mask = conjunction_mask if mask is None else mask | conjunction_mask
+    return df[mask]
+
+
+def read_parquet_file(source, columns=None, filters=None):
+    """read a parquet file, skipping row groups which do not match the filters"""
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(source)
+    read_columns = columns
+    if columns and filters:
+        read_columns = list(columns) + [
+            column for column in filter_columns(filters) if column not in columns
+        ]
+    row_groups = filter_row_groups(parquet_file, filters)
+    if row_groups:
+        df = parquet_file.read_row_groups(
+            row_groups, columns=read_columns, use_pandas_metadata=True
+        ).to_pandas()
+        df = filter_df(df, filters)
+    else:
+        df = parquet_file.schema.to_arrow_schema().empty_table().to_pandas()
+        read_columns = None
+    if columns and read_columns != columns:
+        df = df[[column for column in columns if column in df.columns]]
+    return df
@@ -15,6 +15,7 @@
 import time
 from copy import deepcopy
 from datetime import datetime
+from os import path
 
 import fsspec
 import v3io.dataplane
@@ -22,15 +23,18 @@ import v3io.dataplane
 import mlrun
 
 from ..platforms.iguazio import split_path
+from ..utils import logger
 from .base import (
     DataStore,
     FileStats,
     basic_auth_header,
     get_range,
+    http_delete,
     http_get,
     http_head,
     http_put,
     http_upload,
+    transfer_options,
 )
 
 V3IO_LOCAL_ROOT = "v3io"
@@ -89,17 +93,49 @@ class V3ioStore(DataStore):
         return dict(v3io_access_key=self._get_secret_or_env("V3IO_ACCESS_KEY"))
 
     def upload(self, key, src_path):
-        http_upload(self.url + self._join(key), src_path, self.headers, None)
+        part_size, _ = transfer_options()
+        if path.getsize(src_path) <= part_size:
+            http_upload(self.url + self._join(key), src_path, self.headers, None)
+            return
+        # large files are uploaded sequentially part by part (the first part creates the object, the
+        # rest are appended), v3io has no object rename, so a failed upload removes the partial object
+        # rather than leaving a truncated one at the target key
+        with open(src_path, "rb") as fp:
+            append = False
+            try:
+                for part in iter(lambda: fp.read(part_size), b""):
+                    self.put(key, part, append=append)
+                    append = True
+            except Exception:
+                if append:
+                    self._delete_partial_object(key)
+                raise
+
+    def _delete_partial_object(self, key):
+        try:
+            http_delete(self.url + self._join(key), self.headers)
+        except Exception as exc:
+            logger.warning(
+                "failed to remove partially uploaded object", key=key, exc=str(exc)
+            )
+
+    def download(self, key, target_path):
+        self._download_in_parts(key, target_path)
 
     def get(self, key, size=None, offset=0):
         headers = self.headers
         if size or offset:
-            headers = deepcopy(headers)
+            headers = deepcopy(headers) or {}
             headers["Range"] = get_range(size, offset)
         return http_get(self.url + self._join(key), headers)
 
     def put(self, key, data, append=False):
-        http_put(self.url + self._join(key), data, self.headers, None)
+        headers = self.headers
+        if append:
+            # v3io appends the body to the object with a -1 range
+            headers = deepcopy(headers) or {}
+            headers["Range"] = "-1"
+        http_put(self.url + self._join(key), data, headers, None)
 
     def stat(self, key):
         head = http_head(self.url + self._join(key), self.headers)
@@ -108,7 +144,7 @@ class V3ioStore(DataStore):
         modified = time.mktime(
             datetime.strptime(datestr, "%a, %d %b %Y %H:%M:%S %Z").timetuple()
         )
-        return FileStats(size, modified)
+        return FileStats(size, modified, etag=head.get("ETag"))
 
     def listdir(self, key):
         v3io_client = v3io.dataplane.Client(
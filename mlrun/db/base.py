@@ -14,7 +14,7 @@
 
 import warnings
 from abc import ABC, abstractmethod
-from typing import List, Optional, Union
+from typing import Iterator, List, Optional, Union
 
 from mlrun.api import schemas
 from mlrun.api.schemas import ModelEndpoint
@@ -47,6 +47,11 @@ class RunDBInterface(ABC):
     def update_run(self, updates: dict, uid, project="", iter=0):
         pass
 
+    def update_runs(self, runs: List[dict], project=""):
+        """update multiple runs, each run is a dict with the update_run() arguments (updates, uid, iter)"""
+        for run in runs:
+            self.update_run(project=project, **run)
+
     @abstractmethod
     def abort_run(self, uid, project="", iter=0):
         pass
@@ -69,6 +74,10 @@ class RunDBInterface(ABC):
     ):
         pass
 
+    def iter_runs(self, page_size: int = None, **filters) -> Iterator[dict]:
+        """lazy iterator over the runs (DBs with pagination support fetch them page by page)"""
+        yield from self.list_runs(**filters)
+
     @abstractmethod
     def del_run(self, uid, project="", iter=0):
         pass
@@ -81,6 +90,12 @@ class RunDBInterface(ABC):
     def store_artifact(self, key, artifact, uid, iter=None, tag="", project=""):
         pass
 
+    def store_artifacts(self, artifacts: List[dict], project=""):
+        """store multiple artifacts, each artifact is a dict with the store_artifact() arguments
+        (key, artifact, uid, iter, tag)"""
+        for artifact in artifacts:
+            self.store_artifact(project=project, **artifact)
+
     @abstractmethod
     def read_artifact(self, key, tag="", iter=None, project=""):
         pass
@@ -99,6 +114,10 @@ class RunDBInterface(ABC):
     ):
         pass
 
+    def iter_artifacts(self, page_size: int = None, **filters) -> Iterator[dict]:
+        """lazy iterator over the artifacts, see iter_runs()"""
+        yield from self.list_artifacts(**filters)
+
     @abstractmethod
     def del_artifact(self, key, tag="", project=""):
         pass
@@ -142,7 +142,7 @@ class FileRunDB(RunDBInterface):
                 match_value(name, run, "metadata.name")
                 and match_labels(get_in(run, "metadata.labels", {}), labels)
                 and match_value_options(state, run, "status.state")
-                and match_value(uid, run, "metadata.uid")
+                and match_value_options(uid, run, "metadata.uid")
                 and match_times(
                     start_time_from, start_time_to, run, "status.start_time",
                 )
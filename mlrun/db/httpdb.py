@@ -12,13 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import codecs
 import http
 import os
 import tempfile
 import time
 from datetime import datetime
 from os import path, remove
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterator, List, Optional, Union
 
 import kfp
 import requests
@@ -120,6 +121,7 @@ class HTTPRunDB(RunDBInterface):
         json=None,
         headers=None,
         timeout=45,
+        stream=False,
     ):
         """ Perform a direct REST API call on the :py:mod:`mlrun` API server.
 
@@ -134,6 +136,7 @@ class HTTPRunDB(RunDBInterface):
             :param json: JSON payload to be passed in the call
             :param headers: REST headers, passed as a dictionary: ``{"<header-name>": "<header-value>"}``
             :param timeout: API call timeout
+            :param stream: Whether to stream the response content (read it with ``iter_content``)
 
             :return: Python HTTP response object
         """
@@ -169,7 +172,7 @@ class HTTPRunDB(RunDBInterface):
 
         try:
             resp = self.session.request(
-                method, url, timeout=timeout, verify=False, **kw
+                method, url, timeout=timeout, verify=False, stream=stream, **kw
             )
         except requests.RequestException as err:
             error = error or f"{method} {url}, error: {err}"
@@ -324,22 +327,56 @@ class HTTPRunDB(RunDBInterface):
         if text:
             print(text.decode())
         if watch:
+            offset += len(text)
+            # chunks may split multi-byte characters
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            follow = True
             nil_resp = 0
             while state in ["pending", "running"]:
-                offset += len(text)
-                if nil_resp < 3:
-                    time.sleep(3)
-                else:
-                    time.sleep(10)
+                new_bytes = 0
+                if follow:
+                    try:
+                        for chunk in self._stream_log(uid, project, offset):
+                            print(decoder.decode(chunk), end="")
+                            offset += len(chunk)
+                            new_bytes += len(chunk)
+                    except mlrun.errors.MLRunNotFoundError:
+                        # API servers without the log stream endpoint, fall back to polling
+                        follow = False
+                    except requests.RequestException as exc:
+                        logger.debug("Log stream disconnected", uid=uid, exc=str(exc))
+
+                # the stream ends when the run terminates (or the log is idle), get the state and the log leftovers
                 state, text = self.get_log(uid, project, offset=offset)
                 if text:
+                    print(decoder.decode(text), end="")
+                    offset += len(text)
+                    new_bytes += len(text)
+                if new_bytes:
                     nil_resp = 0
-                    print(text.decode(), end="")
-                else:
+                if state in ["pending", "running"] and (not follow or not new_bytes):
+                    time.sleep(3 if nil_resp < 3 else 10)
                     nil_resp += 1
 
         return state
 
+    def _stream_log(self, uid, project="", offset=0) -> Iterator[bytes]:
+        """follow the log (starting at offset), yields the new log bytes until the run terminates"""
+        path = self._path_of("log", project, uid)
+        error = f"stream log {project}/{uid}"
+        # the server ends idle streams after httpdb.logs.stream_idle_timeout
+        read_timeout = 2 * int(config.httpdb.logs.stream_idle_timeout)
+        resp = self.api_call(
+            "GET",
+            f"{path}/stream",
+            error,
+            params={"offset": offset},
+            timeout=(45, read_timeout),
+            stream=True,
+        )
+        with resp:
+            yield from resp.iter_content(chunk_size=None)
+
     def store_run(self, struct, uid, project="", iter=0):
         """ Store run details in the DB. This method is usually called from within other :py:mod:`mlrun` flows
         and not called directly by the user."""
@@ -359,6 +396,23 @@ class HTTPRunDB(RunDBInterface):
         body = _as_json(updates)
         self.api_call("PATCH", path, error, params=params, body=body)
 
+    def update_runs(self, runs: List[dict], project=""):
+        """ Update multiple runs of the project in a single call.
+
+        :param runs: List of the runs updates, each a dict with the :py:func:`~update_run` arguments -
+            ``updates``, ``uid`` and ``iter``.
+        :param project: Project that the runs belong to.
+        """
+
+        path = f"projects/{project or config.default_project}/runs"
+        error = f"update runs {project}"
+        body = _as_json({"runs": runs})
+        try:
+            self.api_call("PATCH", path, error, body=body)
+        except mlrun.errors.MLRunNotFoundError:
+            # API servers without the bulk endpoint, update the runs one by one
+            super().update_runs(runs, project)
+
     def abort_run(self, uid, project="", iter=0):
         """
         Abort a running run - will remove the run's runtime resources and mark its state as aborted
@@ -437,6 +491,23 @@ class HTTPRunDB(RunDBInterface):
         :param last_update_time_to: Filter by run last update time in ``(last_update_time_from, last_update_time_to)``.
         """
 
+        if sort and not last:
+            # sorted lists are read page by page, see iter_runs()
+            return RunList(
+                self.iter_runs(
+                    name,
+                    uid,
+                    project,
+                    labels,
+                    state,
+                    iter,
+                    start_time_from,
+                    start_time_to,
+                    last_update_time_from,
+                    last_update_time_to,
+                )
+            )
+
         project = project or config.default_project
         params = {
             "name": name,
@@ -455,6 +526,60 @@ class HTTPRunDB(RunDBInterface):
         resp = self.api_call("GET", "runs", error, params=params)
         return RunList(resp.json()["runs"])
 
+    def iter_runs(
+        self,
+        name=None,
+        uid=None,
+        project=None,
+        labels=None,
+        state=None,
+        iter=False,
+        start_time_from: datetime = None,
+        start_time_to: datetime = None,
+        last_update_time_from: datetime = None,
+        last_update_time_to: datetime = None,
+        page_size: int = None,
+    ) -> Iterator[dict]:
+        """ Lazy iterator over runs (newest first), the runs are fetched from the server page by page as the
+        iterator is consumed, so listing a large number of runs does not require a single large response.
+        Example::
+
+            for run in db.iter_runs(project='iris', state='error'):
+                print(run['metadata']['uid'])
+
+        :param page_size: Number of runs fetched in every request (default: the
+            ``httpdb.pagination.default_page_size`` config).
+
+        See :py:func:`~list_runs` for the other parameters.
+        """
+
+        project = project or config.default_project
+        params = {
+            "name": name,
+            "uid": uid,
+            "project": project,
+            "label": labels or [],
+            "state": state,
+            "iter": bool2str(iter),
+            "start_time_from": datetime_to_iso(start_time_from),
+            "start_time_to": datetime_to_iso(start_time_to),
+            "last_update_time_from": datetime_to_iso(last_update_time_from),
+            "last_update_time_to": datetime_to_iso(last_update_time_to),
+            "page_size": page_size or config.httpdb.pagination.default_page_size,
+        }
+        return self._iter_pages("runs", "runs", "list runs", params)
+
+    def _iter_pages(self, path, key, error, params):
+        while True:
+            resp = self.api_call("GET", path, error, params=params)
+            page = resp.json()
+            yield from page[key]
+            # servers without pagination support return the full list (without a token)
+            page_token = page.get("next_page_token")
+            if not page_token:
+                return
+            params = {**params, "page_token": page_token}
+
     def del_runs(self, name=None, project=None, labels=None, state=None, days_ago=0):
         """ Delete a group of runs identified by the parameters of the function.
 
@@ -504,6 +629,23 @@ class HTTPRunDB(RunDBInterface):
         body = _as_json(artifact)
         self.api_call("POST", path, error, params=params, body=body)
 
+    def store_artifacts(self, artifacts: List[dict], project=""):
+        """ Store multiple artifacts of the project in a single call.
+
+        :param artifacts: List of the artifacts, each a dict with the :py:func:`~store_artifact` arguments - ``key``,
+            ``artifact``, ``uid``, ``iter`` and ``tag``.
+        :param project: Project that the artifacts belong to.
+        """
+
+        path = f"projects/{project or config.default_project}/artifacts"
+        error = f"store artifacts {project}"
+        body = _as_json({"artifacts": artifacts})
+        try:
+            self.api_call("POST", path, error, body=body)
+        except mlrun.errors.MLRunNotFoundError:
+            # API servers without the bulk endpoint, store the artifacts one by one
+            super().store_artifacts(artifacts, project)
+
     def read_artifact(self, key, tag=None, iter=None, project=""):
         """ Read an artifact, identified by its key, tag and iteration."""
 
@@ -575,6 +717,38 @@ class HTTPRunDB(RunDBInterface):
         values.tag = tag
         return values
 
+    def iter_artifacts(
+        self,
+        name=None,
+        project=None,
+        tag=None,
+        labels=None,
+        iter: int = None,
+        best_iteration: bool = False,
+        page_size: int = None,
+    ) -> Iterator[dict]:
+        """ Lazy iterator over artifacts, the artifacts are fetched from the server page by page as the iterator is
+        consumed. Note that the artifacts are ordered by last update (newest first), unlike :py:func:`~list_artifacts`
+        which returns them in the server's default order.
+
+        :param page_size: Number of artifacts fetched in every request (default: the
+            ``httpdb.pagination.default_page_size`` config).
+
+        See :py:func:`~list_artifacts` for the other parameters.
+        """
+
+        project = project or config.default_project
+        params = {
+            "name": name,
+            "project": project,
+            "tag": tag,
+            "label": labels or [],
+            "iter": iter,
+            "best-iteration": best_iteration,
+            "page_size": page_size or config.httpdb.pagination.default_page_size,
+        }
+        return self._iter_pages("artifacts", "artifacts", "list artifacts", params)
+
     def del_artifacts(self, name=None, project=None, tag=None, labels=None, days_ago=0):
         """ Delete artifacts referenced by the parameters.
 
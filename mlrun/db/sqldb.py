@@ -131,6 +131,15 @@ class SQLDB(RunDBInterface):
             self.leader_session,
         )
 
+    def store_artifacts(self, artifacts: List[dict], project=""):
+        return self._transform_db_error(
+            self.db.store_artifacts,
+            self.session,
+            project,
+            artifacts,
+            self.leader_session,
+        )
+
     def read_artifact(self, key, tag="", iter=None, project=""):
         return self._transform_db_error(
             self.db.read_artifact, self.session, key, tag, iter, project
@@ -12,11 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import atexit
 import os
+import time
 import uuid
 from copy import deepcopy
 from datetime import datetime
-from typing import List, Union
+from typing import List, Optional, Union
 
 import numpy as np
 
@@ -26,6 +28,7 @@ from mlrun.datastore.store_resources import get_store_resource
 from mlrun.errors import MLRunInvalidArgumentError
 
 from .artifacts import ArtifactManager, DatasetArtifact
+from .config import config
 from .datastore import store_manager
 from .db import get_run_db
 from .features import Feature
@@ -101,6 +104,11 @@ class MLClientCtx(object):
         self._children = []
         self._parent = None
 
+        # the db updates are coalesced, see _update_db()
+        self._run_updates_pending = False
+        self._stored_run = None
+        self._last_db_flush = 0
+
     def __enter__(self):
         return self
 
@@ -167,7 +175,8 @@ class MLClientCtx(object):
             return
         if commit_children:
             for child in self._children:
-                child.commit()
+                child._commit_run()
+            self._flush_children_db()
         results = [child.to_dict() for child in self._children]
         summary = mlrun.runtimes.utils.results_to_iter(results, None, self)
         task = results[best_run - 1] if best_run else None
@@ -192,6 +201,8 @@ class MLClientCtx(object):
         :param uri:    store resource uri/path, store://<type>/<project>/<name>:<version>
                        types: artifacts | feature-sets | feature-vectors
         """
+        # the resource may be a (coalesced) artifact which was not stored yet
+        self._flush_db_artifacts()
         return get_store_resource(url, db=self._rundb, secrets=self._secrets_manager)
 
     def get_dataitem(self, url):
@@ -202,6 +213,7 @@ class MLClientCtx(object):
             data = context.get_dataitem("s3://my-bucket/file.csv").as_df()
 
         """
+        self._flush_db_artifacts()
         return self._data_stores.object(url=url)
 
     def set_logger_stream(self, stream):
@@ -217,6 +229,7 @@ class MLClientCtx(object):
             self._rundb = mlrun.get_run_db()
         self._data_stores = store_manager.set(self._secrets_manager, db=self._rundb)
         self._artifacts_manager = ArtifactManager(db=self._rundb)
+        self._artifacts_manager.coalesce_db_updates = True
 
     def get_meta(self):
         """Reserved for internal use"""
@@ -776,9 +789,18 @@ class MLClientCtx(object):
     def commit(self, message: str = "", completed=False):
         """save run state and optionally add a commit message
 
+        the run and its pending (coalesced) updates, e.g. results and artifacts, are sent to the db immediately,
+        see config.run_db_updates_interval for the updates which are not committed
+
         :param message:   commit message to save in the run
         :param completed: mark run as completed
         """
+        self._commit_run(message, completed)
+        if self._rundb:
+            self._flush_db()
+
+    def _commit_run(self, message: str = "", completed=False):
+        """save the run state, the db update may be coalesced (see _update_db)"""
         if message:
             self._annotations["message"] = message
         if completed:
@@ -814,9 +836,14 @@ class MLClientCtx(object):
         self._last_update = now_date()
 
         if self._rundb and commit:
-            self._rundb.update_run(
-                updates, self._uid, self.project, iter=self._iteration
-            )
+            if self._stored_run is None:
+                self._rundb.update_run(
+                    updates, self._uid, self.project, iter=self._iteration
+                )
+            else:
+                # send the state with the pending updates (as a delta)
+                self._run_updates_pending = True
+                self._flush_db()
 
     def set_hostname(self, host: str):
         """update the hostname, for internal use"""
@@ -891,10 +918,131 @@ class MLClientCtx(object):
 
         if commit or self._autocommit:
             self._commit = message
-            if self._rundb:
+            self._run_updates_pending = True
+        if not self._rundb:
+            return
+        if self._should_flush_db():
+            self._flush_db()
+        elif (
+            self._run_updates_pending or self._artifacts_manager.has_pending_db_updates
+        ):
+            _contexts_with_pending_db_updates.add(self)
+
+    def _should_flush_db(self):
+        """the first run update and run state changes are sent immediately, other updates (results, artifacts,
+        etc.) are coalesced and sent at most every run_db_updates_interval seconds"""
+        if self._run_updates_pending:
+            if self._stored_run is None:
+                return True
+            stored_status = self._stored_run["status"]
+            if self._state != stored_status.get("state") or (
+                self._error and self._error != stored_status.get("error")
+            ):
+                return True
+        elif not self._artifacts_manager.has_pending_db_updates:
+            return False
+        interval = float(config.run_db_updates_interval)
+        return time.monotonic() - self._last_db_flush >= interval
+
+    def _flush_db(self):
+        """send the pending artifacts and run updates to the db, the run is stored once and then updated with the
+        fields which changed since (deltas)"""
+        self._last_db_flush = time.monotonic()
+        _contexts_with_pending_db_updates.discard(self)
+        self._flush_db_artifacts()
+        if not self._run_updates_pending:
+            return
+        self._run_updates_pending = False
+        struct = self.to_dict()
+        updates = None
+        if self._stored_run is not None:
+            updates = _run_updates(self._stored_run, struct)
+            if updates == {}:
+                return
+        try:
+            if updates is None:
                 self._rundb.store_run(
-                    self.to_dict(), self._uid, self.project, iter=self._iteration
+                    struct, self._uid, self.project, iter=self._iteration
+                )
+            else:
+                self._rundb.update_run(
+                    updates, self._uid, self.project, iter=self._iteration
                 )
+        except mlrun.errors.MLRunNotFoundError:
+            # the run was deleted from the db, store it again
+            self._rundb.store_run(struct, self._uid, self.project, iter=self._iteration)
+        self._stored_run = deepcopy(struct)
+
+    def _flush_db_artifacts(self):
+        if self._rundb:
+            self._artifacts_manager.flush_db()
+
+    def _flush_children_db(self):
+        """send the pending updates of all the child iterations, with one bulk update"""
+        runs = []
+        for child in self._children:
+            child._flush_db_artifacts()
+            if not child._run_updates_pending or child._stored_run is None:
+                child._flush_db()
+                continue
+            child._run_updates_pending = False
+            _contexts_with_pending_db_updates.discard(child)
+            struct = child.to_dict()
+            updates = _run_updates(child._stored_run, struct)
+            if updates is None:
+                child._run_updates_pending = True
+                child._flush_db()
+                continue
+            if updates:
+                runs.append(
+                    {"updates": updates, "uid": child._uid, "iter": child._iteration}
+                )
+            child._stored_run = deepcopy(struct)
+        if runs and self._rundb:
+            self._rundb.update_runs(runs, project=self.project)
+
+
+def _run_updates(stored: dict, struct: dict) -> Optional[dict]:
+    """the (second level) fields of the run struct which changed since it was stored, e.g. status.results
+
+    return None when fields were removed (the update would store them as null), the run should be stored again"""
+    updates = {}
+    for key in stored.keys() | struct.keys():
+        if key not in ["metadata", "spec", "status"] and stored.get(key) != struct.get(
+            key
+        ):
+            return None
+    for section in ["metadata", "spec", "status"]:
+        stored_section = stored.get(section) or {}
+        section_values = struct.get(section) or {}
+        if stored_section.keys() - section_values.keys():
+            return None
+        for key, value in section_values.items():
+            if key not in stored_section or stored_section[key] != value:
+                updates[f"{section}.{key}"] = value
+    return updates
+
+
+# contexts with coalesced db updates which were not sent yet, flushed on exit (the contexts are referenced until
+# they are flushed, so the pending updates are not lost when the context is released)
+_contexts_with_pending_db_updates = set()
+
+
+def flush_pending_db_artifacts():
+    """store the coalesced (not yet stored) artifacts of the run contexts, so they can be read from the db"""
+    for context in list(_contexts_with_pending_db_updates):
+        context._flush_db_artifacts()
+
+
+@atexit.register
+def _flush_pending_db_updates():
+    for context in list(_contexts_with_pending_db_updates):
+        try:
+            context._flush_db()
+        except Exception as exc:
+            logger.warning(
+                "Failed to send the run updates to the db", uid=context.uid, exc=exc
+            )
 
 
 def _cast_result(value):
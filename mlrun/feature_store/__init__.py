@@ -31,6 +31,7 @@ __all__ = [
     "RunConfig",
     "OfflineVectorResponse",
     "OnlineVectorService",
+    "OnlineFeatureCache",
 ]
 
 
@@ -50,3 +51,4 @@ from .api import (
 from .common import RunConfig
 from .feature_set import FeatureSet
 from .feature_vector import FeatureVector, OfflineVectorResponse, OnlineVectorService
+from .retrieval.online import OnlineFeatureCache
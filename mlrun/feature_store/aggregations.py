@@ -0,0 +1,287 @@
+# Copyright 2018 Iguazio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Dict, List, Union
+
+import numpy as np
+import pandas as pd
+
+import mlrun.errors
+
+supported_operations = [
+    "count",
+    "sum",
+    "sqr",
+    "min",
+    "max",
+    "avg",
+    "stddev",
+    "stdvar",
+]
+
+_duration_units = {
+    "s": 1000,
+    "m": 60 * 1000,
+    "h": 60 * 60 * 1000,
+    "d": 24 * 60 * 60 * 1000,
+}
+
+
+class AggregateByKey:
+    """vectorized (DataFrame) implementation of storey.AggregateByKey
+
+    used by the pandas engine (and for offline backfills) instead of the streaming
+    aggregation, every row gets the aggregation features of its key, computed over the
+    rows which precede it (by time) in the row window, same as the streaming aggregation
+    with the default (emit every event) policy
+    """
+
+    def __init__(
+        self,
+        aggregates: List[dict],
+        key_columns: List[str] = None,
+        time_column: str = None,
+        emit_policy=None,
+        **kwargs,
+    ):
+        if emit_policy and _emit_policy_name(emit_policy) != "EmitEveryEvent":
+            raise mlrun.errors.MLRunInvalidArgumentError(
+                "only the default emit policy (emit every event) is supported with the pandas engine"
+            )
+        self.aggregates = aggregates
+        self.key_columns = key_columns or []
+        self.time_column = time_column
+
+    def do(self, event):
+        return aggregate_df(event, self.aggregates, self.key_columns, self.time_column)
+
+
+def _emit_policy_name(emit_policy):
+    if isinstance(emit_policy, dict):
+        return emit_policy.get("mode")
+    return type(emit_policy).__name__
+
+
+def parse_duration(duration: str) -> int:
+    """convert a window/period string (e.g. '10m', '1h') to milliseconds"""
+    unit = duration[-1:]
+    if unit not in _duration_units or not duration[:-1].isdigit():
+        raise mlrun.errors.MLRunInvalidArgumentError(
+            f"illegal duration {duration}, must be in the format [0-9]+[smhd]"
+        )
+    return int(duration[:-1]) * _duration_units[unit]
+
+
+def aggregate_df(
+    df: pd.DataFrame,
+    aggregates: List[Union[dict, "mlrun.feature_store.feature_set.FeatureAggregation"]],
+    key_columns: List[str],
+    time_column: str,
+) -> pd.DataFrame:
+    """compute the (fixed or sliding) window aggregation features of every row
+
+    the results are identical to the streaming (storey) aggregation with the default emit
+    policy, for rows which are ordered by time within each key. the rows are sorted by
+    key and time once, and every window is computed with vectorized (numpy) operations.
+    null values are not aggregated, naive timestamps are treated as UTC (windows are
+    aligned to UTC)
+
+    example::
+
+        quotes_set.add_aggregation("asks", "ask", ["sum", "max"], ["1h", "5h"], "10m")
+        df = aggregate_df(quotes_df, quotes_set.spec.graph["Aggregates"].class_args["aggregates"],
+                          ["ticker"], "time")
+
+    :param df:           input dataframe
+    :param aggregates:   list of aggregations (FeatureAggregation objects or dicts)
+    :param key_columns:  the entity (key) columns, the aggregations are calculated per key
+    :param time_column:  the event timestamp column
+
+    :return: the input dataframe with the aggregation features columns
+    """
+    if not time_column:
+        raise mlrun.errors.MLRunInvalidArgumentError(
+            "aggregations require a timestamp key"
+        )
+    columns = df
+    if any(
+        column not in df.columns and column in df.index.names
+        for column in key_columns + [time_column]
+    ):
+        # the key/time columns can be index levels
+        columns = df.reset_index()
+    missing = [
+        column for column in key_columns + [time_column] if column not in columns
+    ]
+    if missing:
+        raise mlrun.errors.MLRunInvalidArgumentError(
+            f"aggregation columns {missing} do not exist in the event"
+        )
+
+    # sort the rows by key and time (keeping the original order of equal times)
+    if key_columns:
+        groups = columns.groupby(key_columns, sort=False, dropna=False).ngroup().values
+    else:
+        groups = np.zeros(len(df), dtype="int64")
+    millis = _to_epoch_millis(pd.to_datetime(columns[time_column]))
+    order = np.lexsort((np.arange(len(df)), millis, groups))
+    groups, millis = groups[order], millis[order]
+
+    results = {}
+    for aggregate in aggregates:
+        if not isinstance(aggregate, dict):
+            aggregate = aggregate.to_dict()
+        operations = aggregate["operations"]
+        unsupported = set(operations).difference(supported_operations)
+        if unsupported:
+            raise mlrun.errors.MLRunInvalidArgumentError(
+                f"aggregation operations {sorted(unsupported)} are not supported "
+                f"with the pandas engine, use {supported_operations}"
+            )
+        if aggregate["column"] not in columns:
+            raise mlrun.errors.MLRunInvalidArgumentError(
+                f"aggregation column {aggregate['column']} does not exist in the event"
+            )
+        values = columns[aggregate["column"]].values.astype("float64")[order]
+        period = aggregate.get("period")
+        for window in aggregate["windows"]:
+            raw_values = _aggregate_window(
+                groups,
+                millis,
+                values,
+                parse_duration(window),
+                parse_duration(period) if period else None,
+            )
+            for operation in operations:
+                name = f"{aggregate['name']}_{operation}_{window}"
+                results[name] = _operation_values(operation, raw_values)
+
+    # restore the original rows order
+    positions = np.empty(len(order), dtype="int64")
+    positions[order] = np.arange(len(order))
+    df = df.copy()
+    for name, values in results.items():
+        df[name] = values[positions]
+    return df
+
+
+def _to_epoch_millis(times: pd.Series) -> np.ndarray:
+    # naive timestamps are UTC, a local offset would depend on the host and shift across
+    # daylight saving changes
+    if times.dt.tz is not None:
+        times = times.dt.tz_convert("UTC").dt.tz_localize(None)
+    return times.values.astype("datetime64[ns]").view("int64") / 1e6
+
+
+def _aggregate_window(groups, millis, values, window_millis, period_millis=None):
+    """return the raw (count, sum, sqr, min, max) window aggregations of every row
+
+    rows are sorted by group and time. fixed windows aggregate the rows of the same
+    window (aligned to the window size) up to the current row, sliding windows aggregate
+    the rows of the current period bucket up to the current row + the previous periods
+    """
+    bucket_millis = period_millis or window_millis
+    buckets = np.floor(millis / bucket_millis).astype("int64")
+
+    # segments of rows with the same group and bucket
+    is_start = np.ones(len(buckets), dtype=bool)
+    is_start[1:] = (groups[1:] != groups[:-1]) | (buckets[1:] != buckets[:-1])
+    starts = np.flatnonzero(is_start)
+    segment_ids = np.cumsum(is_start) - 1
+
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    rows = pd.DataFrame(
+        {
+            "count": valid.astype("float64"),
+            "sum": filled,
+            "sqr": filled * filled,
+            "min": np.where(valid, values, np.inf),
+            "max": np.where(valid, values, -np.inf),
+        }
+    )
+    by_segment = rows.groupby(segment_ids, sort=False)
+    raw_values = {
+        "count": by_segment["count"].cumsum().values,
+        "sum": by_segment["sum"].cumsum().values,
+        "sqr": by_segment["sqr"].cumsum().values,
+        "min": by_segment["min"].cummin().values,
+        "max": by_segment["max"].cummax().values,
+    }
+
+    previous_buckets = int(window_millis / bucket_millis) - 1 if period_millis else 0
+    if previous_buckets > 0 and len(starts):
+        # aggregate the (full) previous buckets of each segment in the window
+        segment_groups, segment_buckets = groups[starts], buckets[starts]
+        first_bucket = segment_buckets.min()
+        span = segment_buckets.max() - first_bucket + previous_buckets + 1
+        positions = segment_groups * span + (segment_buckets - first_bucket)
+        lower = np.searchsorted(
+            positions,
+            segment_groups * span
+            + np.maximum(segment_buckets - first_bucket - previous_buckets, 0),
+        )
+        upper = np.arange(len(starts))
+        for name, func, identity in [
+            ("count", np.add, 0.0),
+            ("sum", np.add, 0.0),
+            ("sqr", np.add, 0.0),
+            ("min", np.minimum, np.inf),
+            ("max", np.maximum, -np.inf),
+        ]:
+            segment_values = func.reduceat(rows[name].values, starts)
+            previous = _range_reduce(segment_values, lower, upper, func, identity)
+            raw_values[name] = func(raw_values[name], previous[segment_ids])
+
+    for name in ["min", "max"]:
+        raw_values[name][np.isinf(raw_values[name])] = np.nan
+    return raw_values
+
+
+def _range_reduce(values, lower, upper, func, identity):
+    """reduce values[lower[i]:upper[i]] for every i (func is a numpy ufunc)
+
+    the ranges are split by the binary representation of their lengths, so each level
+    (of ranges with 2^level values) is computed once for all the ranges
+    """
+    size = len(values)
+    result = np.full(size, identity)
+    position = lower.copy()
+    length = upper - lower
+    level = values
+    step = 1
+    while size and step <= length.max():
+        selected = (length & step) != 0
+        result[selected] = func(result[selected], level[position[selected]])
+        position[selected] += step
+        # level[i] = reduce(values[i:i + 2 * step])
+        next_level = np.full(size, identity)
+        next_level[: size - step] = func(level[: size - step], level[step:])
+        level = next_level
+        step *= 2
+    return result
+
+
+def _operation_values(operation: str, raw_values: Dict[str, np.ndarray]):
+    if operation in raw_values:
+        return raw_values[operation]
+    count, total, sqr = raw_values["count"], raw_values["sum"], raw_values["sqr"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if operation == "avg":
+            return np.where(count > 0, total / count, np.nan)
+        variance = np.where(
+            count > 1, (count * sqr - total * total) / (count * (count - 1)), np.nan
+        )
+        if operation == "stdvar":
+            return variance
+        return np.sqrt(variance)
@@ -11,6 +11,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from itertools import chain
 from typing import List, Optional, Union
 from urllib.parse import urlparse
 
@@ -20,6 +21,7 @@ import mlrun
 import mlrun.errors
 
 from ..data_types import InferOptions, get_infer_interface
+from ..data_types.infer import DFStatsAccumulator
 from ..datastore.store_resources import parse_store_uri
 from ..datastore.targets import (
     TargetTypes,
@@ -37,11 +39,14 @@ from .feature_set import FeatureSet
 from .feature_vector import FeatureVector, OfflineVectorResponse, OnlineVectorService
 from .ingestion import (
     context_to_ingestion_params,
+    get_source_chunks,
+    has_aggregations,
     init_featureset_graph,
     run_ingestion_job,
     run_spark_graph,
 )
 from .retrieval import LocalFeatureMerger, init_feature_vector_graph, run_merge_job
+from .retrieval.online import OnlineFeatureCache, invalidate_online_cache
 
 _v3iofs = None
 spark_transform_handler = "transform"
@@ -73,6 +78,7 @@ def get_offline_features(
     drop_columns: List[str] = None,
     start_time: Optional[pd.Timestamp] = None,
     end_time: Optional[pd.Timestamp] = None,
+    chunk_size: int = None,
 ) -> OfflineVectorResponse:
     """retrieve offline feature vector results
 
@@ -107,6 +113,10 @@ def get_offline_features(
         entity_timestamp_column must be passed when using time filtering.
     :param end_time:        datetime, high limit of time needed to be filtered. Optional.
         entity_timestamp_column must be passed when using time filtering.
+    :param chunk_size:      optional, process the data out-of-core in chunks of ~chunk_size
+        entity rows, the entity rows and feature sets are hash partitioned by their common
+        entity key and each partition is joined independently, use
+        `resp.to_dataframe_chunks()` to iterate over the results (the rows order is by partition)
     """
     feature_vector = _features_to_vector(feature_vector)
 
@@ -121,6 +131,7 @@ def get_offline_features(
             timestamp_column=entity_timestamp_column,
             run_config=run_config,
             drop_columns=drop_columns,
+            chunk_size=chunk_size,
         )
 
     if (start_time or end_time) and not entity_timestamp_column:
@@ -135,11 +146,14 @@ def get_offline_features(
         drop_columns=drop_columns,
         start_time=start_time,
         end_time=end_time,
+        chunk_size=chunk_size,
     )
 
 
 def get_online_feature_service(
-    feature_vector: Union[str, FeatureVector], run_config: RunConfig = None,
+    feature_vector: Union[str, FeatureVector],
+    run_config: RunConfig = None,
+    cache: Union[OnlineFeatureCache, bool] = None,
 ) -> OnlineVectorService:
     """initialize and return online feature vector service api,
     returns :py:class:`~mlrun.feature_store.OnlineVectorService`
@@ -152,12 +166,22 @@ def get_online_feature_service(
         resp = svc.get([{"ticker": "AAPL"}], as_list=True)
         print(resp)
 
+        # with an in-process entity cache (see OnlineFeatureCache for the options)
+        svc = get_online_feature_service(vector_uri, cache=True)
+        print(svc.cache.stats())
+
     :param feature_vector:  feature vector uri or FeatureVector object
     :param run_config:   function and/or run configuration for remote jobs/services
+    :param cache:        OnlineFeatureCache object (or True for the default cache), cache the
+                         feature set entities in memory in front of the online target
     """
     feature_vector = _features_to_vector(feature_vector)
-    graph, index_columns = init_feature_vector_graph(feature_vector)
-    service = OnlineVectorService(feature_vector, graph, index_columns)
+    if cache is True:
+        cache = OnlineFeatureCache()
+    graph, index_columns = init_feature_vector_graph(feature_vector, cache or None)
+    service = OnlineVectorService(
+        feature_vector, graph, index_columns, cache=cache or None
+    )
 
     # todo: support remote service (using remote nuclio/mlrun function if run_config)
     return service
@@ -174,6 +198,7 @@ def ingest(
     mlrun_context=None,
     spark_context=None,
     overwrite=True,
+    chunk_size: int = None,
 ) -> pd.DataFrame:
     """Read local DataFrame, file, URL, or source into the feature store
     Ingest reads from the source, run the graph transformations, infers  metadata and stats
@@ -197,6 +222,10 @@ def ingest(
         targets = [CSVTarget("mycsv", path="./mycsv.csv")]
         ingest(measurements, source, targets)
 
+        # large files (pandas engine), read and process 1M rows at a time
+        source = ParquetSource("myparquet", path="measurements.parquet")
+        ingest(measurements, source, chunk_size=1000000)
+
     :param featureset:    feature set object or featureset.uri. (uri must be of a feature set that is in the DB,
                           call `.save()` if it's not)
     :param source:        source dataframe or file path
@@ -211,7 +240,15 @@ def ingest(
                           `spark = SparkSession.builder.appName("Spark function").getOrCreate()`
                           For remote spark ingestion, this should contain the remote spark service name
     :param overwrite:     delete the targets' data prior to ingestion
-                          (default: True. deletes the targets that are about to be ingested)
+                          (default: True. deletes the targets that are about to be ingested),
+                          with overwrite=False the data is appended and the feature set stats are
+                          updated (merged) with the stats of the new data (the merged stats are
+                          estimated from sketches, like the stats of chunked ingestion)
+    :param chunk_size:    read and process the source in chunks of up to chunk_size rows (pandas engine),
+                          each chunk is appended to the targets and the stats are accumulated across
+                          chunks, so memory use does not depend on the source size. the result
+                          DataFrame is not returned in chunked mode (default: the
+                          feature_store.pandas_chunk_size config, 0 = no chunks)
     """
     if featureset:
         if isinstance(featureset, str):
@@ -287,6 +324,14 @@ def ingest(
                     "overwrite=False isn't supported in single files. Please use folder path."
                 )
 
+    if featureset.spec.engine == "pandas":
+        if not has_aggregations(featureset.spec.graph):
+            chunk_size = chunk_size or mlrun.mlconf.feature_store.pandas_chunk_size
+    elif chunk_size:
+        raise mlrun.errors.MLRunInvalidArgumentError(
+            "chunked ingestion (chunk_size) is only supported with the pandas engine"
+        )
+
     if spark_context and featureset.spec.engine != "spark":
         raise mlrun.errors.MLRunInvalidArgumentError(
             "featureset.spec.engine must be set to 'spark' to ingest with spark"
@@ -303,6 +348,19 @@ def ingest(
             namespace=namespace,
         )
 
+    if chunk_size:
+        return _ingest_chunks(
+            featureset,
+            source,
+            targets,
+            namespace,
+            infer_options,
+            chunk_size,
+            mlrun_context,
+            spark_context,
+            overwrite,
+        )
+
     if isinstance(source, str):
         # if source is a path/url convert to DataFrame
         source = mlrun.store_manager.object(url=source).as_df()
@@ -320,19 +378,131 @@ def ingest(
     return_df = return_df or infer_stats != InferOptions.Null
     featureset.save()
 
+    infer_stats = _stats_options(infer_options)
+    stats = None
+    if not overwrite and InferOptions.get_common_options(
+        infer_stats, InferOptions.Stats
+    ):
+        # appended data, the stats are merged with the stats (sketches) of the existing
+        # data, which are taken before the targets are written
+        stats = _get_stats_accumulator(featureset, infer_stats, overwrite)
+        infer_stats -= InferOptions.Stats
+
     targets = targets or featureset.spec.targets or get_default_targets()
     df = init_featureset_graph(
         source, featureset, namespace, targets=targets, return_df=return_df,
     )
+    infer_from_static_df(df, featureset, options=infer_stats)
+    if stats:
+        _set_featureset_stats(featureset, stats.update(df))
+    _post_ingestion(mlrun_context, featureset, spark_context)
+
+    return df
+
+
+def _stats_options(infer_options):
+    infer_stats = InferOptions.get_common_options(
+        infer_options, InferOptions.all_stats()
+    )
     if not InferOptions.get_common_options(
         infer_stats, InferOptions.Index
     ) and InferOptions.get_common_options(infer_options, InferOptions.Index):
         infer_stats += InferOptions.Index
+    return infer_stats
 
-    infer_from_static_df(df, featureset, options=infer_stats)
-    _post_ingestion(mlrun_context, featureset, spark_context)
 
-    return df
+def _get_stats_accumulator(featureset, options, overwrite=True):
+    """return a (mergeable) stats accumulator, when appending to the feature set data the
+    accumulator starts from the stats sketches of the existing data"""
+    if overwrite:
+        return DFStatsAccumulator(options)
+    if featureset.status.stats_sketch:
+        return DFStatsAccumulator.from_dict(featureset.status.stats_sketch, options)
+    stats = DFStatsAccumulator(options)
+    if featureset.status.stats:
+        # the stats of the existing data are exact (not mergeable), rebuild the sketches
+        # from the stored (offline) data
+        _update_stats_from_targets(stats, featureset)
+    return stats
+
+
+def _update_stats_from_targets(stats: DFStatsAccumulator, featureset):
+    columns = list(featureset.status.stats.keys())
+    try:
+        for df in featureset.to_dataframe_chunks():
+            if df.index.name:
+                df = df.reset_index()
+            stats.update(df[[column for column in columns if column in df.columns]])
+    except Exception as exc:
+        logger.warning(
+            "failed to read the feature set data, the stats will only include the appended data",
+            featureset=featureset.metadata.name,
+            exc=str(exc),
+        )
+
+
+def _set_featureset_stats(featureset, stats: DFStatsAccumulator):
+    featureset.status.stats = stats.get_stats()
+    featureset.status.stats_sketch = stats.to_dict()
+
+
+def _ingest_chunks(
+    featureset,
+    source,
+    targets,
+    namespace,
+    infer_options,
+    chunk_size,
+    mlrun_context=None,
+    spark_context=None,
+    overwrite=True,
+):
+    """ingest the source chunk by chunk (pandas engine), accumulate the stats across chunks"""
+    chunks = iter(get_source_chunks(source, chunk_size))
+    first_chunk = next(chunks, None)
+    if first_chunk is None:
+        raise mlrun.errors.MLRunInvalidArgumentError("ingestion source is empty")
+
+    schema_options = InferOptions.get_common_options(
+        infer_options, InferOptions.schema()
+    )
+    if schema_options:
+        # the schema is inferred from the first chunk
+        preview(
+            featureset, first_chunk, options=schema_options, namespace=namespace,
+        )
+    featureset.save()
+
+    infer_stats = _stats_options(infer_options)
+    with_stats = InferOptions.get_common_options(infer_stats, InferOptions.Stats)
+    stats = _get_stats_accumulator(featureset, infer_stats, overwrite)
+    results = []
+
+    def on_chunk(df):
+        if not results:
+            results.append(df)
+        if with_stats:
+            stats.update(df)
+
+    targets = targets or featureset.spec.targets or get_default_targets()
+    init_featureset_graph(
+        chain([first_chunk], chunks),
+        featureset,
+        namespace,
+        targets=targets,
+        return_df=False,
+        chunk_size=chunk_size,
+        on_chunk=on_chunk,
+    )
+
+    if results:
+        # preview (and index schema) are taken from the first chunk
+        infer_from_static_df(
+            results[0], featureset, options=infer_stats - with_stats,
+        )
+    if with_stats:
+        _set_featureset_stats(featureset, stats)
+    _post_ingestion(mlrun_context, featureset, spark_context)
 
 
 def preview(
@@ -546,6 +716,7 @@ def _ingest_with_spark(
 
 def _post_ingestion(context, featureset, spark=None):
     featureset.save()
+    invalidate_online_cache(featureset.metadata.name, featureset.metadata.project)
     if context:
         context.logger.info("ingestion task completed, targets:")
         context.logger.info(f"{featureset.status.targets.to_dict()}")
@@ -570,6 +741,8 @@ def infer_from_static_df(
         )
     if InferOptions.get_common_options(options, InferOptions.Stats):
         featureset.status.stats = inferer.get_stats(df, options)
+        # the stats are of the whole data (not mergeable)
+        featureset.status.stats_sketch = {}
     if InferOptions.get_common_options(options, InferOptions.Preview):
         featureset.status.preview = inferer.get_preview(df)
     return df
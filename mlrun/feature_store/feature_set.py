@@ -191,6 +191,7 @@ class FeatureSetStatus(ModelObj):
         preview=None,
         function_uri=None,
         run_uri=None,
+        stats_sketch=None,
     ):
         self.state = state or "created"
         self._targets: ObjectList = None
@@ -199,6 +200,9 @@ class FeatureSetStatus(ModelObj):
         self.preview = preview or []
         self.function_uri = function_uri
         self.run_uri = run_uri
+        # mergeable stats sketches (DFStatsAccumulator), used to update the stats when
+        # appending data to the feature set (ingest with overwrite=False)
+        self.stats_sketch = stats_sketch or {}
 
     @property
     def targets(self) -> List[DataTarget]:
@@ -426,6 +430,10 @@ class FeatureSet(ModelObj):
 
             myset.add_aggregation("asks", "ask", ["sum", "max"], "1h", "10m")
 
+        with the pandas engine (e.g. for offline backfills) the aggregations are computed
+        over the whole DataFrame using vectorized operations, with the same results as the
+        streaming (storey) engine, see :py:func:`~mlrun.feature_store.aggregations.aggregate_df`
+
         :param name:       aggregation name/prefix
         :param column:     name of column/field aggregate
         :param operations: aggregation operations, e.g. ['sum', 'std']
@@ -557,8 +565,24 @@ class FeatureSet(ModelObj):
         start_time=None,
         end_time=None,
         time_column=None,
+        filters=None,
     ):
-        """return featureset (offline) data as dataframe"""
+        """return featureset (offline) data as dataframe
+
+        example::
+
+            # read only the rows of specific entities (pushed down to the parquet reader)
+            df = stocks_set.to_dataframe(filters=[("ticker", "in", ["GOOG", "MSFT"])])
+
+        :param columns:     optional, list of feature columns to read
+        :param df_module:   optional, dataframe class (e.g. pd, dd, cudf, ..)
+        :param target_name: optional, offline target name (default to the first offline target)
+        :param start_time:  optional, datetime, low limit of time to filter
+        :param end_time:    optional, datetime, high limit of time to filter
+        :param time_column: optional, time column name to filter by
+        :param filters:     optional, row filters (on entity or feature columns) in pyarrow
+                            format, list of (column, op, value) tuples, e.g. ("key", "in", keys)
+        """
         entities = list(self.spec.entities.keys())
         if columns:
             if self.spec.timestamp_key and self.spec.timestamp_key not in entities:
@@ -576,6 +600,26 @@ class FeatureSet(ModelObj):
             start_time=start_time,
             end_time=end_time,
             time_column=time_column,
+            filters=filters,
+        )
+
+    def to_dataframe_chunks(
+        self, columns=None, chunksize=None, target_name=None, filters=None
+    ):
+        """return a generator of featureset (offline) data chunks (dataframes)"""
+        entities = list(self.spec.entities.keys())
+        if columns:
+            columns = [column for column in columns if column not in entities]
+            if self.spec.timestamp_key and self.spec.timestamp_key not in entities:
+                columns = [self.spec.timestamp_key] + columns
+            columns = entities + columns
+        driver = get_offline_target(self, name=target_name)
+        if not driver:
+            raise mlrun.errors.MLRunNotFoundError(
+                "there are no offline targets for this feature set"
+            )
+        return driver.as_df_chunks(
+            columns=columns, chunksize=chunksize, filters=filters
         )
 
     def save(self, tag="", versioned=False):
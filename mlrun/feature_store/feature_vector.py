@@ -324,8 +324,9 @@ class FeatureVector(ModelObj):
 class OnlineVectorService:
     """get_online_feature_service response object"""
 
-    def __init__(self, vector, graph, index_columns):
+    def __init__(self, vector, graph, index_columns, cache=None):
         self.vector = vector
+        self.cache = cache
         self._controller = graph.controller
         self._index_columns = index_columns
 
@@ -335,38 +336,95 @@ class OnlineVectorService:
         return "ready"
 
     def get(self, entity_rows: List[dict], as_list=False):
-        """get feature vector given the provided entity inputs"""
-        results = []
-        futures = []
-        for row in entity_rows:
-            futures.append(self._controller.emit(row, return_awaitable_result=True))
-        for future in futures:
-            result = future.await_result()
-            data = result.body
-            for key in self._index_columns:
-                if data and key in data:
-                    del data[key]
-            if not data:
-                data = None
-            else:
-                requested_columns = self.vector.status.features.keys()
-                actual_columns = data.keys()
-                for column in requested_columns:
-                    if (
-                        column not in actual_columns
-                        and column != self.vector.status.label_column
-                    ):
-                        data[column] = None
-            if as_list:
-                data = [
-                    result.body[key]
-                    for key in self.vector.status.features.keys()
-                    if key != self.vector.status.label_column
-                ]
-            results.append(data)
+        """get feature vector given the provided entity inputs
+
+        duplicate entity rows are looked up once, all the (unique) rows are emitted into
+        the graph before waiting for the results so the lookups are pipelined
 
+        :param entity_rows: list of entity rows (dicts) or a DataFrame of entity rows
+        :param as_list:     return each row's features as a list (ordered like the vector
+                            features) instead of a dict
+        """
+        if isinstance(entity_rows, pd.DataFrame):
+            entity_rows = entity_rows.to_dict(orient="records")
+
+        feature_columns = self._feature_columns()
+        results = self._lookup(entity_rows, feature_columns)
+        if as_list:
+            results = [
+                None if data is None else [data[key] for key in feature_columns]
+                for data in results
+            ]
         return results
 
+    def get_df(self, entity_rows: List[dict]) -> pd.DataFrame:
+        """get feature vectors of the provided entity inputs as a DataFrame
+
+        the DataFrame has a row per entity row (rows with no matching entity are all
+        null) and a column per vector feature (followed by the label/index columns when
+        returned), use `.to_numpy()` for a numpy array
+
+        :param entity_rows: list of entity rows (dicts) or a DataFrame of entity rows
+        """
+        index = None
+        if isinstance(entity_rows, pd.DataFrame):
+            index = entity_rows.index
+            entity_rows = entity_rows.to_dict(orient="records")
+
+        feature_columns = self._feature_columns()
+        results = self._lookup(entity_rows, feature_columns)
+        columns = {key: [None] * len(results) for key in feature_columns}
+        for i, data in enumerate(results):
+            if data is not None:
+                for key, value in data.items():
+                    if key not in columns:
+                        columns[key] = [None] * len(results)
+                    columns[key][i] = value
+        return pd.DataFrame(columns, columns=list(columns.keys()), index=index)
+
+    def _feature_columns(self):
+        label_column = self.vector.status.label_column
+        return [
+            key for key in self.vector.status.features.keys() if key != label_column
+        ]
+
+    def _lookup(self, entity_rows: List[dict], feature_columns):
+        futures = {}
+        row_keys = []
+        for row in entity_rows:
+            try:
+                row_key = tuple(sorted(row.items()))
+                hash(row_key)
+            except TypeError:
+                # unhashable row values, dont deduplicate the row
+                row_key = len(row_keys)
+            row_keys.append(row_key)
+            if row_key not in futures:
+                futures[row_key] = self._controller.emit(
+                    row, return_awaitable_result=True
+                )
+
+        responses = {}
+        for row_key, future in futures.items():
+            data = future.await_result().body
+            if data:
+                data = {
+                    key: value
+                    for key, value in data.items()
+                    if key not in self._index_columns
+                }
+            if data:
+                for key in feature_columns:
+                    if key not in data:
+                        data[key] = None
+            responses[row_key] = data or None
+
+        # every row gets its own result dict (duplicate rows share the lookup)
+        return [
+            None if responses[row_key] is None else copy(responses[row_key])
+            for row_key in row_keys
+        ]
+
     def close(self):
         """terminate the async loop"""
         self._controller.terminate()
@@ -390,11 +448,22 @@ class OfflineVectorResponse:
             raise mlrun.errors.MLRunTaskNotReady("feature vector dataset is not ready")
         return self._merger.get_df()
 
+    def to_dataframe_chunks(self):
+        """return a generator of result dataframe chunks
+
+        when the features were retrieved with chunk_size the chunks are merged lazily
+        (one key hash bucket at a time), otherwise the whole result is a single chunk
+        """
+        if self.status != "completed":
+            raise mlrun.errors.MLRunTaskNotReady("feature vector dataset is not ready")
+        return self._merger.get_df_chunks()
+
     def to_parquet(self, target_path, **kw):
         """return results as parquet file"""
-        size = ParquetTarget(path=target_path).write_dataframe(
-            self._merger.get_df(), **kw
-        )
+        target = ParquetTarget(path=target_path)
+        if self._merger.is_chunked():
+            return target.write_dataframe_chunks(self._merger.get_df_chunks(), **kw)
+        size = target.write_dataframe(self._merger.get_df(), **kw)
         return size
 
     def to_csv(self, target_path, **kw):
@@ -13,8 +13,13 @@
 # limitations under the License.
 
 import uuid
+from functools import partial
+
+import pandas as pd
+from storey import MapClass
 
 import mlrun
+from mlrun.datastore.base import split_df
 from mlrun.datastore.sources import get_source_from_dict, get_source_step
 from mlrun.datastore.targets import (
     add_target_steps,
@@ -29,15 +34,31 @@ from ..runtimes import RuntimeKinds
 from ..runtimes.function_reference import FunctionReference
 from ..serving.server import MockEvent, create_graph_server
 from ..utils import logger
+from .steps import MLRunStep, do_rows
 
 
 def init_featureset_graph(
-    source, featureset, namespace, targets=None, return_df=True, verbose=False
+    source,
+    featureset,
+    namespace,
+    targets=None,
+    return_df=True,
+    verbose=False,
+    chunk_size=None,
+    on_chunk=None,
 ):
-    """create storey ingestion graph/DAG from feature set object"""
+    """create storey ingestion graph/DAG from feature set object
+
+    with the sync (pandas) engine, when chunk_size (or the feature_store.pandas_chunk_size
+    config) is set, the source is read and processed chunk by chunk, each result chunk
+    is appended to the targets and passed to on_chunk(df) (e.g. for accumulating stats)
+    """
 
     cache = ResourceCache()
     graph = featureset.spec.graph.copy()
+    with_aggregations = False
+    if graph.engine == "sync":
+        with_aggregations = _set_dataframe_aggregations(graph, featureset)
 
     # init targets (and table)
     targets = targets or []
@@ -60,6 +81,25 @@ def init_featureset_graph(
     if graph.engine != "sync":
         return graph.wait_for_completion()
 
+    _set_row_handlers(graph)
+    if not with_aggregations:
+        chunk_size = chunk_size or mlrun.mlconf.feature_store.pandas_chunk_size
+    elif chunk_size:
+        raise mlrun.errors.MLRunInvalidArgumentError(
+            "aggregations are computed over the whole source, chunked ingestion "
+            "(chunk_size) is not supported with aggregations"
+        )
+    if chunk_size:
+        return _run_chunks(
+            server,
+            get_source_chunks(source, chunk_size),
+            featureset,
+            targets,
+            return_df=return_df,
+            verbose=verbose,
+            on_chunk=on_chunk,
+        )
+
     if hasattr(source, "to_dataframe"):
         source = source.to_dataframe()
     elif not hasattr(source, "to_csv"):
@@ -74,9 +114,99 @@ def init_featureset_graph(
         if verbose:
             logger.info(f"wrote target: {target_status}")
 
+    if on_chunk and data is not None:
+        on_chunk(data)
     return data
 
 
+def get_source_chunks(source, chunk_size):
+    """return an iterator of dataframe chunks (of up to chunk_size rows) from the source
+
+    source can be a DataFrame, a source object or a file path/url (csv or parquet files
+    are read incrementally, so the whole file is never loaded into memory)
+    """
+    if isinstance(source, str):
+        return mlrun.store_manager.object(url=source).as_df_chunks(chunksize=chunk_size)
+    if hasattr(source, "__next__"):
+        # already an iterator of chunks
+        return source
+    if hasattr(source, "to_dataframe_chunks"):
+        return source.to_dataframe_chunks(chunk_size)
+    if hasattr(source, "to_dataframe"):
+        source = source.to_dataframe()
+    elif not hasattr(source, "to_csv"):
+        raise mlrun.errors.MLRunInvalidArgumentError("illegal source")
+    return split_df(source, chunk_size)
+
+
+def _run_chunks(
+    server, chunks, featureset, targets, return_df=True, verbose=False, on_chunk=None
+):
+    """run the (sync) graph on every source chunk and append the results to the targets"""
+    targets = [get_target_driver(target, featureset) for target in targets]
+    writers = [target.get_chunks_writer() for target in targets]
+    results = []
+    for chunk in chunks:
+        data = server.run(MockEvent(body=chunk), get_body=True)
+        if data is None:
+            continue
+        for writer in writers:
+            writer.write(data)
+        if on_chunk:
+            on_chunk(data)
+        if return_df:
+            results.append(data)
+
+    for target, writer in zip(targets, writers):
+        size = writer.close()
+        target_status = target.update_resource_status("ready", size=size)
+        if verbose:
+            logger.info(f"wrote target: {target_status}")
+
+    if not return_df:
+        return None
+    return pd.concat(results) if results else pd.DataFrame()
+
+
+def has_aggregations(graph):
+    """return True if the graph has (storey) aggregation steps"""
+    return any(_is_aggregation_step(step) for step in graph.get_children())
+
+
+def _is_aggregation_step(step):
+    return getattr(step, "class_name", None) == "storey.AggregateByKey"
+
+
+def _set_dataframe_aggregations(graph, featureset):
+    """replace the storey (streaming) aggregation steps with the vectorized DataFrame steps"""
+    found = False
+    for step in graph.get_children():
+        if _is_aggregation_step(step):
+            step.class_name = "mlrun.feature_store.aggregations.AggregateByKey"
+            step.class_args["key_columns"] = list(featureset.spec.entities.keys())
+            step.class_args["time_column"] = featureset.spec.timestamp_key
+            found = True
+    return found
+
+
+def _set_row_handlers(step):
+    """run storey (per event) steps on every row of the DataFrame, in the pandas engine
+
+    the built-in steps (MLRunStep) process the whole DataFrame using vectorized pandas
+    operations, user storey classes (MapClass) expect a single event (dict) at a time
+    """
+    for child in step.get_children():
+        _set_row_handlers(child)
+    step_object = getattr(step, "_object", None)
+    if (
+        isinstance(step_object, MapClass)
+        and not isinstance(step_object, MLRunStep)
+        and not step.full_event
+        and step._handler == getattr(step_object, "do", None)
+    ):
+        step._handler = partial(do_rows, step._handler)
+
+
 def featureset_initializer(server):
     """graph server hook to initialize feature set ingestion graph/DAG"""
 
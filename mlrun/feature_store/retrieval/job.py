@@ -15,6 +15,7 @@ def run_merge_job(
     timestamp_column=None,
     run_config=None,
     drop_columns=None,
+    chunk_size=None,
 ):
     name = vector.metadata.name
     if not target or not hasattr(target, "to_dict"):
@@ -41,6 +42,7 @@ def run_merge_job(
             "target": target.to_dict(),
             "timestamp_column": timestamp_column,
             "drop_columns": drop_columns,
+            "chunk_size": chunk_size,
         },
         inputs={"entity_rows": entity_rows},
     )
@@ -92,7 +94,8 @@ _default_merger_handler = """
 import mlrun
 from mlrun.feature_store.retrieval import LocalFeatureMerger
 from mlrun.datastore.targets import get_target_driver
-def merge_handler(context, vector_uri, target, entity_rows=None, timestamp_column=None, drop_columns=None):
+def merge_handler(context, vector_uri, target, entity_rows=None, timestamp_column=None, drop_columns=None,
+                  chunk_size=None):
     vector = context.get_store_resource(vector_uri)
     store_target = get_target_driver(target, vector)
     entity_timestamp_column = timestamp_column or vector.spec.timestamp_field
@@ -101,7 +104,7 @@ def merge_handler(context, vector_uri, target, entity_rows=None, timestamp_colum
 
     context.logger.info(f"starting vector merge task to {vector.uri}")
     merger = LocalFeatureMerger(vector)
-    resp = merger.start(entity_rows, entity_timestamp_column, store_target, drop_columns)
+    resp = merger.start(entity_rows, entity_timestamp_column, store_target, drop_columns, chunk_size=chunk_size)
     target = vector.status.targets[store_target.name].to_dict()
     context.log_result('feature_vector', vector.uri)
     context.log_result('target', target)
@@ -12,21 +12,32 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import math
+import os
+import tempfile
 from typing import List
 
+import numpy as np
 import pandas as pd
 
 import mlrun
 import mlrun.errors
 
+from ...datastore.base import split_df
 from ...utils import logger
 from ..feature_vector import OfflineVectorResponse
 
+# entity key filters are pushed down to the feature set reads up to this number of rows
+max_entity_filter_rows = 100000
+
 
 class LocalFeatureMerger:
     def __init__(self, vector):
         self._result_df = None
         self.vector = vector
+        self._drop_columns = []
+        self._buckets = None
+        self._spill_dir = None
 
     def start(
         self,
@@ -36,6 +47,7 @@ class LocalFeatureMerger:
         drop_columns=None,
         start_time=None,
         end_time=None,
+        chunk_size=None,
     ):
         index_columns = []
         drop_indexes = False if self.vector.spec.with_indexes else True
@@ -49,42 +61,52 @@ class LocalFeatureMerger:
         feature_set_objects, feature_set_fields = self.vector.parse_features()
         self.vector.save()
 
-        # load dataframes
         feature_sets = []
-        dfs = []
-        df_module = None  # for use of dask or other non pandas df module
         for name, columns in feature_set_fields.items():
             feature_set = feature_set_objects[name]
             feature_sets.append(feature_set)
-            column_names = [name for name, alias in columns]
-            df = feature_set.to_dataframe(
-                columns=column_names,
-                df_module=df_module,
-                start_time=start_time,
-                end_time=end_time,
-                time_column=entity_timestamp_column,
-            )
-            # rename columns with aliases
-            df.rename(
-                columns={name: alias for name, alias in columns if alias}, inplace=True
-            )
-            dfs.append(df)
             append_index(feature_set.spec.timestamp_key)
             for key in feature_set.spec.entities.keys():
                 append_index(key)
 
-        self.merge(entity_rows, entity_timestamp_column, feature_sets, dfs)
-        if drop_columns or index_columns:
-            for field in drop_columns or []:
-                if field not in index_columns:
-                    index_columns.append(field)
+        for field in drop_columns or []:
+            if field not in index_columns:
+                index_columns.append(field)
+        self._drop_columns = index_columns
 
-            self._result_df.drop(columns=index_columns, inplace=True, errors="ignore")
-
-        if self.vector.status.label_column:
-            self._result_df = self._result_df.dropna(
-                subset=[self.vector.status.label_column]
+        if chunk_size:
+            self._partition(
+                entity_rows,
+                entity_timestamp_column,
+                feature_sets,
+                list(feature_set_fields.values()),
+                chunk_size,
+                start_time,
+                end_time,
             )
+        else:
+            # load dataframes
+            dfs = []
+            df_module = None  # for use of dask or other non pandas df module
+            for feature_set, columns in zip(feature_sets, feature_set_fields.values()):
+                column_names = [name for name, alias in columns]
+                df = feature_set.to_dataframe(
+                    columns=column_names,
+                    df_module=df_module,
+                    start_time=start_time,
+                    end_time=end_time,
+                    time_column=entity_timestamp_column,
+                    filters=_entity_filters(entity_rows, feature_set),
+                )
+                # rename columns with aliases
+                df.rename(
+                    columns={name: alias for name, alias in columns if alias},
+                    inplace=True,
+                )
+                dfs.append(df)
+
+            self.merge(entity_rows, entity_timestamp_column, feature_sets, dfs)
+            self._result_df = self._post_process(self._result_df)
 
         if target:
             is_persistent_vector = self.vector.metadata.name is not None
@@ -93,13 +115,163 @@ class LocalFeatureMerger:
                     "target path was not specified"
                 )
             target.set_resource(self.vector)
-            size = target.write_dataframe(self._result_df)
+            if chunk_size:
+                size = target.write_dataframe_chunks(self.get_df_chunks())
+            else:
+                size = target.write_dataframe(self._result_df)
             if is_persistent_vector:
                 target_status = target.update_resource_status("ready", size=size)
                 logger.info(f"wrote target: {target_status}")
                 self.vector.save()
         return OfflineVectorResponse(self)
 
+    def _post_process(self, result_df):
+        if self._drop_columns:
+            result_df.drop(columns=self._drop_columns, inplace=True, errors="ignore")
+
+        if self.vector.status.label_column:
+            result_df = result_df.dropna(subset=[self.vector.status.label_column])
+        return result_df
+
+    def _partition(
+        self,
+        entity_rows,
+        entity_timestamp_column,
+        feature_sets,
+        feature_set_columns,
+        chunk_size,
+        start_time=None,
+        end_time=None,
+    ):
+        """hash partition the entity rows and feature sets by their common entity keys
+
+        the inputs are read in chunks and spilled to local bucket files, rows with the same
+        key land in the same bucket so every bucket can be joined independently (in
+        get_df_chunks), the number of buckets is set so a bucket holds ~chunk_size rows of
+        the largest input (the entity rows or a feature set)
+        """
+        keys = [
+            key
+            for key in feature_sets[0].spec.entities.keys()
+            if all(
+                key in feature_set.spec.entities.keys() for feature_set in feature_sets
+            )
+        ]
+        if not keys:
+            raise mlrun.errors.MLRunInvalidArgumentError(
+                "chunked retrieval requires an entity which is common to all the feature sets"
+            )
+
+        # count the (filtered) rows of every input, reading only the key columns
+        rows = 0 if entity_rows is None else len(entity_rows)
+        for feature_set in feature_sets:
+            feature_set_rows = sum(
+                len(chunk)
+                for chunk in feature_set.to_dataframe_chunks(
+                    columns=keys,
+                    chunksize=chunk_size,
+                    filters=_entity_filters(entity_rows, feature_set),
+                )
+            )
+            rows = max(rows, feature_set_rows)
+        self._buckets = max(1, math.ceil(rows / chunk_size))
+        self._spill_dir = tempfile.TemporaryDirectory(prefix="mlrun-merge-")
+        self._entity_timestamp_column = entity_timestamp_column
+        self._feature_sets = feature_sets
+        self._schemas = []
+
+        sources = []
+        if entity_rows is not None:
+            sources.append(("entity", None, split_df(entity_rows, chunk_size)))
+        for index, (feature_set, columns) in enumerate(
+            zip(feature_sets, feature_set_columns)
+        ):
+            chunks = feature_set.to_dataframe_chunks(
+                columns=[name for name, alias in columns],
+                chunksize=chunk_size,
+                filters=_entity_filters(entity_rows, feature_set),
+            )
+            sources.append((str(index), (feature_set, columns), chunks))
+
+        for source_name, source, chunks in sources:
+            schema = None
+            for chunk_index, chunk in enumerate(chunks):
+                if type(chunk.index) != pd.RangeIndex:
+                    chunk = chunk.reset_index()
+                if source:
+                    feature_set, columns = source
+                    chunk = chunk.rename(
+                        columns={name: alias for name, alias in columns if alias}
+                    )
+                    chunk = _filter_time(
+                        chunk,
+                        entity_timestamp_column or feature_set.spec.timestamp_key,
+                        start_time,
+                        end_time,
+                    )
+                if schema is None:
+                    schema = chunk.iloc[:0]
+                buckets = _hash_buckets(chunk, keys, self._buckets)
+                for bucket, part in chunk.groupby(buckets, sort=False):
+                    part.reset_index(drop=True).to_pickle(
+                        self._bucket_path(source_name, bucket, chunk_index)
+                    )
+            if schema is None and source:
+                feature_set, columns = source
+                schema = pd.DataFrame(
+                    columns=list(feature_set.spec.entities.keys())
+                    + [feature_set.spec.timestamp_key or entity_timestamp_column]
+                    + [alias or name for name, alias in columns]
+                )
+            self._schemas.append(schema)
+        self._with_entity_rows = entity_rows is not None
+
+    def _bucket_path(self, name, bucket, chunk_index):
+        bucket_dir = os.path.join(self._spill_dir.name, name, str(bucket))
+        os.makedirs(bucket_dir, exist_ok=True)
+        return os.path.join(bucket_dir, f"{chunk_index}.pkl")
+
+    def _load_bucket(self, name, bucket, schema):
+        bucket_dir = os.path.join(self._spill_dir.name, name, str(bucket))
+        parts = []
+        if os.path.isdir(bucket_dir):
+            parts = [
+                pd.read_pickle(os.path.join(bucket_dir, file_name))
+                for file_name in sorted(
+                    os.listdir(bucket_dir), key=lambda file_name: int(file_name[:-4])
+                )
+            ]
+        if not parts:
+            return schema
+        return pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+
+    def get_df_chunks(self):
+        """return a generator of result dataframe chunks (merged bucket by bucket)"""
+        if self._buckets is None:
+            yield self.get_df()
+            return
+
+        # when there are no entity rows the first feature set is used as the entity df
+        names = [str(index) for index in range(len(self._feature_sets))]
+        if self._with_entity_rows:
+            names.insert(0, "entity")
+        for bucket in range(self._buckets):
+            entity_df = self._load_bucket(names[0], bucket, None)
+            if entity_df is None or entity_df.empty:
+                continue
+            dfs = [
+                self._load_bucket(name, bucket, schema)
+                for name, schema in zip(names[1:], self._schemas[1:])
+            ]
+            if not self._with_entity_rows:
+                dfs.insert(0, entity_df)
+                entity_df = None
+            self.merge(
+                entity_df, self._entity_timestamp_column, list(self._feature_sets), dfs,
+            )
+            result_df, self._result_df = self._result_df, None
+            yield self._post_process(result_df)
+
     def merge(
         self,
         entity_df,
@@ -115,57 +287,104 @@ class LocalFeatureMerger:
                 entity_timestamp_column or featureset.spec.timestamp_key
             )
 
+        # consecutive as-of joins are done in one pass over the (sorted once) entity df
+        asof_featuresets = []
         for featureset, featureset_df in zip(featuresets, featureset_dfs):
             if featureset.spec.timestamp_key:
-                merge_func = self._asof_join
-            else:
-                merge_func = self._join
+                asof_featuresets.append((featureset, featureset_df))
+                continue
 
-            merged_df = merge_func(
+            if asof_featuresets:
+                merged_df = self._asof_join(
+                    merged_df, entity_timestamp_column, asof_featuresets
+                )
+                asof_featuresets = []
+            merged_df = self._join(
                 merged_df, entity_timestamp_column, featureset, featureset_df,
             )
 
+        if asof_featuresets:
+            merged_df = self._asof_join(
+                merged_df, entity_timestamp_column, asof_featuresets
+            )
         self._result_df = merged_df
 
     def _asof_join(
-        self,
-        entity_df,
-        entity_timestamp_column: str,
-        featureset,
-        featureset_df: pd.DataFrame,
+        self, entity_df, entity_timestamp_column: str, featuresets: list,
     ):
-        indexes = list(featureset.spec.entities.keys())
-        index_col_not_in_entity = "index" not in entity_df.columns
-        index_col_not_in_featureset = "index" not in featureset_df.columns
-        # Sort left and right keys
+        """as-of join the entity df with multiple feature sets
+
+        the entity df is sorted once, the matching feature set rows are found using only
+        the entity keys and timestamps (see _asof_positions), and the feature columns are
+        concatenated to the result once (instead of copying the result per feature set)
+        """
+        index_col_in_input = "index" in entity_df.columns
         if type(entity_df.index) != pd.RangeIndex:
             entity_df = entity_df.reset_index()
-        if type(featureset_df.index) != pd.RangeIndex:
-            featureset_df = featureset_df.reset_index()
         entity_df[entity_timestamp_column] = pd.to_datetime(
             entity_df[entity_timestamp_column]
         )
-        featureset_df[featureset.spec.timestamp_key] = pd.to_datetime(
-            featureset_df[featureset.spec.timestamp_key]
-        )
         entity_df = entity_df.sort_values(by=entity_timestamp_column)
-        featureset_df = featureset_df.sort_values(by=entity_timestamp_column)
-
-        merged_df = pd.merge_asof(
-            entity_df,
-            featureset_df,
-            left_on=entity_timestamp_column,
-            right_on=featureset.spec.timestamp_key,
-            by=indexes,
-        )
+        entity_df.reset_index(drop=True, inplace=True)
+
+        entity_times = _to_int64_times(entity_df[entity_timestamp_column])
+        entity_keys = {}
+        parts = [entity_df]
+        column_parts = {column: 0 for column in entity_df.columns}
+        all_indexes = set()
+        for featureset, featureset_df in featuresets:
+            indexes = list(featureset.spec.entities.keys())
+            all_indexes.update(indexes)
+            timestamp_key = featureset.spec.timestamp_key
+            index_col_in_input = index_col_in_input or "index" in featureset_df.columns
+            if type(featureset_df.index) != pd.RangeIndex:
+                featureset_df = featureset_df.reset_index()
+
+            # find the matching feature set row (position) for every entity row
+            if tuple(indexes) not in entity_keys:
+                entity_keys[tuple(indexes)] = _factorize_keys(entity_df, indexes)
+            entity_codes, entity_order, keys_index = entity_keys[tuple(indexes)]
+            positions = _asof_positions(
+                entity_codes,
+                entity_order,
+                entity_times,
+                keys_index.get_indexer(_keys_index(featureset_df, indexes)),
+                _to_int64_times(featureset_df[timestamp_key]),
+            )
+
+            columns = [
+                column
+                for column in featureset_df.columns
+                if column not in indexes
+                and not (column == timestamp_key and column == entity_timestamp_column)
+            ]
+            # unmatched rows (position -1) are filled with nulls
+            part = featureset_df[columns].reset_index(drop=True).reindex(positions)
+            part.reset_index(drop=True, inplace=True)
+            if timestamp_key in columns:
+                part[timestamp_key] = pd.to_datetime(part[timestamp_key])
+
+            # same suffixes as pandas merge for overlapping columns
+            for column in columns:
+                if column in column_parts:
+                    part_index = column_parts.pop(column)
+                    parts[part_index].rename(
+                        columns={column: f"{column}_x"}, inplace=True
+                    )
+                    column_parts[f"{column}_x"] = part_index
+                    part.rename(columns={column: f"{column}_y"}, inplace=True)
+            for column in part.columns:
+                column_parts[column] = len(parts)
+            parts.append(part)
+
+        merged_df = pd.concat(parts, axis=1, copy=False)
 
         # Undo indexing tricks for asof merge
         # to return the correct indexes and not
         # overload `index` columns
         if (
-            "index" not in indexes
-            and index_col_not_in_entity
-            and index_col_not_in_featureset
+            "index" not in all_indexes
+            and not index_col_in_input
             and "index" in merged_df.columns
         ):
             merged_df = merged_df.drop(columns="index")
@@ -183,9 +402,101 @@ class LocalFeatureMerger:
         return merged_df
 
     def get_status(self):
-        if self._result_df is None:
+        if self._result_df is None and self._buckets is None:
             raise RuntimeError("unexpected status, no result df")
         return "completed"
 
+    def is_chunked(self):
+        return self._buckets is not None
+
     def get_df(self):
+        if self._buckets is not None:
+            return pd.concat(list(self.get_df_chunks()), ignore_index=True)
         return self._result_df
+
+
+def _entity_filters(entity_rows, featureset):
+    """filters which select only the feature set rows with keys from the entity rows"""
+    if entity_rows is None or len(entity_rows) > max_entity_filter_rows:
+        return None
+    filters = []
+    for key in featureset.spec.entities.keys():
+        if key in entity_rows.columns:
+            values = entity_rows[key]
+        elif key in entity_rows.index.names:
+            values = entity_rows.index.get_level_values(key)
+        else:
+            continue
+        filters.append((key, "in", values.dropna().unique().tolist()))
+    return filters or None
+
+
+def _filter_time(df, time_column, start_time=None, end_time=None):
+    if not (start_time or end_time) or time_column not in df.columns:
+        return df
+    times = pd.to_datetime(df[time_column])
+    mask = pd.Series(True, index=df.index)
+    if start_time:
+        mask &= times >= pd.Timestamp(start_time)
+    if end_time:
+        mask &= times < pd.Timestamp(end_time)
+    return df[mask]
+
+
+def _hash_buckets(df, keys, buckets):
+    # normalize the key types so equal keys (e.g. int/float, str/category) hash the same
+    columns = {}
+    for key in keys:
+        column = df[key]
+        if pd.api.types.is_numeric_dtype(column.dtype):
+            columns[key] = column.astype("float64")
+        else:
+            columns[key] = column.astype(str)
+    hashes = pd.util.hash_pandas_object(pd.DataFrame(columns), index=False)
+    return (hashes % buckets).values
+
+
+def _keys_index(df, keys):
+    if len(keys) == 1:
+        return pd.Index(df[keys[0]])
+    return pd.MultiIndex.from_frame(df[keys])
+
+
+def _factorize_keys(df, keys):
+    """return the df rows key codes, the rows order by key and the unique keys index"""
+    codes, uniques = pd.factorize(_keys_index(df, keys))
+    return codes, np.argsort(codes, kind="mergesort"), pd.Index(uniques)
+
+
+def _to_int64_times(series):
+    return pd.to_datetime(series).values.astype("datetime64[ns]").view("int64")
+
+
+def _asof_positions(left_codes, left_order, left_times, right_codes, right_times):
+    """as-of match (by key) positions, the last right row with the same key and time <= left time
+
+    the times are replaced with their rank in the (unique) right times, so the key code
+    and the time rank are combined into one sortable int64 value, and the matches are
+    found with a single (vectorized) binary search, returns -1 for unmatched rows.
+    the left rows must be sorted by time, and left_order (the stable order by key code)
+    is then also sorted by the combined value
+    """
+    unique_times, right_ranks = np.unique(right_times, return_inverse=True)
+    size = len(unique_times) + 1
+    right_combined = right_codes * size + right_ranks + 1
+    left_combined = left_codes * size + np.searchsorted(
+        unique_times, left_times, side="right"
+    )
+
+    # searching sorted values is much faster (sequential memory access)
+    right_order = np.argsort(right_combined, kind="mergesort")
+    found = np.empty(len(left_combined), dtype=np.int64)
+    found[left_order] = (
+        np.searchsorted(
+            right_combined[right_order], left_combined[left_order], side="right"
+        )
+        - 1
+    )
+    positions = right_order[np.maximum(found, 0)]
+    matched = (found >= 0) & (left_codes >= 0) & (right_codes[positions] == left_codes)
+    return np.where(matched, positions, -1)
@@ -11,15 +11,146 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Dict, Optional
 
 import mlrun
 from mlrun.datastore.store_resources import ResourceCache
 from mlrun.datastore.targets import get_online_target
 from mlrun.serving.server import create_graph_server
 
+# the live caches, used for invalidating the cached entities on feature set ingestion
+_online_caches = weakref.WeakSet()
+
+
+class OnlineFeatureCache:
+    """in-process LRU/TTL cache of online feature set entities
+
+    the cache is used by the online feature vector service (see
+    get_online_feature_service()) in front of the online target (NoSQL/KV), entities
+    are cached per feature set (project and name) and evicted by LRU order (entry count
+    and size bounds) or when their ttl expires, the cache is invalidated when the feature
+    set is ingested in this process (ingestions by other processes are seen once the
+    ttl expires). aggregation features and missing entities are not cached
+
+    example::
+
+        cache = OnlineFeatureCache(max_entries=100000, ttl=60, featureset_ttl={"stocks": 600})
+        svc = get_online_feature_service(vector_uri, cache=cache)
+        resp = svc.get([{"ticker": "GOOG"}])
+        print(cache.stats())
+
+    :param max_entries:     max number of cached entities (over all feature sets)
+    :param max_bytes:       max (estimated) size of the cached entities in bytes
+    :param ttl:             default entity time to live in seconds (60), None for no expiration
+    :param featureset_ttl:  per feature set ttl in seconds, {featureset name: ttl}
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_bytes: int = None,
+        ttl: Optional[float] = 60,
+        featureset_ttl: Dict[str, float] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.featureset_ttl = featureset_ttl or {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        _online_caches.add(self)
+
+    def get(self, featureset: str, key, project: str = ""):
+        """get the cached entity value or None if not cached (or expired)"""
+        cache_key = (project, featureset, key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                value, size, expires = entry
+                if expires is None or expires > time.monotonic():
+                    self._entries.move_to_end(cache_key)
+                    self.hits += 1
+                    return value
+                self._remove(cache_key)
+            self.misses += 1
+            return None
+
+    def set(self, featureset: str, key, value, project: str = ""):
+        """cache the entity value"""
+        ttl = self.featureset_ttl.get(featureset, self.ttl)
+        expires = None if ttl is None else time.monotonic() + ttl
+        size = _estimate_size(value)
+        cache_key = (project, featureset, key)
+        with self._lock:
+            if cache_key in self._entries:
+                self._remove(cache_key)
+            self._entries[cache_key] = (value, size, expires)
+            self._size += size
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes and self._size > self.max_bytes)
+            ):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, featureset: str = None, project: str = None):
+        """remove the cached entities of a feature set (or all the entities)
+
+        :param featureset: feature set name, None for all the feature sets
+        :param project:    feature set project, None for all the projects
+        """
+        with self._lock:
+            keys = [
+                cache_key
+                for cache_key in self._entries.keys()
+                if (project is None or cache_key[0] == project)
+                and (featureset is None or cache_key[1] == featureset)
+            ]
+            for cache_key in keys:
+                self._remove(cache_key)
+
+    def stats(self) -> dict:
+        """return the cache metrics (hits, misses, evictions, entries, bytes)"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._size,
+        }
+
+    def _remove(self, cache_key):
+        value, size, expires = self._entries.pop(cache_key)
+        self._size -= size
+
+
+def _estimate_size(value):
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            sys.getsizeof(key) + _estimate_size(item) for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def invalidate_online_cache(featureset_name: str, project: str = None):
+    """invalidate the cached entities of the feature set (in all the live caches)"""
+    for cache in list(_online_caches):
+        cache.invalidate(featureset_name, project)
+
 
 def _build_feature_vector_graph(
-    vector, feature_set_fields, feature_set_objects,
+    vector, feature_set_fields, feature_set_objects, cache: OnlineFeatureCache = None,
 ):
     graph = vector.spec.graph.copy()
     start_states, default_final_state, responders = graph.check_and_process_graph(
@@ -33,14 +164,27 @@ def _build_feature_vector_graph(
         aliases = {name: alias for name, alias in columns if alias}
 
         entity_list = list(featureset.spec.entities.keys())
-        next = next.to(
-            "storey.QueryByKey",
-            f"query-{name}",
-            features=column_names,
-            table=featureset.uri,
-            key=entity_list,
-            aliases=aliases,
-        )
+        if cache:
+            next = next.to(
+                "mlrun.feature_store.retrieval.storey_steps.CachedQueryByKey",
+                f"query-{name}",
+                features=column_names,
+                table=featureset.uri,
+                key=entity_list,
+                aliases=aliases,
+                cache=cache,
+                featureset=featureset.metadata.name,
+                project=featureset.metadata.project or "",
+            )
+        else:
+            next = next.to(
+                "storey.QueryByKey",
+                f"query-{name}",
+                features=column_names,
+                table=featureset.uri,
+                key=entity_list,
+                aliases=aliases,
+            )
     for name in start_states:
         next.set_next(name)
 
@@ -55,14 +199,16 @@ def _build_feature_vector_graph(
     return graph
 
 
-def init_feature_vector_graph(vector):
+def init_feature_vector_graph(vector, cache: OnlineFeatureCache = None):
     try:
         from storey import SyncEmitSource
     except ImportError as exc:
         raise ImportError(f"storey not installed, use pip install storey, {exc}")
 
     feature_set_objects, feature_set_fields = vector.parse_features(False)
-    graph = _build_feature_vector_graph(vector, feature_set_fields, feature_set_objects)
+    graph = _build_feature_vector_graph(
+        vector, feature_set_fields, feature_set_objects, cache
+    )
     graph.set_flow_source(SyncEmitSource())
     server = create_graph_server(graph=graph, parameters={})
 
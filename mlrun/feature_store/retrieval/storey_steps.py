@@ -0,0 +1,74 @@
+# Copyright 2018 Iguazio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from storey import QueryByKey
+from storey.utils import stringify_key
+
+from .online import OnlineFeatureCache
+
+
+class CachedQueryByKey(QueryByKey):
+    """QueryByKey with an in-process entity cache in front of the online target
+
+    aggregation features depend on the query time and are always read from the target
+    (the cache is bypassed when the step has aggregations), missing entities are not
+    cached. the cache holds the entity attributes as read from the target, the columns
+    and aliases of each step are applied after the lookup (so steps of different vectors
+    can share the cache)
+
+    note: the step replaces the storey QueryByKey/Table internals which read the entity
+    (_emit_event, _lazy_load_key_with_aggregates and _get_static_attrs)
+
+    :param cache:      OnlineFeatureCache object shared by the vector query steps
+    :param featureset: feature set name (the cache namespace and ttl key)
+    :param project:    feature set project (the cache namespace)
+    """
+
+    def __init__(
+        self,
+        *args,
+        cache: OnlineFeatureCache = None,
+        featureset: str = "",
+        project: str = "",
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self._cache = cache
+        self._featureset = featureset
+        self._project = project
+
+    async def _emit_event(self, key, event):
+        if self._aggrs:
+            return await super()._emit_event(key, event)
+
+        safe_key = stringify_key(key)
+        static_attrs = self._cache.get(
+            self._featureset, safe_key, project=self._project
+        )
+        if static_attrs is None:
+            await self._table._lazy_load_key_with_aggregates(
+                safe_key, self._get_timestamp(event)
+            )
+            static_attrs = self._table._get_static_attrs(safe_key)
+            if static_attrs:
+                self._cache.set(
+                    self._featureset, safe_key, static_attrs, project=self._project
+                )
+
+        features = self._augmentation_fn(event.body, {})
+        for col in self._enrich_with:
+            if static_attrs and col in static_attrs:
+                features[self._aliases.get(col, None) or col] = static_attrs[col]
+        event.key = key
+        event.body = features
+        await self._do_downstream(event)
@@ -6,6 +6,34 @@ from storey import MapClass
 this_path = "mlrun.feature_store.steps"
 
 
+class MLRunStep(MapClass):
+    """base class for the built-in feature set steps
+
+    with the storey engine the step gets one event (dict) at a time (_do_storey), with the
+    pandas engine it gets a DataFrame chunk (_do_pandas), steps which do not implement a
+    vectorized _do_pandas fall back to running _do_storey on every row
+    """
+
+    def do(self, event):
+        if isinstance(event, pd.DataFrame):
+            return self._do_pandas(event)
+        return self._do_storey(event)
+
+    def _do_storey(self, event):
+        raise NotImplementedError()
+
+    def _do_pandas(self, event):
+        return do_rows(self._do_storey, event)
+
+
+def do_rows(do, df: pd.DataFrame) -> pd.DataFrame:
+    """run a per event (dict) handler on every DataFrame row, return the results DataFrame"""
+    rows = [do(row) for row in df.to_dict(orient="records")]
+    rows = [row for row in rows if row is not None]
+    index = df.index if len(rows) == len(df) else None
+    return pd.DataFrame(rows, index=index)
+
+
 class FeaturesetValidator(MapClass):
     def __init__(self, featureset=None, columns=None, name=None, **kwargs):
         super().__init__(full_event=True, **kwargs)
@@ -44,7 +72,7 @@ class FeaturesetValidator(MapClass):
         }
 
 
-class MapValues(MapClass):
+class MapValues(MLRunStep):
     def __init__(
         self,
         mapping: Dict[str, Dict[str, Any]],
@@ -76,7 +104,7 @@ class MapValues(MapClass):
     def _feature_name(self, feature) -> str:
         return f"{feature}_{self.suffix}" if self.with_original_features else feature
 
-    def do(self, event):
+    def _do_storey(self, event):
         mapped_values = {
             self._feature_name(feature): self._map_value(feature, val)
             for feature, val in event.items()
@@ -88,6 +116,46 @@ class MapValues(MapClass):
 
         return mapped_values
 
+    def _map_column(self, feature: str, column: pd.Series) -> pd.Series:
+        feature_map = self.mapping.get(feature, {})
+        if not pd.api.types.is_numeric_dtype(column.dtype):
+            if column.dtype == object and not column.map(type).eq(str).all():
+                # mixed types, map value by value
+                return column.map(lambda value: self._map_value(feature, value))
+            string_map = {
+                key: value for key, value in feature_map.items() if key != "ranges"
+            }
+            return column.replace(string_map)
+
+        ranges = feature_map.get("ranges", [])
+        values = [feature_range["value"] for feature_range in ranges]
+        numeric_values = all(
+            pd.api.types.is_number(value) and not isinstance(value, bool)
+            for value in values
+        )
+        mapped = column.copy() if numeric_values else column.astype(object)
+        # the first matching range wins
+        unassigned = pd.Series(True, index=column.index)
+        for feature_range, value in zip(ranges, values):
+            low, high = feature_range["range"]
+            mask = unassigned & (column >= low) & (column < high)
+            mapped[mask] = value
+            unassigned &= ~mask
+        return mapped
+
+    def _do_pandas(self, event):
+        mapped = pd.DataFrame(
+            {
+                self._feature_name(feature): self._map_column(feature, event[feature])
+                for feature in event.columns
+                if feature in self.mapping
+            },
+            index=event.index,
+        )
+        if self.with_original_features:
+            return pd.concat([mapped, event], axis=1)
+        return mapped
+
     def to_dict(self):
         return {
             "class_name": this_path + ".MapValues",
@@ -100,7 +168,7 @@ class MapValues(MapClass):
         }
 
 
-class Imputer(MapClass):
+class Imputer(MLRunStep):
     def __init__(
         self,
         method: str = "avg",
@@ -118,12 +186,23 @@ class Imputer(MapClass):
             return self.mapping.get(feature, self.default_value)
         return value
 
-    def do(self, event):
+    def _do_storey(self, event):
         imputed_values = {
             feature: self._impute(feature, val) for feature, val in event.items()
         }
         return imputed_values
 
+    def _do_pandas(self, event):
+        mapping = self.mapping or {}
+        values = {
+            feature: mapping.get(feature, self.default_value)
+            for feature in event.columns
+        }
+        values = {
+            feature: value for feature, value in values.items() if value is not None
+        }
+        return event.fillna(value=values) if values else event
+
     def to_dict(self):
         return {
             "class_name": this_path + ".Imputer",
@@ -136,7 +215,7 @@ class Imputer(MapClass):
         }
 
 
-class OneHotEncoder(MapClass):
+class OneHotEncoder(MLRunStep):
     def __init__(self, mapping: Dict[str, Dict[str, Any]], **kwargs):
         super().__init__(**kwargs)
         self.mapping = mapping
@@ -154,12 +233,30 @@ class OneHotEncoder(MapClass):
 
         return {feature: value}
 
-    def do(self, event):
+    def _do_storey(self, event):
         encoded_values = {}
         for feature, val in event.items():
             encoded_values.update(self._encode(feature, val))
         return encoded_values
 
+    def _do_pandas(self, event):
+        columns = []
+        for feature in event.columns:
+            encoding = self.mapping.get(feature, [])
+            if not encoding:
+                columns.append(event[feature])
+                continue
+            values = pd.Categorical(event[feature], categories=encoding)
+            unknown = values.isna() & event[feature].notna().values
+            if unknown.any():
+                print(
+                    f"Warning, {unknown.sum()} {feature} values are not known by the encoding"
+                )
+            encoded = pd.get_dummies(values, prefix=feature).astype(int)
+            encoded.index = event.index
+            columns.append(encoded)
+        return pd.concat(columns, axis=1)
+
     def to_dict(self):
         return {
             "class_name": this_path + ".OneHotEncoder",
@@ -168,7 +265,11 @@ class OneHotEncoder(MapClass):
         }
 
 
-class DateExtractor(MapClass):
+# Timestamp attributes which have a different meaning (or do not exist) in the Series.dt accessor
+_timestamp_only_parts = ["asm8", "freqstr", "tz"]
+
+
+class DateExtractor(MLRunStep):
     """Date Extractor allows you to extract a date-time component
         from a timestamp feature to a new feature.
 
@@ -240,7 +341,7 @@ class DateExtractor(MapClass):
         timestamp_col = timestamp_col if timestamp_col else "timestamp"
         return f"{timestamp_col}_{part}"
 
-    def do(self, event):
+    def _do_storey(self, event):
         # Extract timestamp
         if self.timestamp_col is None:
             timestamp = event["timestamp"]
@@ -259,6 +360,31 @@ class DateExtractor(MapClass):
             event[self._get_key_name(part, self.timestamp_col)] = extracted_part
         return event
 
+    def _do_pandas(self, event):
+        timestamp_col = self.timestamp_col or "timestamp"
+        if timestamp_col in event.columns:
+            timestamps = event[timestamp_col]
+        elif timestamp_col in event.index.names:
+            timestamps = event.index.get_level_values(timestamp_col).to_series(
+                index=event.index
+            )
+        else:
+            raise ValueError(f"{self.timestamp_col} does not exist in the event")
+
+        timestamps = pd.to_datetime(timestamps)
+        event = event.copy()
+        for part in self.parts:
+            if part in ["week", "weekofyear"]:
+                extracted_part = timestamps.dt.isocalendar().week
+            elif part not in _timestamp_only_parts and hasattr(timestamps.dt, part):
+                extracted_part = getattr(timestamps.dt, part)
+            else:
+                extracted_part = timestamps.map(
+                    lambda timestamp: getattr(timestamp, part)
+                )
+            event[self._get_key_name(part, self.timestamp_col)] = extracted_part
+        return event
+
     def to_dict(self):
         return {
             "class_name": this_path + ".DateExtractor",
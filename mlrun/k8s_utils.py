@@ -16,6 +16,7 @@ import time
 from datetime import datetime
 from sys import stdout
 
+import urllib3
 from kubernetes import client, config
 from kubernetes.client.rest import ApiException
 
@@ -159,6 +160,40 @@ class K8sHelper:
 
         return resp
 
+    def stream_logs(
+        self,
+        name,
+        namespace=None,
+        since_seconds=None,
+        idle_timeout=None,
+        chunk_size=64 * 1024,
+    ):
+        """follow the pod log, yields the log bytes as they are written until the container terminates (or no
+        new bytes arrived for idle_timeout seconds)"""
+        kwargs = {}
+        if since_seconds:
+            kwargs["since_seconds"] = since_seconds
+        if idle_timeout:
+            kwargs["_request_timeout"] = (10, idle_timeout)
+        try:
+            resp = self.v1api.read_namespaced_pod_log(
+                name=name,
+                namespace=self.resolve_namespace(namespace),
+                follow=True,
+                _preload_content=False,
+                **kwargs,
+            )
+        except ApiException as exc:
+            logger.error(f"failed to get pod logs: {exc}")
+            raise exc
+
+        try:
+            yield from resp.stream(chunk_size)
+        except urllib3.exceptions.ReadTimeoutError:
+            pass
+        finally:
+            resp.release_conn()
+
     def run_job(self, pod, timeout=600):
         pod_name, namespace = self.create_pod(pod)
         if not pod_name:
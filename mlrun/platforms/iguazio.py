@@ -11,8 +11,12 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import atexit
 import json
 import os
+import queue
+import threading
+import time
 import warnings
 from collections import namedtuple
 from datetime import datetime
@@ -25,6 +29,7 @@ import v3io
 
 import mlrun.errors
 from mlrun.config import config as mlconf
+from mlrun.utils import logger
 
 _cached_control_session = None
 
@@ -363,6 +368,12 @@ def v3io_to_vol(name, remote="~/", access_key="", user="", secret=None):
 
 
 class OutputStream:
+    """v3io stream pusher
+
+    with background=True the records are queued and pushed (in batches) by a background thread, so the push
+    does not wait for the stream, see _BackgroundPusher and config.model_endpoint_monitoring.stream_pusher
+    """
+
     def __init__(
         self,
         stream_path,
@@ -370,6 +381,11 @@ class OutputStream:
         retention_in_hours=None,
         create=True,
         endpoint=None,
+        background=False,
+        queue_size=None,
+        batch_size=None,
+        flush_interval=None,
+        when_full=None,
     ):
         self._v3io_client = v3io.dataplane.Client(endpoint=endpoint)
         self._container, self._stream_path = split_path(stream_path)
@@ -386,15 +402,192 @@ class OutputStream:
             ):
                 response.raise_for_status([409, 204])
 
+        self._pusher = None
+        if background:
+            self._pusher = _BackgroundPusher(
+                self._put_records,
+                queue_size=queue_size,
+                batch_size=batch_size,
+                flush_interval=flush_interval,
+                when_full=when_full,
+                name=stream_path,
+            )
+
     def push(self, data):
         if not isinstance(data, list):
             data = [data]
+        if self._pusher:
+            self._pusher.push(data)
+        else:
+            self._put_records(data)
+
+    def flush(self):
+        """wait for the queued records to be pushed (when pushing in the background)"""
+        if self._pusher:
+            self._pusher.flush()
+
+    def _put_records(self, data):
         records = [{"data": json.dumps(rec)} for rec in data]
         self._v3io_client.put_records(
             container=self._container, path=self._stream_path, records=records
         )
 
 
+class _BackgroundPusher:
+    """push records from a background thread, the records are queued (in a bounded queue) and sent in batches
+    of up to batch_size records, a partial batch is sent flush_interval seconds after its first record.
+    when the queue is full new records are dropped (when_full="drop") or the push waits for free space
+    (when_full="block"), the queued records are pushed on exit"""
+
+    def __init__(
+        self,
+        put_records,
+        queue_size=None,
+        batch_size=None,
+        flush_interval=None,
+        when_full=None,
+        name="",
+    ):
+        pusher_config = mlconf.model_endpoint_monitoring.stream_pusher
+        self._put_records = put_records
+        self._batch_size = int(batch_size or pusher_config.batch_size)
+        self._flush_interval = float(flush_interval or pusher_config.flush_interval)
+        self._when_full = when_full or pusher_config.when_full
+        if self._when_full not in ["drop", "block"]:
+            raise mlrun.errors.MLRunInvalidArgumentError(
+                f"illegal when_full policy {self._when_full}, must be drop or block"
+            )
+        self._name = name
+        self._queue = queue.Queue(maxsize=int(queue_size or pusher_config.queue_size))
+        self.pushed = 0
+        self.dropped = 0
+        self.failed = 0
+        # set on close, the background thread stops when the queue is drained
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"stream-pusher-{name}", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def stats(self) -> dict:
+        """the pushed/dropped/failed records counters"""
+        return {"pushed": self.pushed, "dropped": self.dropped, "failed": self.failed}
+
+    def push(self, records):
+        if self._stop.is_set():
+            # on exit, push directly
+            self._send(list(records))
+            return
+        for record in records:
+            if self._when_full == "block":
+                if not self._put(_QueueItem(record)):
+                    # closed while waiting for free space
+                    self._send([record])
+                continue
+            try:
+                self._queue.put_nowait(_QueueItem(record))
+            except queue.Full:
+                self.dropped += 1
+                if self.dropped % 1000 == 1:
+                    logger.warning(
+                        "Stream pusher queue is full, dropping records",
+                        stream=self._name,
+                        dropped=self.dropped,
+                    )
+
+    def flush(self, timeout=None):
+        """wait for the records which were queued so far to be pushed"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        flushed = threading.Event()
+        if self._put(_QueueItem(flushed=flushed), timeout):
+            flushed.wait(
+                None if deadline is None else max(deadline - time.monotonic(), 0)
+            )
+
+    def close(self, timeout=10):
+        """push the queued records and stop the background thread"""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        try:
+            # wake the background thread, when the queue is full it checks the stop event once it is drained
+            self._queue.put_nowait(_QueueItem())
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+    def _put(self, item, timeout=None) -> bool:
+        """queue the item, wait up to timeout seconds for free space, return False on a timeout or when closed"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._stop.is_set():
+            wait = _put_poll_interval
+            if deadline is not None:
+                wait = min(wait, max(deadline - time.monotonic(), 0))
+            try:
+                self._queue.put(item, timeout=wait)
+                return True
+            except queue.Full:
+                if deadline is not None and time.monotonic() >= deadline:
+                    return False
+        return False
+
+    def _run(self):
+        batch = []
+        deadline = None
+        while True:
+            timeout = max(deadline - time.monotonic(), 0) if batch else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                # the flush interval of the batch passed
+                batch = self._send(batch)
+                continue
+
+            if item.record is not None:
+                if not batch:
+                    deadline = time.monotonic() + self._flush_interval
+                batch.append(item.record)
+                if len(batch) >= self._batch_size:
+                    batch = self._send(batch)
+            else:
+                batch = self._send(batch)
+                if item.flushed is not None:
+                    item.flushed.set()
+
+            if self._stop.is_set() and self._queue.empty():
+                # closed, the queued records were pushed
+                self._send(batch)
+                return
+
+    def _send(self, batch):
+        if batch:
+            try:
+                self._put_records(batch)
+                self.pushed += len(batch)
+            except Exception as exc:
+                self.failed += len(batch)
+                logger.warning(
+                    "Failed to push records to the stream",
+                    stream=self._name,
+                    records=len(batch),
+                    exc=exc,
+                )
+        return []
+
+
+# the interval in which a queue put which waits for free space checks whether the pusher was closed
+_put_poll_interval = 1
+
+
+class _QueueItem:
+    """a record, or a flush (flushed event) or close (no record and event) request"""
+
+    def __init__(self, record=None, flushed=None):
+        self.record = record
+        self.flushed = flushed
+
+
 class V3ioStreamClient:
     def __init__(self, url: str, shard_id: int = 0, seek_to: str = None, **kwargs):
         endpoint, stream_path = parse_v3io_path(url)
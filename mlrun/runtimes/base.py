@@ -14,6 +14,7 @@
 
 import getpass
 import shlex
+import time
 import traceback
 import uuid
 from abc import ABC, abstractmethod
@@ -929,6 +930,10 @@ def is_local(url):
 class BaseRuntimeHandler(ABC):
     # setting here to allow tests to override
     wait_for_deletion_interval = 10
+    # the max number of uids to query in a single list runs call when monitoring
+    monitoring_runs_query_batch_size = 500
+    # counts and durations (seconds) of the last monitoring cycle
+    monitoring_cycle_metrics: Optional[Dict] = None
 
     @staticmethod
     @abstractmethod
@@ -1034,6 +1039,7 @@ class BaseRuntimeHandler(ABC):
     def monitor_runs(
         self, db: DBInterface, db_session: Session, leader_session: Optional[str] = None
     ):
+        cycle_start = time.monotonic()
         k8s_helper = get_k8s_helper()
         namespace = k8s_helper.resolve_namespace()
         label_selector = self._get_default_label_selector()
@@ -1044,7 +1050,11 @@ class BaseRuntimeHandler(ABC):
             runtime_resources = self._list_crd_objects(namespace, label_selector)
         else:
             runtime_resources = self._list_pods(namespace, label_selector)
-        project_run_uid_map = self._list_runs_for_monitoring(db, db_session)
+        runtime_resources_listed = time.monotonic()
+        project_run_uid_map = self._list_runs_for_monitoring(
+            db, db_session, runtime_resources
+        )
+        runs_listed = time.monotonic()
         for runtime_resource in runtime_resources:
             try:
                 self._monitor_runtime_resource(
@@ -1063,6 +1073,21 @@ class BaseRuntimeHandler(ABC):
                     namespace=namespace,
                     exc=str(exc),
                 )
+        monitored = time.monotonic()
+
+        self.monitoring_cycle_metrics = {
+            "runtime_resources": len(runtime_resources),
+            "runs": sum(len(runs) for runs in project_run_uid_map.values()),
+            "list_runtime_resources_duration": runtime_resources_listed - cycle_start,
+            "list_runs_duration": runs_listed - runtime_resources_listed,
+            "monitor_duration": monitored - runs_listed,
+            "total_duration": monitored - cycle_start,
+        }
+        logger.debug(
+            "Finished runs monitoring cycle",
+            handler=self.__class__.__name__,
+            **self.monitoring_cycle_metrics,
+        )
 
     def _enrich_list_resources_response(
         self,
@@ -1514,9 +1539,32 @@ class BaseRuntimeHandler(ABC):
         return True, last_update
 
     def _list_runs_for_monitoring(
-        self, db: DBInterface, db_session: Session,
+        self, db: DBInterface, db_session: Session, runtime_resources: List = None,
     ):
-        runs = db.list_runs(db_session, project="*")
+        """
+        List the runs to monitor, when the runtime resources are given only the runs of these resources are loaded
+        (queried by uid, in batches) instead of all the runs
+        """
+        if runtime_resources is None:
+            runs = db.list_runs(db_session, project="*")
+        else:
+            uids = set()
+            for runtime_resource in runtime_resources:
+                _, uid = self._resolve_runtime_resource_run(runtime_resource)
+                if uid:
+                    uids.add(uid)
+            uids = sorted(uids)
+            runs = []
+            batch_size = self.monitoring_runs_query_batch_size
+            for start in range(0, len(uids), batch_size):
+                runs.extend(
+                    db.list_runs(
+                        db_session,
+                        project="*",
+                        uid=uids[start : start + batch_size],
+                        sort=False,
+                    )
+                )
         project_run_uid_map = {}
         run_with_missing_data = []
         duplicated_runs = []
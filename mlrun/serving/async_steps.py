@@ -0,0 +1,33 @@
+# Copyright 2018 Iguazio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from storey.flow import _ConcurrentJobExecution
+
+
+class AsyncHandlerStep(_ConcurrentJobExecution):
+    """async (storey) step of a class with an awaitable event handler (do_event_async)
+
+    unlike storey.Map, which awaits one event at a time, up to max_in_flight events are
+    handled concurrently (e.g. so the model server micro-batcher can group them), the
+    events are passed downstream in their original order
+    """
+
+    def __init__(self, handler, max_in_flight=8, **kwargs):
+        super().__init__(max_in_flight=max_in_flight, full_event=True, **kwargs)
+        self._handler = handler
+
+    async def _process_event(self, event):
+        return await self._handler(event)
+
+    async def _handle_completed(self, event, response):
+        await self._do_downstream(response)
@@ -0,0 +1,71 @@
+# Copyright 2018 Iguazio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+
+import aiohttp
+import storey
+
+from .states import RemoteHttpHandler, retry_statuses
+
+
+class AsyncRemoteHttpStep(storey.SendToHttp):
+    """async (storey) variant of the RemoteHttpHandler
+
+    up to max_in_flight events are sent concurrently to the remote endpoint (responses
+    are passed downstream in the events order), the requests share a keep-alive
+    connection pool limited to pool_size connections per host
+    """
+
+    def __init__(self, handler: RemoteHttpHandler, **kwargs):
+        super().__init__(None, None, max_in_flight=handler.max_in_flight, **kwargs)
+        self._handler = handler
+
+    async def _lazy_init(self):
+        connector = aiohttp.TCPConnector(
+            limit_per_host=self._handler.pool_size, ssl=False
+        )
+        timeout = aiohttp.ClientTimeout(total=self._handler.timeout)
+        self._client_session = aiohttp.ClientSession(
+            connector=connector, timeout=timeout
+        )
+
+    async def _cleanup(self):
+        if self._client_session:
+            await self._client_session.close()
+
+    async def _process_event(self, event):
+        method, url, kwargs = self._handler.build_request(event)
+        for attempt in range(self._handler.retries + 1):
+            last_attempt = attempt == self._handler.retries
+            try:
+                async with self._client_session.request(method, url, **kwargs) as resp:
+                    data = await resp.read()
+                    if resp.status in retry_statuses and not last_attempt:
+                        await asyncio.sleep(2 ** attempt)
+                        continue
+                    if resp.status >= 400:
+                        raise RuntimeError(
+                            f"bad function response {data.decode(errors='replace')}"
+                        )
+                    return self._handler.parse_response(
+                        resp.headers.get("content-type", ""), data
+                    )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                if last_attempt:
+                    raise OSError(f"error: cannot run function at url {url}, {err}")
+                await asyncio.sleep(2 ** attempt)
+
+    async def _handle_completed(self, event, response):
+        event.body = response
+        await self._do_downstream(event)
@@ -12,9 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import concurrent
+import asyncio
+import concurrent.futures
 import copy
+import functools
 import json
+import threading
+import weakref
+from collections import Counter
 from enum import Enum
 from io import BytesIO
 
@@ -172,12 +177,44 @@ class ModelRouter(BaseModelRouter):
         event.body = response.body if response else None
         return event
 
+    @property
+    def max_in_flight(self):
+        """the number of events the async flow step handles concurrently, the largest of the models"""
+        if type(self)._handle_event is not ModelRouter._handle_event:
+            return None
+        routes_in_flight = [
+            getattr(route.async_object, "max_in_flight", None)
+            for route in self.routes.values()
+        ]
+        return max([value for value in routes_in_flight if value], default=None)
+
+    async def do_event_async(self, event, *args, **kwargs):
+        """handle incoming events in async flows, awaits the models which support it"""
+
+        if type(self)._handle_event is not ModelRouter._handle_event:
+            # subclasses with their own event handling
+            return self.do_event(event, *args, **kwargs)
+        event = self.preprocess(event)
+        event = self._pre_handle_event(event)
+        if hasattr(event, "terminated") and event.terminated:
+            return event
+        name, route, subpath = self._resolve_route(event.body, event.path)
+        if not route:
+            return self.postprocess(self._handle_event(event))
+
+        self.context.logger.debug(f"router run model {name}, op={subpath}")
+        event.path = subpath
+        response = await route.run_async(event)
+        event.body = response.body if response else None
+        return self.postprocess(event)
+
 
 class ParallelRunnerModes(str, Enum):
     """Supported parallel running modes for VotingEnsemble"""
 
     array = "array"
     thread = "thread"
+    asyncio = "asyncio"
 
 
 class VotingTypes(str, Enum):
@@ -207,6 +244,9 @@ class VotingEnsemble(BaseModelRouter):
         vote_type=None,
         executor_type=None,
         prediction_col_name=None,
+        route_timeout=None,
+        quorum=None,
+        max_concurrent_requests=None,
         **kwargs,
     ):
         """Voting Ensemble
@@ -287,12 +327,28 @@ class VotingEnsemble(BaseModelRouter):
                 - int prediction type: classification
         executor_type : str, optional
             Parallelism mechanism, out of `ParallelRunnerModes`, by default `threads`
+            - thread: run the models on a long-lived thread pool (created in `post_init`)
+            - asyncio: same as thread, models which return coroutines (async `do_event`)
+              are awaited on a long-lived event loop
+            - array: run the models one after the other
         prediction_col_name: str, optional
             The dict key for the predictions column in the model's responses output.
             Example: If the model returns
                     {id: <id>, model_name: <name>, outputs: {..., prediction: [<predictions>], ...}}
                     the prediction_col_name should be `prediction`.
             by default, `prediction`
+        route_timeout : float, optional
+            Max time (in seconds) to wait for the models responses, models which didnt
+            respond in time are ignored in the vote. by default wait for all models
+        quorum : int, optional
+            Min number of model responses needed for the vote, the vote is applied as soon
+            as `quorum` models responded (without waiting for the slower models).
+            by default wait for all models
+        max_concurrent_requests : int, optional
+            Max number of concurrent ensemble requests, the thread pool has a worker per model
+            for each of them. with `route_timeout`/`quorum`, a model which has that many calls
+            in flight (e.g. a stuck model) is skipped instead of queuing more calls to it.
+            by default 4
         """
         super().__init__(
             context, name, routes, protocol, url_prefix, health_prefix, **kwargs
@@ -300,7 +356,15 @@ class VotingEnsemble(BaseModelRouter):
         self.name = name or "VotingEnsemble"
         self.vote_type = vote_type
         self.vote_flag = True if self.vote_type is not None else False
-        self.executor_type = executor_type
+        self.executor_type = executor_type or ParallelRunnerModes.thread
+        self.route_timeout = route_timeout
+        self.quorum = quorum
+        self.max_concurrent_requests = max_concurrent_requests or 4
+        self._pool = None
+        self._loop = None
+        self._finalizer = None
+        self._in_flight = Counter()
+        self._in_flight_lock = threading.Lock()
         self._model_logger = (
             _ModelLogPusher(self, context) if context.stream.enabled else None
         )
@@ -309,6 +373,39 @@ class VotingEnsemble(BaseModelRouter):
         self.prediction_col_name = prediction_col_name or "prediction"
         self.format_response_with_col_name_flag = False
 
+    def post_init(self, mode="sync"):
+        super().post_init(mode)
+        self._init_executor(self.executor_type)
+
+    def _init_executor(self, mode):
+        """create the long-lived pool (and loop) used for running the models in parallel"""
+        if mode not in [ParallelRunnerModes.thread, ParallelRunnerModes.asyncio]:
+            return
+        if self._pool and (mode == ParallelRunnerModes.thread or self._loop):
+            return
+        if not self._pool:
+            self._pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=len(self.routes) * self.max_concurrent_requests
+            )
+        if mode == ParallelRunnerModes.asyncio and not self._loop:
+            # a dedicated loop (thread), the sync do_event cannot block on the flow loop
+            self._loop = asyncio.new_event_loop()
+            threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        # shutdown the pool/loop when the router is released (or at exit)
+        if self._finalizer:
+            self._finalizer.detach()
+        self._finalizer = weakref.finalize(
+            self, _shutdown_executor, self._pool, self._loop
+        )
+
+    def close(self):
+        """shutdown the models pool/loop (they are re-created on the next request)"""
+        if self._finalizer:
+            self._finalizer()
+        self._finalizer = None
+        self._pool = None
+        self._loop = None
+
     def _resolve_route(self, body, urlpath):
         """Resolves the appropriate model to send the event to.
         Supports:
@@ -520,7 +617,11 @@ class VotingEnsemble(BaseModelRouter):
 
             # If this is a Router Operation
             if name == self.name:
-                predictions = self._parallel_run(event)
+                responses = self._parallel_run(event)
+                predictions = [
+                    self.extract_results_from_response(response.body["outputs"])
+                    for response in responses.values()
+                ]
                 votes = self._apply_logic(predictions)
                 # Format the prediction response like the regular
                 # model's responses
@@ -574,44 +675,127 @@ class VotingEnsemble(BaseModelRouter):
                 f"in the model's response ({response.keys()})"
             )
 
-    def _parallel_run(self, event, mode: str = ParallelRunnerModes.thread):
+    def _parallel_run(self, event, mode: str = None):
         """Executes the processing logic in parallel
 
         Args:
             event (nuclio.Event): Incoming event after router preprocessing
-            mode (str, optional): Parallel processing method. Defaults to "thread".
+            mode (str, optional): Parallel processing method. Defaults to `executor_type`.
 
         Returns:
-            dict[str, nuclio.Event]: {model_name: model_response} for selected all models the registry
+            dict[str, nuclio.Event]: {model_name: model_response} of the models which responded
         """
+        mode = mode or self.executor_type
         if mode == ParallelRunnerModes.array:
             results = {
                 model_name: model.run(copy.copy(event))
                 for model_name, model in self.routes.items()
             }
-        elif mode == ParallelRunnerModes.thread:
-            pool = concurrent.futures.ThreadPoolExecutor(max_workers=len(self.routes))
-            with pool as executor:
-                results = []
-                futures = [
-                    executor.submit(self.routes[model].run, copy.copy(event))
-                    for model in self.routes.keys()
-                ]
-                for future in concurrent.futures.as_completed(futures):
-                    try:
-                        results.append(future.result())
-                    except Exception as exc:
-                        print(f"child route generated an exception: {exc}")
-                results = [
-                    self.extract_results_from_response(event.body["outputs"])
-                    for event in results
-                ]
-                self.context.logger.debug(f"Collected results from models: {results}")
+        elif mode in [ParallelRunnerModes.thread, ParallelRunnerModes.asyncio]:
+            self._init_executor(mode)
+            futures = {}
+            for model_name, route in self.routes.items():
+                if not self._start_route(model_name):
+                    continue
+                if mode == ParallelRunnerModes.asyncio and _is_async_route(route):
+                    # async models are awaited on the loop, without holding a pool thread
+                    future = asyncio.run_coroutine_threadsafe(
+                        self._run_route_async(route, copy.copy(event)), self._loop
+                    )
+                else:
+                    future = self._pool.submit(
+                        self._run_route, model_name, route, copy.copy(event)
+                    )
+                # the call is in flight until it is done (or cancelled)
+                future.add_done_callback(functools.partial(self._end_route, model_name))
+                futures[model_name] = future
+            results = self._collect_results(futures)
         else:
             raise ValueError(
                 f"{mode} is not a supported parallel run mode, please select from "
                 f"{[mode.value for mode in list(ParallelRunnerModes)]}"
             )
+
+        self.context.logger.debug(
+            f"Collected results from models: {list(results.keys())}"
+        )
+        return results
+
+    def _start_route(self, model_name):
+        """count a call in flight to the model, return False if the model is saturated
+
+        only when we dont wait for all the models (timeout/quorum), otherwise calls to a
+        stuck model would pile up in the pool and delay the other models calls
+        """
+        with self._in_flight_lock:
+            in_flight = self._in_flight[model_name]
+            if (
+                self.route_timeout or self.quorum
+            ) and in_flight >= self.max_concurrent_requests:
+                self.context.logger.warning(
+                    f"model {model_name} has {in_flight} calls in flight, skipping it"
+                )
+                return False
+            self._in_flight[model_name] += 1
+            return True
+
+    def _end_route(self, model_name, future=None):
+        with self._in_flight_lock:
+            self._in_flight[model_name] -= 1
+
+    @staticmethod
+    def _run_route(model_name, route, event):
+        """run the (sync) model in the pool"""
+        response = route.run(event)
+        if asyncio.iscoroutine(response):
+            response.close()
+            raise mlrun.errors.MLRunInvalidArgumentError(
+                f"model {model_name} is async, use executor_type=asyncio"
+            )
+        return response
+
+    @staticmethod
+    async def _run_route_async(route, event):
+        """run the async model on the loop"""
+        if not asyncio.iscoroutinefunction(route._handler):
+            return await route.run_async(event)
+        response = route.run(event)
+        if asyncio.iscoroutine(response):
+            response = await response
+        return response
+
+    def _collect_results(self, futures):
+        """wait for the model responses, until all/quorum responded or the timeout expired"""
+        quorum = self.quorum or len(futures)
+        names = {future: model_name for model_name, future in futures.items()}
+        results = {}
+        try:
+            for future in concurrent.futures.as_completed(
+                names.keys(), timeout=self.route_timeout
+            ):
+                try:
+                    results[names[future]] = future.result()
+                except Exception as exc:
+                    self.context.logger.warning(
+                        f"child route generated an exception: {exc}"
+                    )
+                if len(results) >= quorum:
+                    break
+        except concurrent.futures.TimeoutError:
+            self.context.logger.warning(
+                f"only {len(results)} out of {len(futures)} models responded "
+                f"within {self.route_timeout} seconds"
+            )
+
+        # dont keep the workers busy with responses we dont wait for
+        for future in futures.values():
+            future.cancel()
+
+        if not results or (self.quorum and len(results) < self.quorum):
+            raise mlrun.errors.MLRunRuntimeError(
+                f"not enough model responses for the vote, got {len(results)} "
+                f"out of {len(futures)} (quorum={self.quorum})"
+            )
         return results
 
     def validate(self, request):
@@ -641,3 +825,19 @@ class VotingEnsemble(BaseModelRouter):
             if not isinstance(request["inputs"], list):
                 raise Exception('Expected "inputs" to be a list')
         return request
+
+
+def _is_async_route(route):
+    """the route model has an async handler, or awaits concurrent events (e.g. micro-batching models)"""
+    if asyncio.iscoroutinefunction(getattr(route, "_handler", None)):
+        return True
+    return bool(
+        getattr(route, "_async_handler", None)
+        and getattr(route.async_object, "max_in_flight", None)
+    )
+
+
+def _shutdown_executor(pool, loop):
+    pool.shutdown(wait=False)
+    if loop:
+        loop.call_soon_threadsafe(loop.stop)
@@ -59,6 +59,9 @@ class _StreamContext:
                 stream_uri = log_stream.format(project=project)
 
             stream_args = parameters.get("stream_args", {})
+            if config.model_endpoint_monitoring.stream_pusher.mode == "background":
+                # the serving requests do not wait for the stream
+                stream_args = {"background": True, **stream_args}
 
             self.stream_uri = stream_uri
 
@@ -257,6 +260,9 @@ class GraphServer(ModelObj):
     def wait_for_completion(self):
         """wait for async operation to complete"""
         self.graph.wait_for_completion()
+        output_stream = self.context.stream.output_stream if self.context else None
+        if output_stream and hasattr(output_stream, "flush"):
+            output_stream.flush()
 
 
 def v2_serving_init(context, namespace=None):
@@ -300,6 +300,7 @@ class TaskStep(BaseStep):
         self.handler = handler
         self.function = function
         self._handler = None
+        self._async_handler = None
         self._object = None
         self._async_object = None
         self.skip_context = None
@@ -380,6 +381,12 @@ class TaskStep(BaseStep):
                     self.full_event = True
             if handler:
                 self._handler = getattr(self._object, handler, None)
+            # classes can provide an awaitable handler for async flows
+            self._async_handler = (
+                getattr(self._object, "do_event_async", None)
+                if handler == "do_event"
+                else None
+            )
 
         self._set_error_handler()
         if mode != "skip":
@@ -445,6 +452,21 @@ class TaskStep(BaseStep):
             event.terminated = True
         return event
 
+    async def run_async(self, event, *args, **kwargs):
+        """run this step in an async flow, await the class async handler (if it has one)"""
+        if not self._async_handler:
+            return self.run(event, *args, **kwargs)
+
+        try:
+            return await self._async_handler(event, *args, **kwargs)
+        except Exception as exc:
+            self._log_error(event, exc)
+            handled = self._call_error_handler(event, exc)
+            if not handled:
+                raise exc
+            event.terminated = True
+        return event
+
 
 class RouterStep(TaskStep):
     """router step, implement routing logic for running child routes"""
@@ -984,12 +1006,29 @@ class FlowStep(BaseStep):
                     else:
                         step._async_object = storey.Map(lambda x: x)
 
+                elif isinstance(step._object, RemoteHttpHandler):
+                    # remote steps use an async http client in async flows
+                    step._async_object = step._object.to_async_step(
+                        name=step.name, context=self.context
+                    )
+                elif step._async_handler and getattr(
+                    step._object, "max_in_flight", None
+                ):
+                    # classes which handle concurrent events (e.g. micro-batching models)
+                    from .async_steps import AsyncHandlerStep
+
+                    step._async_object = AsyncHandlerStep(
+                        step._async_handler,
+                        max_in_flight=step._object.max_in_flight,
+                        name=step.name,
+                        context=self.context,
+                    )
                 elif not step.async_object or not hasattr(
                     step.async_object, "_outlets"
                 ):
                     # if regular class, wrap with storey Map
                     step._async_object = storey.Map(
-                        step._handler,
+                        step._async_handler or step._handler,
                         full_event=step.full_event,
                         name=step.name,
                         context=self.context,
@@ -1067,6 +1106,9 @@ class FlowStep(BaseStep):
             event.body = {"id": event.id}
             return event
 
+        if not self._start_steps:
+            # empty graph, e.g. a feature set without transformations
+            return event
         next_obj = self._start_steps[0]
         while next_obj:
             try:
@@ -1123,22 +1165,59 @@ class RootFlowStep(FlowStep):
         )
 
 
+retry_statuses = [500, 502, 503, 504]
 http_adapter = HTTPAdapter(
-    max_retries=Retry(total=3, backoff_factor=1, status_forcelist=[500, 502, 503, 504])
+    max_retries=Retry(total=3, backoff_factor=1, status_forcelist=retry_statuses)
 )
 
 
 class RemoteHttpHandler:
-    """class for calling remote endpoints"""
+    """class for calling remote endpoints
+
+    in async (storey) flows the step is replaced with an async (aiohttp) variant which
+    sends concurrent events to the remote endpoint over a keep-alive connection pool
+
+    :param url:           remote endpoint url
+    :param timeout:       per request timeout in seconds
+    :param max_in_flight: max number of concurrent requests (async flows)
+    :param pool_size:     max number of open connections per host (async flows)
+    :param retries:       number of retries on connection errors and 5xx responses
+    """
 
-    def __init__(self, url):
+    def __init__(
+        self,
+        url,
+        timeout: float = None,
+        max_in_flight: int = 8,
+        pool_size: int = 8,
+        retries: int = 3,
+    ):
         self.url = url
         self.format = "json"
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+        self.pool_size = pool_size
+        self.retries = retries
         self._session = requests.Session()
-        self._session.mount("http://", http_adapter)
-        self._session.mount("https://", http_adapter)
+        if retries == http_adapter.max_retries.total:
+            adapter = http_adapter
+        else:
+            adapter = HTTPAdapter(
+                max_retries=Retry(
+                    total=retries, backoff_factor=1, status_forcelist=retry_statuses
+                )
+            )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
 
-    def do_event(self, event):
+    def to_async_step(self, **kwargs):
+        """return the async (storey) step variant of this handler"""
+        from .remote import AsyncRemoteHttpStep
+
+        return AsyncRemoteHttpStep(self, **kwargs)
+
+    def build_request(self, event):
+        """return the method, url and request kwargs for the event"""
         kwargs = {}
         kwargs["headers"] = event.headers or {}
         method = event.method or "POST"
@@ -1149,21 +1228,30 @@ class RemoteHttpHandler:
                 kwargs["json"] = event.body
 
         url = self.url.strip("/") + event.path
-        try:
-            resp = self._session.request(method, url, verify=False, **kwargs)
-        except OSError as err:
-            raise OSError(f"error: cannot run function at url {url}, {err}")
-        if not resp.ok:
-            raise RuntimeError(f"bad function response {resp.text}")
+        return method, url, kwargs
 
-        data = resp.content
+    def parse_response(self, content_type, data):
+        """parse the response body"""
         if (
             self.format == "json"
-            or resp.headers["content-type"] == "application/json"
+            or content_type == "application/json"
             and isinstance(data, (str, bytes))
         ):
             data = json.loads(data)
-        event.body = data
+        return data
+
+    def do_event(self, event):
+        method, url, kwargs = self.build_request(event)
+        try:
+            resp = self._session.request(
+                method, url, verify=False, timeout=self.timeout, **kwargs
+            )
+        except OSError as err:
+            raise OSError(f"error: cannot run function at url {url}, {err}")
+        if not resp.ok:
+            raise RuntimeError(f"bad function response {resp.text}")
+
+        event.body = self.parse_response(resp.headers["content-type"], resp.content)
         return event
 
 
@@ -11,9 +11,12 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import asyncio
+import queue
 import threading
 import time
 import traceback
+from concurrent.futures import Future
 from typing import Dict, Optional
 
 import mlrun
@@ -42,6 +45,14 @@ class V2ModelServer:
     you can add custom api endpoint by adding method op_xx(event), will be invoked by
     calling the <model-url>/xx (operation = xx)
 
+    concurrent predict/infer requests can be grouped into a single predict() call
+    (micro-batching) by setting the max_batch_size (> 1) and max_wait_ms class args or
+    function params, the request inputs are stacked and the outputs are split back to the
+    requests (predict() must return a list of outputs, one per input). in async flows up to
+    max_in_flight (default 2 * max_batch_size) events are handled concurrently and batched,
+    in sync flows requests are batched only when the server is called from multiple threads
+    (a single nuclio worker handles one request at a time, so its requests are not batched)
+
     Example
     -------
     defining a class::
@@ -86,6 +97,9 @@ class V2ModelServer:
 
         self.metrics = {}
         self.labels = {}
+        self._batcher = None
+        # the number of events the async flow step handles concurrently (when batching)
+        self.max_in_flight = None
         if model:
             self.model = model
             self.ready = True
@@ -110,6 +124,15 @@ class V2ModelServer:
             else:
                 self._load_and_update_state()
 
+        max_batch_size = int(self.get_param("max_batch_size", 1))
+        if max_batch_size > 1 and not self._batcher:
+            self._batcher = _PredictBatcher(
+                self, max_batch_size, float(self.get_param("max_wait_ms", 10))
+            )
+            self.max_in_flight = int(
+                self.get_param("max_in_flight", 2 * max_batch_size)
+            )
+
         _init_endpoint_record(self.context, self._model_logger)
 
     def get_param(self, key: str, default=None):
@@ -194,7 +217,10 @@ class V2ModelServer:
             # predict operation
             request = self._pre_event_processing_actions(event, op)
             try:
-                outputs = self.predict(request)
+                if self._batcher:
+                    outputs = self._batcher.predict(request)
+                else:
+                    outputs = self.predict(request)
             except Exception as exc:
                 if self._model_logger:
                     self._model_logger.push(start, request, op=op, error=exc)
@@ -260,6 +286,34 @@ class V2ModelServer:
         else:
             raise ValueError(f"illegal model operation {op}, method={event.method}")
 
+        return self._respond(event, start, request, response, op)
+
+    async def do_event_async(self, event, *args, **kwargs):
+        """model event handler for async flows, micro-batched predictions are awaited
+        (without blocking the flow event loop), other operations are handled by do_event"""
+        op = event.path.strip("/")
+        if not self._batcher or op not in ["predict", "infer"]:
+            return self.do_event(event, *args, **kwargs)
+
+        start = now_date()
+        request = self._pre_event_processing_actions(event, op)
+        try:
+            outputs = await self._batcher.predict_async(request)
+        except Exception as exc:
+            if self._model_logger:
+                self._model_logger.push(start, request, op=op, error=exc)
+            raise exc
+
+        response = {
+            "id": request["id"],
+            "model_name": self.name,
+            "outputs": outputs,
+        }
+        if self.version:
+            response["model_version"] = self.version
+        return self._respond(event, start, request, response, op)
+
+    def _respond(self, event, start, request, response, op):
         response = self.postprocess(response)
         if self._model_logger:
             self._model_logger.push(start, request, response, op)
@@ -294,6 +348,125 @@ class V2ModelServer:
         raise NotImplementedError()
 
 
+class _PredictBatcher:
+    """group concurrent predict requests into a single model predict() call
+
+    requests are queued and a worker thread collects up to max_batch_size inputs (or
+    until max_wait_ms passed since the first request), stacks their inputs into one
+    request, calls predict() and splits the outputs back to the waiting requests.
+    only requests with the same fields (other than the inputs and id) are batched together
+    """
+
+    def __init__(self, model, max_batch_size, max_wait_ms):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._pending = None  # a request which didnt fit in the previous batch
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def predict(self, request):
+        """submit a request and wait for its outputs"""
+        return self._submit(request).result()
+
+    async def predict_async(self, request):
+        """submit a request and await its outputs (without blocking the event loop)"""
+        return await asyncio.wrap_future(self._submit(request))
+
+    def _submit(self, request):
+        future = Future()
+        self._queue.put((request, future))
+        return future
+
+    def _collect(self):
+        batch = []
+        size = 0
+        fields = None
+        deadline = None
+        while size < self.max_batch_size:
+            if self._pending:
+                item, self._pending = self._pending, None
+            else:
+                timeout = None if deadline is None else deadline - time.monotonic()
+                if timeout is not None and timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+
+            request, future = item
+            try:
+                item_size = len(request["inputs"])
+                item_fields = _batch_fields(request)
+            except Exception as exc:
+                # fail only the bad request
+                future.set_exception(exc)
+                continue
+
+            if batch and (
+                size + item_size > self.max_batch_size
+                or not _same_fields(fields, item_fields)
+            ):
+                # start the next batch with it
+                self._pending = item
+                break
+            if not batch:
+                fields = item_fields
+                deadline = time.monotonic() + self.max_wait
+            batch.append(item)
+            size += item_size
+        return batch
+
+    def _run(self):
+        while True:
+            batch = []
+            try:
+                batch = self._collect()
+                self._predict_batch(batch)
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+
+    def _predict_batch(self, batch):
+        if len(batch) == 1:
+            request, future = batch[0]
+            future.set_result(self.model.predict(request))
+            return
+
+        inputs = []
+        for request, _ in batch:
+            inputs.extend(request["inputs"])
+        batch_request = dict(batch[0][0])
+        batch_request["inputs"] = inputs
+        outputs = self.model.predict(batch_request)
+        if len(outputs) != len(inputs):
+            raise ValueError(
+                f"batched predict() returned {len(outputs)} outputs for {len(inputs)} "
+                "inputs, micro-batching requires an output per input"
+            )
+
+        start = 0
+        for request, future in batch:
+            end = start + len(request["inputs"])
+            future.set_result(outputs[start:end])
+            start = end
+
+
+def _batch_fields(request):
+    return {key: value for key, value in request.items() if key not in ["inputs", "id"]}
+
+
+def _same_fields(fields, other):
+    try:
+        return bool(fields == other)
+    except Exception:
+        # values which cannot be compared (e.g. arrays) are not batched together
+        return False
+
+
 class _ModelLogPusher:
     def __init__(self, model, context, output_stream=None):
         self.model = model
@@ -9,3 +9,34 @@ def test_list_artifact_tags(db: Session, client: TestClient) -> None:
     resp = client.get(f"/api/projects/{project}/artifact-tags")
     assert resp.status_code == HTTPStatus.OK.value, "status"
     assert resp.json()["project"] == project, "project"
+
+
+def test_store_artifacts(db: Session, client: TestClient) -> None:
+    project = "p11"
+    artifacts = [
+        {
+            "key": f"artifact-{index}",
+            "uid": "tree",
+            "artifact": {"kind": "model", "db_key": f"artifact-{index}"},
+        }
+        for index in range(3)
+    ]
+    # the artifacts are stored by order, storing the same artifact again (with another tag) updates it
+    artifacts.append(
+        {
+            "key": "artifact-0",
+            "uid": "tree",
+            "tag": "v1",
+            "artifact": {"kind": "plot", "db_key": "artifact-0"},
+        }
+    )
+    resp = client.post(
+        f"/api/projects/{project}/artifacts", json={"artifacts": artifacts}
+    )
+    assert resp.status_code == HTTPStatus.OK.value
+
+    resp = client.get("/api/artifacts", params={"project": project})
+    assert resp.status_code == HTTPStatus.OK.value
+    stored = {artifact["db_key"]: artifact for artifact in resp.json()["artifacts"]}
+    assert set(stored.keys()) == {"artifact-0", "artifact-1", "artifact-2"}
+    assert stored["artifact-0"]["kind"] == "plot"
@@ -0,0 +1,81 @@
+import threading
+import time
+from http import HTTPStatus
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+import mlrun.api.crud.logs
+import mlrun.runtimes.constants
+from mlrun.config import config
+
+
+def test_stream_log(db: Session, client: TestClient) -> None:
+    project, uid = "some-project", "some-uid"
+    _store_run(client, project, uid, mlrun.runtimes.constants.RunStates.completed)
+    log = b"first line\nsecond line\n"
+    response = client.post(f"/api/log/{project}/{uid}", data=log)
+    assert response.status_code == HTTPStatus.OK.value
+
+    response = client.get(f"/api/log/{project}/{uid}/stream")
+    assert response.status_code == HTTPStatus.OK.value
+    assert response.content == log
+
+    response = client.get(f"/api/log/{project}/{uid}/stream", params={"offset": 11})
+    assert response.content == log[11:]
+
+    response = client.get(f"/api/log/{project}/not-existing/stream")
+    assert response.status_code == HTTPStatus.NOT_FOUND.value
+
+
+def test_stream_log_follow(db: Session, client: TestClient, monkeypatch) -> None:
+    monkeypatch.setattr(config.httpdb.logs, "stream_poll_interval", 0.05)
+    project, uid = "some-project", "some-uid"
+    _store_run(client, project, uid, mlrun.runtimes.constants.RunStates.running)
+    client.post(f"/api/log/{project}/{uid}", data=b"first line\n")
+
+    def _write_and_complete():
+        time.sleep(0.2)
+        client.post(f"/api/log/{project}/{uid}", data=b"second line\n")
+        time.sleep(0.2)
+        _store_run(client, project, uid, mlrun.runtimes.constants.RunStates.completed)
+
+    writer = threading.Thread(target=_write_and_complete)
+    writer.start()
+    response = client.get(f"/api/log/{project}/{uid}/stream")
+    writer.join()
+    assert response.status_code == HTTPStatus.OK.value
+    assert response.content == b"first line\nsecond line\n"
+
+
+def test_stream_pod_log(db: Session, client: TestClient, monkeypatch) -> None:
+    project, uid = "some-project", "pod-log-uid"
+    _store_run(client, project, uid, mlrun.runtimes.constants.RunStates.running)
+    streams = []
+
+    class _K8s:
+        def get_logger_pods(self, project, uid):
+            return {"pod-name": mlrun.runtimes.constants.PodPhases.running}
+
+        def stream_logs(self, pod, **kwargs):
+            streams.append(kwargs)
+            # a quiet log, the stream is kept open (not reopened from the log start)
+            yield b"first "
+            time.sleep(0.2)
+            yield b"line\nsecond line\n"
+
+    monkeypatch.setattr(mlrun.api.crud.logs, "get_k8s", lambda: _K8s())
+    response = client.get(f"/api/log/{project}/{uid}/stream", params={"offset": 3})
+    assert response.status_code == HTTPStatus.OK.value
+    assert response.content == b"first line\nsecond line\n"[3:]
+    assert len(streams) == 1
+    assert streams[0]["idle_timeout"] == config.httpdb.logs.stream_idle_timeout
+
+
+def _store_run(client: TestClient, project: str, uid: str, state: str):
+    run = {
+        "metadata": {"name": "run-name", "uid": uid, "project": project},
+        "status": {"state": state},
+    }
+    response = client.post(f"/api/run/{project}/{uid}", json=run)
+    assert response.status_code == HTTPStatus.OK.value
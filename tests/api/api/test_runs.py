@@ -96,6 +96,7 @@ def test_list_runs_times_filters(db: Session, client: TestClient) -> None:
         project=config.default_project,
         iteration=0,
         start_time=timestamp1,
+        updated=timestamp2,
     )
     run.struct = normal_run_1
     get_db()._upsert(db, run, ignore=True)
@@ -132,6 +133,7 @@ def test_list_runs_times_filters(db: Session, client: TestClient) -> None:
         project=config.default_project,
         iteration=0,
         start_time=timestamp4,
+        updated=timestamp5,
     )
     run.struct = normal_run_2
     get_db()._upsert(db, run, ignore=True)
@@ -202,6 +204,32 @@ def test_list_runs_times_filters(db: Session, client: TestClient) -> None:
     )
 
 
+def test_list_runs_pages(db: Session, client: TestClient) -> None:
+    uids = [f"run_uid_{index}" for index in range(5)]
+    for uid in uids:
+        run = {"metadata": {"uid": uid}, "status": {}}
+        get_db().store_run(db, run, uid)
+
+    listed_uids, page_token, pages = [], None, 0
+    while True:
+        resp = client.get(
+            "/api/runs", params={"page_size": 2, "page_token": page_token}
+        )
+        assert resp.status_code == HTTPStatus.OK.value
+        runs = resp.json()["runs"]
+        assert len(runs) <= 2
+        listed_uids.extend(run["metadata"]["uid"] for run in runs)
+        pages += 1
+        page_token = resp.json()["next_page_token"]
+        if not page_token:
+            break
+    assert pages == 3
+    assert sorted(listed_uids) == uids
+
+    resp = client.get("/api/runs", params={"page_size": 2, "page_token": "bad"})
+    assert resp.status_code == HTTPStatus.BAD_REQUEST.value
+
+
 def assert_time_range_request(client: TestClient, expected_run_uids: list, **filters):
     resp = client.get("/api/runs", params=filters)
     assert resp.status_code == HTTPStatus.OK.value
@@ -210,3 +238,29 @@ def assert_time_range_request(client: TestClient, expected_run_uids: list, **fil
     assert len(runs) == len(expected_run_uids)
     for run in runs:
         assert run["metadata"]["uid"] in expected_run_uids
+
+
+def test_update_runs(db: Session, client: TestClient) -> None:
+    project = "some-project"
+    for uid in ["uid-1", "uid-2"]:
+        get_db().store_run(
+            db,
+            {"metadata": {"name": "run-name"}, "status": {"state": "running"}},
+            uid,
+            project,
+        )
+
+    response = client.patch(
+        f"/api/projects/{project}/runs",
+        json={
+            "runs": [
+                {"uid": "uid-1", "updates": {"status.results": {"accuracy": 0.9}}},
+                {"uid": "uid-2", "iter": 0, "updates": {"status.state": "completed"}},
+            ]
+        },
+    )
+    assert response.status_code == HTTPStatus.OK.value
+    first_run = get_db().read_run(db, "uid-1", project)
+    assert first_run["status"] == {"state": "running", "results": {"accuracy": 0.9}}
+    second_run = get_db().read_run(db, "uid-2", project)
+    assert second_run["status"]["state"] == "completed"
@@ -2,6 +2,7 @@ import deepdiff
 import numpy
 import pandas
 import pytest
+import sqlalchemy
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.exc import MultipleResultsFound
@@ -711,3 +712,84 @@ def _generate_artifact(name, uid=None, kind=None):
         artifact["metadata"]["uid"] = uid
 
     return artifact
+
+
+# running only on sqldb cause filedb is not really a thing anymore, will be removed soon
+@pytest.mark.parametrize(
+    "db,db_session", [(dbs[0], dbs[0])], indirect=["db", "db_session"]
+)
+def test_list_artifacts_pages(db: DBInterface, db_session: Session):
+    uid = "artifact_uid"
+    for index in range(5):
+        name = f"artifact_name_{index}"
+        kind = ModelArtifact.kind if index % 2 else ChartArtifact.kind
+        db.store_artifact(db_session, name, _generate_artifact(name, kind=kind), uid)
+    _generate_artifact_with_iterations(
+        db, db_session, "hyper", uid, 3, 2, ArtifactCategories.model
+    )
+
+    for filters in [
+        {},
+        {"category": schemas.ArtifactCategories.model},
+        {"category": schemas.ArtifactCategories.other},
+        {"best_iteration": True},
+    ]:
+        expected = db.list_artifacts(db_session, **filters)
+        artifacts, page_token = [], None
+        while True:
+            page, page_token = db.list_artifacts_page(
+                db_session, 2, page_token, **filters
+            )
+            artifacts.extend(page)
+            if not page_token:
+                break
+        assert sorted(_artifact_ids(artifacts)) == sorted(
+            _artifact_ids(expected)
+        ), filters
+
+
+# running only on sqldb cause filedb is not really a thing anymore, will be removed soon
+@pytest.mark.parametrize(
+    "db,db_session", [(dbs[0], dbs[0])], indirect=["db", "db_session"]
+)
+def test_list_artifacts_page_linked_artifacts_queries(
+    db: DBInterface, db_session: Session
+):
+    def count_page_queries(**filters):
+        statements = []
+
+        def on_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = db_session.get_bind()
+        sqlalchemy.event.listen(engine, "before_cursor_execute", on_execute)
+        try:
+            page, _ = db.list_artifacts_page(db_session, 100, **filters)
+        finally:
+            sqlalchemy.event.remove(engine, "before_cursor_execute", on_execute)
+        return len(page), len(statements)
+
+    queries = {}
+    generated_keys = 0
+    for keys_count in [1, 5]:
+        for index in range(generated_keys, keys_count):
+            _generate_artifact_with_iterations(
+                db, db_session, f"hyper-{index}", "uid", 3, 2, ArtifactCategories.model
+            )
+        generated_keys = keys_count
+        for filters in [
+            {"best_iteration": True},
+            {"category": schemas.ArtifactCategories.model},
+        ]:
+            artifacts_count, queries_count = count_page_queries(**filters)
+            queries.setdefault(keys_count, []).append(queries_count)
+        assert artifacts_count > 0
+
+    # the linked artifacts are read with a query per page (not per link artifact)
+    assert queries[1] == queries[5]
+
+
+def _artifact_ids(artifacts):
+    return [
+        (artifact["metadata"]["name"], artifact.get("iter")) for artifact in artifacts
+    ]
@@ -0,0 +1,74 @@
+import pytest
+from sqlalchemy.orm import Session
+
+from mlrun.api.db.base import DBInterface
+from mlrun.api.db.sqldb.models import Log, LogChunk
+from mlrun.config import config
+from tests.api.db.conftest import dbs
+
+
+@pytest.mark.parametrize(
+    "db,db_session", [(dbs[0], dbs[0])], indirect=["db", "db_session"]
+)
+def test_store_log_append_chunks(db: DBInterface, db_session: Session):
+    uid = "log-uid"
+    project = "project"
+    db.store_log(db_session, uid, project, b"first ")
+    db.store_log(db_session, uid, project, b"second ", append=True)
+    db.store_log(db_session, uid, project, b"third", append=True)
+
+    chunks = db_session.query(LogChunk).filter_by(uid=uid).all()
+    assert [chunk.sequence for chunk in chunks] == [0, 1, 2]
+    assert [chunk.offset for chunk in chunks] == [0, 6, 13]
+
+    _, body = db.get_log(db_session, uid, project)
+    assert body == b"first second third"
+    _, body = db.get_log(db_session, uid, project, offset=8, size=7)
+    assert body == b"cond th"
+    _, body = db.get_log(db_session, uid, project, offset=13)
+    assert body == b"third"
+    _, body = db.get_log(db_session, uid, project, offset=100)
+    assert body == b""
+
+    # overwrite
+    db.store_log(db_session, uid, project, b"new")
+    _, body = db.get_log(db_session, uid, project)
+    assert body == b"new"
+
+    db.delete_log(db_session, project, uid)
+    assert db.get_log(db_session, uid, project) == (None, None)
+    assert db_session.query(LogChunk).filter_by(uid=uid).count() == 0
+
+
+@pytest.mark.parametrize(
+    "db,db_session", [(dbs[0], dbs[0])], indirect=["db", "db_session"]
+)
+def test_store_log_max_chunk_size(db: DBInterface, db_session: Session, monkeypatch):
+    monkeypatch.setattr(config.httpdb.logs, "max_chunk_size", 4)
+    uid = "log-uid"
+    project = "project"
+    db.store_log(db_session, uid, project, b"0123456789")
+    assert db_session.query(LogChunk).filter_by(uid=uid).count() == 3
+
+    _, body = db.get_log(db_session, uid, project, offset=3, size=6)
+    assert body == b"345678"
+
+
+@pytest.mark.parametrize(
+    "db,db_session", [(dbs[0], dbs[0])], indirect=["db", "db_session"]
+)
+def test_store_log_legacy_body(db: DBInterface, db_session: Session):
+    uid = "log-uid"
+    project = "project"
+    db.store_log(db_session, uid, project)
+    log = db_session.query(Log).filter_by(uid=uid).one()
+    log.body = b"legacy "
+    db_session.commit()
+
+    _, body = db.get_log(db_session, uid, project, offset=2)
+    assert body == b"gacy "
+
+    db.store_log(db_session, uid, project, b"appended", append=True)
+    _, body = db.get_log(db_session, uid, project)
+    assert body == b"legacy appended"
+    assert db_session.query(Log).filter_by(uid=uid).one().body is None
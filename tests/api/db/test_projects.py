@@ -8,10 +8,12 @@ import sqlalchemy.orm
 import mlrun.api.initial_data
 import mlrun.api.schemas
 import mlrun.api.utils.singletons.db
+import mlrun.artifacts
 import mlrun.config
 import mlrun.errors
+import mlrun.runtimes.constants
 from mlrun.api.db.base import DBInterface
-from mlrun.api.db.sqldb.models import Project
+from mlrun.api.db.sqldb.models import Project, ProjectResourcesCounters
 from tests.api.db.conftest import dbs
 
 
@@ -321,3 +323,85 @@ def test_delete_project(
 
     with pytest.raises(mlrun.errors.MLRunNotFoundError):
         db.get_project(db_session, project_name)
+
+
+# running only on sqldb cause filedb is not really a thing anymore, will be removed soon
+@pytest.mark.parametrize(
+    "db,db_session", [(dbs[0], dbs[0])], indirect=["db", "db_session"]
+)
+def test_project_resources_counters(
+    db: DBInterface, db_session: sqlalchemy.orm.Session,
+):
+    project_name = "project-name"
+    for index in range(3):
+        db.store_function(db_session, {"kind": "job"}, f"func-{index}", project_name)
+    # another version of an existing function should not be counted
+    db.store_function(
+        db_session, {"kind": "job"}, "func-0", project_name, versioned=True
+    )
+    for index in range(2):
+        db.create_feature_set(
+            db_session,
+            project_name,
+            mlrun.api.schemas.FeatureSet(
+                metadata=mlrun.api.schemas.ObjectMetadata(name=f"feature-set-{index}"),
+                spec=mlrun.api.schemas.FeatureSetSpec(entities=[], features=[]),
+                status={},
+            ),
+        )
+    for index, kind in enumerate(
+        [mlrun.artifacts.model.ModelArtifact.kind] * 2
+        + [mlrun.artifacts.dataset.DatasetArtifact.kind]
+    ):
+        db.store_artifact(
+            db_session, f"artifact-{index}", {"kind": kind}, "uid", project=project_name
+        )
+    for index in range(4):
+        db.store_run(
+            db_session,
+            {
+                "metadata": {"name": f"run-{index}"},
+                "status": {"state": mlrun.runtimes.constants.RunStates.running},
+            },
+            f"uid-{index}",
+            project_name,
+        )
+    _assert_project_summary(db, db_session, project_name, 3, 2, 2, 4)
+
+    db.update_run(
+        db_session,
+        {"status.state": mlrun.runtimes.constants.RunStates.completed},
+        "uid-0",
+        project_name,
+    )
+    db.del_run(db_session, "uid-1", project_name)
+    db.del_artifact(db_session, "artifact-0", project=project_name)
+    db.delete_function(db_session, project_name, "func-0")
+    db.delete_feature_set(db_session, project_name, "feature-set-0")
+    _assert_project_summary(db, db_session, project_name, 2, 1, 1, 2)
+
+    # a full rebuild should produce the same counters
+    db_session.query(ProjectResourcesCounters).delete()
+    db_session.commit()
+    _assert_project_summary(db, db_session, project_name, 0, 0, 0, 0)
+    db.rebuild_project_resources_counters(db_session)
+    _assert_project_summary(db, db_session, project_name, 2, 1, 1, 2)
+
+    db.delete_project_related_resources(db_session, project_name)
+    assert db_session.query(ProjectResourcesCounters).count() == 0
+
+
+def _assert_project_summary(
+    db: DBInterface,
+    db_session: sqlalchemy.orm.Session,
+    project_name: str,
+    functions_count: int,
+    feature_sets_count: int,
+    models_count: int,
+    runs_running_count: int,
+):
+    project_summary = db.generate_projects_summaries(db_session, [project_name])[0]
+    assert project_summary.functions_count == functions_count
+    assert project_summary.feature_sets_count == feature_sets_count
+    assert project_summary.models_count == models_count
+    assert project_summary.runs_running_count == runs_running_count
@@ -1,8 +1,15 @@
-from datetime import datetime, timezone
+import math
+import os
+import pickle
+import time
+from datetime import datetime, timedelta, timezone
 
+import orjson
 import pytest
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 
+import mlrun.errors
 from mlrun.api.db.base import DBInterface
 from mlrun.api.db.sqldb.models import Run
 from mlrun.config import config
@@ -59,92 +66,233 @@ def test_list_runs_state_filter(db: DBInterface, db_session: Session):
         db_session, run_without_state, run_without_state_uid,
     )
 
-    run_with_json_state_state = "some_json_state"
-    run_with_json_state_uid = "run_with_json_state_uid"
-    run_with_json_state = {
-        "metadata": {"uid": run_with_json_state_uid},
-        "status": {"state": run_with_json_state_state},
+    run_with_state_state = "some_state"
+    run_with_state_uid = "run_with_state_uid"
+    run_with_state = {
+        "metadata": {"uid": run_with_state_uid},
+        "status": {"state": run_with_state_state},
     }
-    run = Run(
-        uid=run_with_json_state_uid,
-        project=config.default_project,
-        iteration=0,
-        start_time=datetime.now(timezone.utc),
-    )
-    run.struct = run_with_json_state
-    db._upsert(db_session, run, ignore=True)
-
-    run_with_record_state_state = "some_record_state"
-    run_with_record_state_uid = "run_with_record_state_uid"
-    run_with_record_state = {
-        "metadata": {"uid": run_with_record_state_uid},
-        "bla": "blabla",
-    }
-    run = Run(
-        uid=run_with_record_state_uid,
-        project=config.default_project,
-        iteration=0,
-        state=run_with_record_state_state,
-        start_time=datetime.now(timezone.utc),
+    db.store_run(
+        db_session, run_with_state, run_with_state_uid,
     )
-    run.struct = run_with_record_state
-    db._upsert(db_session, run, ignore=True)
 
-    run_with_equal_json_and_record_state_state = "some_equal_json_and_record_state"
-    run_with_equal_json_and_record_state_uid = (
-        "run_with_equal_json_and_record_state_uid"
-    )
-    run_with_equal_json_and_record_state = {
-        "metadata": {"uid": run_with_equal_json_and_record_state_uid},
-        "status": {"state": run_with_equal_json_and_record_state_state},
+    run_with_updated_state_state = "some_updated_state"
+    run_with_updated_state_uid = "run_with_updated_state_uid"
+    run_with_updated_state = {
+        "metadata": {"uid": run_with_updated_state_uid},
+        "status": {"state": run_with_state_state},
     }
     db.store_run(
-        db_session,
-        run_with_equal_json_and_record_state,
-        run_with_equal_json_and_record_state_uid,
-    )
-
-    run_with_unequal_json_and_record_state_json_state = "some_unequal_json_state"
-    run_with_unequal_json_and_record_state_record_state = "some_unequal_record_state"
-    run_with_unequal_json_and_record_state_uid = (
-        "run_with_unequal_json_and_record_state_uid"
+        db_session, run_with_updated_state, run_with_updated_state_uid,
     )
-    run_with_unequal_json_and_record_state = {
-        "metadata": {"uid": run_with_unequal_json_and_record_state_uid},
-        "status": {"state": run_with_unequal_json_and_record_state_json_state},
-    }
-    run = Run(
-        uid=run_with_unequal_json_and_record_state_uid,
-        project=config.default_project,
-        iteration=0,
-        state=run_with_unequal_json_and_record_state_record_state,
-        start_time=datetime.now(timezone.utc),
+    db.update_run(
+        db_session,
+        {"status.state": run_with_updated_state_state},
+        run_with_updated_state_uid,
     )
-    run.struct = run_with_unequal_json_and_record_state
-    db._upsert(db_session, run, ignore=True)
 
     runs = db.list_runs(db_session)
-    assert len(runs) == 5
-
-    runs = db.list_runs(db_session, state=run_with_json_state_state)
-    assert len(runs) == 1
-    assert runs[0]["metadata"]["uid"] == run_with_json_state_uid
+    assert len(runs) == 3
 
-    runs = db.list_runs(db_session, state=run_with_record_state_state)
+    runs = db.list_runs(db_session, state=run_with_state_state)
     assert len(runs) == 1
-    assert runs[0]["metadata"]["uid"] == run_with_record_state_uid
+    assert runs[0]["metadata"]["uid"] == run_with_state_uid
 
-    runs = db.list_runs(db_session, state=run_with_equal_json_and_record_state_state)
+    runs = db.list_runs(db_session, state=run_with_updated_state_state)
     assert len(runs) == 1
-    assert runs[0]["metadata"]["uid"] == run_with_equal_json_and_record_state_uid
+    assert runs[0]["metadata"]["uid"] == run_with_updated_state_uid
 
     runs = db.list_runs(
-        db_session, state=run_with_unequal_json_and_record_state_json_state
+        db_session, state=[run_with_state_state, run_with_updated_state_state]
     )
-    assert len(runs) == 1
-    assert runs[0]["metadata"]["uid"] == run_with_unequal_json_and_record_state_uid
+    assert len(runs) == 2
+
+
+# running only on sqldb cause filedb is not really a thing anymore, will be removed soon
+@pytest.mark.parametrize(
+    "db,db_session", [(dbs[0], dbs[0])], indirect=["db", "db_session"]
+)
+def test_list_runs_last_update_time_filter(db: DBInterface, db_session: Session):
+    now = datetime.now(timezone.utc)
+    for index in range(3):
+        uid = f"run_uid_{index}"
+        run = {
+            "metadata": {"uid": uid},
+            "status": {"last_update": (now + timedelta(hours=index)).isoformat()},
+        }
+        db.store_run(db_session, run, uid)
+    # run without last update
+    db.store_run(db_session, {"metadata": {"uid": "run_uid_3"}}, "run_uid_3")
+    # the last update changes with every update of the run
+    db.update_run(
+        db_session,
+        {"status.last_update": (now + timedelta(hours=5)).isoformat()},
+        "run_uid_0",
+    )
+
+    runs = db.list_runs(db_session)
+    assert len(runs) == 4
+
+    runs = db.list_runs(db_session, last_update_time_from=now + timedelta(minutes=30))
+    assert sorted(run["metadata"]["uid"] for run in runs) == [
+        "run_uid_0",
+        "run_uid_1",
+        "run_uid_2",
+    ]
 
     runs = db.list_runs(
-        db_session, state=run_with_unequal_json_and_record_state_record_state
+        db_session,
+        last_update_time_from=now + timedelta(minutes=30),
+        last_update_time_to=now + timedelta(hours=3),
     )
-    assert len(runs) == 0
+    assert sorted(run["metadata"]["uid"] for run in runs) == [
+        "run_uid_1",
+        "run_uid_2",
+    ]
+
+
+# running only on sqldb cause filedb is not really a thing anymore, will be removed soon
+@pytest.mark.parametrize(
+    "db,db_session", [(dbs[0], dbs[0])], indirect=["db", "db_session"]
+)
+def test_list_runs_pages(db: DBInterface, db_session: Session):
+    start_time = datetime.now(timezone.utc)
+    for index in range(7):
+        uid = f"run_uid_{index}"
+        run = {
+            "metadata": {"name": "match" if index % 3 else "other", "uid": uid},
+            # some runs share the same start time
+            "status": {"start_time": start_time.replace(second=index // 2).isoformat()},
+        }
+        db.store_run(db_session, run, uid)
+
+    for name, page_size in [(None, 2), (None, 7), ("match", 2), ("match", 3)]:
+        runs, page_token, pages = [], None, 0
+        while True:
+            page, page_token = db.list_runs_page(
+                db_session, page_size, page_token, name=name
+            )
+            assert len(page) <= page_size
+            runs.extend(page)
+            pages += 1
+            if not page_token:
+                break
+        expected = db.list_runs(db_session, name=name)
+        uids = [run["metadata"]["uid"] for run in runs]
+        assert sorted(uids) == sorted(run["metadata"]["uid"] for run in expected)
+        assert pages <= len(expected) // page_size + 1
+
+        # the runs are listed newest first
+        start_times = [run["status"]["start_time"] for run in runs]
+        assert start_times == sorted(start_times, reverse=True)
+
+    with pytest.raises(mlrun.errors.MLRunInvalidArgumentError):
+        db.list_runs_page(db_session, 2, "not-a-token")
+
+
+# running only on sqldb cause filedb is not really a thing anymore, will be removed soon
+@pytest.mark.parametrize(
+    "db,db_session", [(dbs[0], dbs[0])], indirect=["db", "db_session"]
+)
+def test_run_body_formats(db: DBInterface, db_session: Session, monkeypatch):
+    run = {"metadata": {"name": "run-name", "uid": "json"}, "status": {"x": 1.5}}
+    db.store_run(db_session, run, "json")
+    # runs which are not JSON serializable are pickled
+    pickled_run = {"metadata": {"name": "run-name", "uid": "pickled"}, 1: "one"}
+    db.store_run(db_session, pickled_run, "pickled")
+    # runs which JSON would not restore as is (NaN, datetime, tuple) are pickled
+    typed_run = {
+        "metadata": {"name": "typed-run", "uid": "typed"},
+        "status": {
+            "loss": float("nan"),
+            "time": datetime(2021, 4, 26, tzinfo=timezone.utc),
+            "shape": (2, 3),
+        },
+    }
+    db.store_run(db_session, typed_run, "typed")
+    # legacy (pickled) run
+    legacy_run = {"metadata": {"name": "run-name", "uid": "legacy"}}
+    record = Run(
+        uid="legacy", project=config.default_project, iteration=0, name="run-name"
+    )
+    record.body = pickle.dumps(legacy_run)
+    db._upsert(db_session, record)
+
+    bodies = {record.uid: record.body for record in db_session.query(Run.uid, Run.body)}
+    assert orjson.loads(bodies["json"]) == run
+    assert pickle.loads(bodies["pickled"]) == pickled_run
+    assert bodies["typed"][:1] == b"\x80"
+
+    for uid, expected in [
+        ("json", run),
+        ("pickled", pickled_run),
+        ("legacy", legacy_run),
+    ]:
+        assert db.read_run(db_session, uid) == expected
+    status = db.read_run(db_session, "typed")["status"]
+    assert math.isnan(status["loss"])
+    assert status["time"] == typed_run["status"]["time"]
+    assert status["shape"] == (2, 3)
+
+    # struct is a new object on every access, struct_view is decoded once (and shared)
+    record = db._get_run(db_session, "json", config.default_project, 0)
+    assert record.struct is not record.struct
+    assert record.struct_view is record.struct_view
+    read_run = db.read_run(db_session, "json")
+    read_run["status"]["x"] = 2
+    assert record.struct["status"]["x"] == 1.5
+
+    runs = orjson.loads(db.list_runs_json(db_session, name="run-name"))
+    assert sorted(run["metadata"]["uid"] for run in runs) == [
+        "json",
+        "legacy",
+        "pickled",
+    ]
+    runs, _ = db.list_runs_page_json(db_session, 2)
+    assert len(orjson.loads(runs)) == 2
+
+    # pickle bodies can still be written
+    monkeypatch.setattr(config.httpdb.db, "body_format", "pickle")
+    db.update_run(db_session, {"status.x": 3}, "json")
+    assert db_session.query(Run.body).filter(Run.uid == "json").one()[0][:1] == b"\x80"
+    assert db.read_run(db_session, "json")["status"]["x"] == 3
+
+
+# running only on sqldb cause filedb is not really a thing anymore, will be removed soon
+@pytest.mark.parametrize(
+    "db,db_session", [(dbs[0], dbs[0])], indirect=["db", "db_session"]
+)
+@pytest.mark.skipif(
+    not os.environ.get("MLRUN_RUN_BENCHMARKS"), reason="benchmarks are not enabled"
+)
+def test_list_runs_json_benchmark(db: DBInterface, db_session: Session, monkeypatch):
+    """list runs as JSON (the list runs endpoint response) with pickled and JSON run bodies"""
+    runs_count = 500
+    durations = {}
+    for body_format in ["pickle", "json"]:
+        monkeypatch.setattr(config.httpdb.db, "body_format", body_format)
+        project = f"benchmark-{body_format}"
+        for index in range(runs_count):
+            run = {
+                "metadata": {"name": "benchmark", "uid": f"uid-{index}"},
+                "spec": {"parameters": {f"p{i}": i for i in range(20)}},
+                "status": {
+                    "state": "completed",
+                    "results": {f"r{i}": i / 3 for i in range(20)},
+                    "iterations": [[f"c{i}" for i in range(10)]] * 5,
+                },
+            }
+            db.store_run(db_session, run, f"uid-{index}", project)
+
+        start = time.monotonic()
+        if body_format == "pickle":
+            # the pickled runs are decoded, and encoded by the endpoint
+            runs = orjson.dumps(
+                jsonable_encoder(db.list_runs(db_session, project=project))
+            )
+        else:
+            runs = db.list_runs_json(db_session, project=project)
+        durations[body_format] = time.monotonic() - start
+        assert len(orjson.loads(runs)) == runs_count
+
+    assert durations["json"] < durations["pickle"]
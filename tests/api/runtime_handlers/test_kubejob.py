@@ -314,3 +314,32 @@ class TestKubejobRuntimeHandler(TestRuntimeHandlerBase):
     def _mock_list_resources_pods(self):
         mocked_responses = self._mock_list_namespaced_pods([[self.completed_pod]])
         return mocked_responses[0].items
+
+    def test_monitor_run_lists_only_runtime_resources_runs(
+        self, db: Session, client: TestClient
+    ):
+        # runs without runtime resources should not be loaded by the monitoring
+        for index in range(3):
+            other_run_uid = f"other-run-uid-{index}"
+            other_run = {
+                "status": {"state": RunStates.completed},
+                "metadata": {"project": self.project, "uid": other_run_uid},
+            }
+            get_db().store_run(db, other_run, other_run_uid, self.project)
+
+        self._mock_list_namespaced_pods([[self.running_pod]])
+        self.runtime_handler.monitor_runs(get_db(), db)
+
+        self._assert_run_reached_state(
+            db, self.project, self.run_uid, RunStates.running
+        )
+        metrics = self.runtime_handler.monitoring_cycle_metrics
+        assert metrics["runtime_resources"] == 1
+        assert metrics["runs"] == 1
+        for duration in [
+            "list_runtime_resources_duration",
+            "list_runs_duration",
+            "monitor_duration",
+            "total_duration",
+        ]:
+            assert metrics[duration] >= 0
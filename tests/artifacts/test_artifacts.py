@@ -1,5 +1,9 @@
+import pathlib
+from unittest.mock import patch
+
 import mlrun
 import mlrun.artifacts
+import mlrun.artifacts.base
 from mlrun.utils import StorePrefix
 
 
@@ -32,3 +36,40 @@ def test_artifact_uri():
     artifact = mlrun.artifacts.ModelArtifact("data", body="abc")
     prefix, uri = mlrun.datastore.parse_store_uri(artifact.uri)
     assert prefix == StorePrefix.Model, "illegal artifact uri"
+
+
+def test_dir_artifact_upload(tmp_path, monkeypatch):
+    src_path = tmp_path / "src"
+    (src_path / "sub").mkdir(parents=True)
+    for name in ["a.txt", "b.txt", "sub/c.txt"]:
+        (src_path / name).write_text(name)
+    target_path = tmp_path / "target"
+    monkeypatch.chdir(tmp_path)
+
+    def upload(artifact):
+        uploaded = []
+        original_upload = mlrun.datastore.base.DataItem.upload
+
+        def tracked_upload(data_item, src):
+            uploaded.append(pathlib.Path(src).relative_to("src").as_posix())
+            original_upload(data_item, src)
+
+        with patch.object(mlrun.datastore.base.DataItem, "upload", tracked_upload):
+            artifact.upload()
+        return sorted(uploaded)
+
+    artifact = mlrun.artifacts.base.DirArtifact("data")
+    artifact.src_path = "src"
+    artifact.target_path = str(target_path) + "/"
+    assert upload(artifact) == ["a.txt", "b.txt", "sub/c.txt"]
+    assert (target_path / "sub" / "c.txt").read_text() == "sub/c.txt"
+    assert artifact.size == 19
+    first_hash = artifact.hash
+
+    # only the new/changed files are uploaded again
+    (src_path / "b.txt").write_text("changed")
+    (src_path / "sub" / "d.txt").write_text("new")
+    assert upload(artifact) == ["b.txt", "sub/d.txt"]
+    assert (target_path / "b.txt").read_text() == "changed"
+    assert artifact.hash != first_hash
+    assert upload(artifact) == []
@@ -33,7 +33,6 @@ def config_test_base():
     environ["MLRUN_httpdb__dirpath"] = rundb_path
     environ["MLRUN_httpdb__logs_path"] = logs_path
     environ["MLRUN_httpdb__projects__periodic_sync_interval"] = "0 seconds"
-    environ["MLRUN_httpdb__projects__counters_cache_ttl"] = "0 seconds"
     log_level = "DEBUG"
     environ["MLRUN_log_level"] = log_level
     # reload config so that values overridden by tests won't pass to other tests
@@ -1,4 +1,13 @@
+import os
+import re
+import time
+
+import pandas as pd
+import pytest
+import requests_mock as requests_mock_package
+
 import mlrun.datastore
+from mlrun.config import config
 
 
 def test_http_fs_parquet_as_df():
@@ -6,3 +15,179 @@ def test_http_fs_parquet_as_df():
         "https://s3.wasabisys.com/iguazio/data/market-palce/aggregate/metrics.pq"
     )
     data_item.as_df()
+
+
+def _ranged_object_callback(body: bytes, requested_ranges: list):
+    def callback(request, context):
+        range_header = request.headers.get("Range")
+        if not range_header:
+            return body
+        requested_ranges.append(range_header)
+        start, end = re.match(r"bytes=(\d+)-(\d*)", range_header).groups()
+        context.status_code = 206
+        return body[int(start) : int(end) + 1 if end else None]
+
+    return callback
+
+
+def test_http_ranged_get(requests_mock: requests_mock_package.Mocker):
+    url = "http://some-host/some/object"
+    body = bytes(range(256)) * 4
+    requested_ranges = []
+    requests_mock.get(url, content=_ranged_object_callback(body, requested_ranges))
+    data_item = mlrun.datastore.store_manager.object(url)
+    assert data_item.get(size=10, offset=5) == body[5:15]
+    assert requested_ranges == ["bytes=5-14"]
+    assert data_item.get(offset=1000) == body[1000:]
+    assert data_item.get() == body
+
+    # servers which do not support ranges return the whole body
+    requests_mock.get(url, content=body)
+    assert data_item.get(size=10, offset=5) == body[5:15]
+
+
+def test_v3io_download_and_upload_in_parts(
+    requests_mock: requests_mock_package.Mocker, tmp_path
+):
+    config.datastore.transfer_part_size = 100
+    url = f"{config.v3io_api}/container/some/object"
+    body = bytes(range(256)) * 4
+    requested_ranges = []
+    requests_mock.head(
+        url,
+        headers={
+            "Content-Length": str(len(body)),
+            "Last-Modified": "Mon, 18 Oct 2021 10:00:00 GMT",
+        },
+    )
+    requests_mock.get(url, content=_ranged_object_callback(body, requested_ranges))
+    data_item = mlrun.datastore.store_manager.object("v3io:///container/some/object")
+
+    target_path = tmp_path / "object"
+    data_item.download(str(target_path))
+    assert target_path.read_bytes() == body
+    assert len(requested_ranges) == 11
+    assert all(
+        int(end) - int(start) < 100
+        for start, end in (
+            re.match(r"bytes=(\d+)-(\d+)", requested_range).groups()
+            for requested_range in requested_ranges
+        )
+    )
+
+    stored = bytearray()
+
+    def put_callback(request, context):
+        if request.headers.get("Range") != "-1":
+            stored.clear()
+        stored.extend(request.body)
+        return b""
+
+    requests_mock.put(url, content=put_callback)
+    data_item.upload(str(target_path))
+    assert bytes(stored) == body
+    assert requests_mock.call_count == 1 + 11 + 11
+
+
+def test_v3io_upload_in_parts_failure(
+    requests_mock: requests_mock_package.Mocker, tmp_path
+):
+    config.datastore.transfer_part_size = 100
+    url = f"{config.v3io_api}/container/some/object"
+    source_path = tmp_path / "object"
+    source_path.write_bytes(bytes(range(256)) * 4)
+    stored = bytearray()
+
+    def put_callback(request, context):
+        if len(stored) >= 300:
+            context.status_code = 500
+            return b""
+        stored.extend(request.body)
+        return b""
+
+    requests_mock.put(url, content=put_callback)
+    requests_mock.delete(url)
+    data_item = mlrun.datastore.store_manager.object("v3io:///container/some/object")
+    with pytest.raises(mlrun.errors.MLRunInternalServerError):
+        data_item.upload(str(source_path))
+
+    # the truncated object is removed rather than left at the target key
+    assert requests_mock.request_history[-1].method == "DELETE"
+    assert requests_mock.call_count == 4 + 1
+
+
+def test_data_cache(requests_mock: requests_mock_package.Mocker, tmp_path, monkeypatch):
+    monkeypatch.setattr(config.datastore.cache, "mode", "enabled")
+    monkeypatch.setattr(config.datastore.cache, "path", str(tmp_path / "cache"))
+    cache = mlrun.datastore.data_cache
+    url = "http://some-host/some/data.csv"
+    body = b"a,b\n1,2\n3,4\n"
+    requests_mock.head(
+        url, headers={"Content-Length": str(len(body)), "ETag": '"version-1"'}
+    )
+    requests_mock.get(url, content=body)
+    stats = cache.stats()
+
+    # every data item of the same object version uses the cached copy
+    local_path = mlrun.datastore.store_manager.object(url).local()
+    assert mlrun.datastore.store_manager.object(url).local() == local_path
+    assert mlrun.datastore.store_manager.object(url).as_df()["b"].tolist() == [2, 4]
+    target_path = tmp_path / "data.csv"
+    mlrun.datastore.store_manager.object(url).download(str(target_path))
+    assert target_path.read_bytes() == body
+    assert cache.hits - stats["hits"] == 3
+    assert cache.misses - stats["misses"] == 1
+    assert (
+        len(
+            [
+                request
+                for request in requests_mock.request_history
+                if request.method == "GET"
+            ]
+        )
+        == 1
+    )
+
+    # a new version is a new cache entry, entries used in the grace period are not evicted
+    monkeypatch.setattr(config.datastore.cache, "max_size", len(body) + 1)
+    requests_mock.head(
+        url, headers={"Content-Length": str(len(body)), "ETag": '"version-2"'}
+    )
+    new_local_path = mlrun.datastore.store_manager.object(url).local()
+    assert new_local_path != local_path
+    assert cache.misses - stats["misses"] == 2
+    assert cache.evictions - stats["evictions"] == 0
+    assert os.path.exists(local_path)
+
+    # the least recently used entry is evicted
+    used_before = time.time() - config.datastore.cache.eviction_grace_period - 1
+    os.utime(local_path, (used_before, used_before))
+    requests_mock.head(
+        url, headers={"Content-Length": str(len(body)), "ETag": '"version-3"'}
+    )
+    mlrun.datastore.store_manager.object(url).local()
+    assert cache.evictions - stats["evictions"] == 1
+    assert not os.path.exists(local_path)
+    assert os.path.exists(new_local_path)
+
+    # the entries are locked with a fixed set of lock files (no lock file per entry)
+    lock_files = [name for name in os.listdir(cache.path) if name.endswith(".lock")]
+    stripes = mlrun.datastore.cache._entry_lock_stripes
+    assert set(lock_files) <= {".evict.lock"} | {
+        f".entry-{stripe}.lock" for stripe in range(stripes)
+    }
+    assert not os.path.exists(local_path + ".lock")
+
+
+def test_parquet_chunks_partition_columns(tmp_path):
+    partition_dir = tmp_path / "dataset" / "year=2021"
+    partition_dir.mkdir(parents=True)
+    pd.DataFrame({"x": [1, 2]}).to_parquet(partition_dir / "part-0.parquet")
+
+    # the partition columns are parsed from the paths relative to the dataset url
+    for url in [str(tmp_path / "dataset"), f"file://{tmp_path}/dataset"]:
+        data_item = mlrun.datastore.store_manager.object(url)
+        chunks = list(data_item.as_df_chunks(format="parquet"))
+        assert [chunk.to_dict(orient="list") for chunk in chunks] == [
+            {"x": [1, 2], "year": [2021, 2021]}
+        ]
@@ -0,0 +1,109 @@
+# Copyright 2018 Iguazio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import mlrun.feature_store as fs
+from mlrun.feature_store.aggregations import aggregate_df
+
+operations = ["sum", "count", "min", "max", "avg", "stddev"]
+
+
+def _quotes_df(rows=300):
+    random = np.random.RandomState(7)
+    times = pd.Timestamp("2021-03-01 08:00") + pd.to_timedelta(
+        np.sort(random.choice(10 * 3600, rows, replace=False)), unit="s"
+    )
+    return pd.DataFrame(
+        {
+            "ticker": random.choice(["GOOG", "MSFT", "AAPL"], rows),
+            "time": times,
+            "bid": random.randint(0, 1000, rows) / 10,
+        }
+    )
+
+
+@pytest.mark.parametrize("windows, period", [(["1h"], None), (["1h", "2h"], "10m")])
+def test_aggregations_pandas_vs_storey(windows, period):
+    df = _quotes_df()
+    results = {}
+    for engine in ["storey", "pandas"]:
+        quotes_set = fs.FeatureSet(
+            "quotes",
+            entities=[fs.Entity("ticker")],
+            timestamp_key="time",
+            engine=engine,
+        )
+        quotes_set.add_aggregation("bids", "bid", operations, windows, period)
+        results[engine] = fs.preview(quotes_set, df.copy())
+
+    storey_df = results["storey"].reset_index()
+    pandas_df = results["pandas"]
+    assert len(storey_df) == len(pandas_df) == len(df)
+    for operation in operations:
+        for window in windows:
+            column = f"bids_{operation}_{window}"
+            np.testing.assert_allclose(
+                pandas_df[column].values,
+                storey_df[column].values,
+                rtol=1e-9,
+                err_msg=column,
+            )
+
+
+def test_aggregate_df_unsorted():
+    df = _quotes_df(100)
+    aggregates = [
+        {
+            "name": "bids",
+            "column": "bid",
+            "operations": ["sum", "max"],
+            "windows": ["1h"],
+            "period": "10m",
+        }
+    ]
+    expected = aggregate_df(df, aggregates, ["ticker"], "time")
+
+    # the rows are aggregated by time order, and returned in the original order
+    shuffled = df.sample(frac=1, random_state=1)
+    result = aggregate_df(shuffled, aggregates, ["ticker"], "time")
+    pd.testing.assert_frame_equal(result.loc[df.index], expected)
+
+    # keys can be index levels
+    result = aggregate_df(df.set_index("ticker"), aggregates, ["ticker"], "time")
+    np.testing.assert_allclose(result["bids_sum_1h"].values, expected["bids_sum_1h"])
+
+
+def test_aggregate_df_naive_times_are_utc(monkeypatch):
+    df = _quotes_df(100)
+    # the rows cross midnight (UTC)
+    df["time"] = df["time"] + pd.Timedelta(hours=12)
+    aggregates = [
+        {"name": "bids", "column": "bid", "operations": ["sum"], "windows": ["1d"]}
+    ]
+    utc_df = df.assign(time=df["time"].dt.tz_localize("UTC"))
+
+    # the results dont depend on the host timezone
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    try:
+        result = aggregate_df(df, aggregates, ["ticker"], "time")
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+    expected = aggregate_df(utc_df, aggregates, ["ticker"], "time")
+    np.testing.assert_allclose(result["bids_sum_1d"].values, expected["bids_sum_1d"])
@@ -0,0 +1,94 @@
+# Copyright 2018 Iguazio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from types import SimpleNamespace
+
+import pandas as pd
+
+from mlrun.feature_store import FeatureVector
+from mlrun.feature_store.feature_vector import OnlineVectorService
+from mlrun.features import Feature
+
+features = {"GOOG": {"first": "x", "second": "y"}, "MSFT": {"second": "z"}}
+
+
+class _Controller:
+    """a mock of the online graph controller, returns the row features"""
+
+    def __init__(self):
+        self.emitted = []
+
+    def emit(self, row, return_awaitable_result=False):
+        self.emitted.append(row)
+        body = features.get(row["ticker"])
+        body = dict(body, ticker=row["ticker"]) if body else None
+        return SimpleNamespace(await_result=lambda: SimpleNamespace(body=body))
+
+
+def _vector_service():
+    vector = FeatureVector("vector", ["stocks.*"])
+    for name in ["first", "second"]:
+        vector.status.features[name] = Feature(name=name)
+    controller = _Controller()
+    graph = SimpleNamespace(controller=controller)
+    return OnlineVectorService(vector, graph, ["ticker"]), controller
+
+
+def test_online_vector_dedup_and_order():
+    service, controller = _vector_service()
+    rows = [
+        {"ticker": "GOOG"},
+        {"ticker": "MSFT"},
+        {"ticker": "GOOG"},
+        {"ticker": "AAPL"},
+    ]
+
+    results = service.get(rows)
+    # duplicate rows are looked up once, the results keep the rows order
+    assert controller.emitted == [
+        {"ticker": "GOOG"},
+        {"ticker": "MSFT"},
+        {"ticker": "AAPL"},
+    ]
+    assert results == [
+        {"first": "x", "second": "y"},
+        {"second": "z", "first": None},
+        {"first": "x", "second": "y"},
+        None,
+    ]
+    # duplicate rows dont share the result dict
+    results[0]["first"] = "changed"
+    assert results[2]["first"] == "x"
+
+    assert service.get(rows, as_list=True) == [
+        ["x", "y"],
+        [None, "z"],
+        ["x", "y"],
+        None,
+    ]
+
+
+def test_online_vector_get_df():
+    service, controller = _vector_service()
+    rows = pd.DataFrame(
+        {"ticker": ["MSFT", "GOOG", "AAPL", "GOOG"]}, index=[10, 11, 12, 13]
+    )
+
+    df = service.get_df(rows)
+    assert len(controller.emitted) == 3
+    assert list(df.columns) == ["first", "second"]
+    assert list(df.index) == [10, 11, 12, 13]
+    assert df.to_dict(orient="list") == {
+        "first": [None, "x", None, "x"],
+        "second": ["z", "y", None, "y"],
+    }
@@ -1,8 +1,11 @@
 import deepdiff
+import numpy as np
 import pandas as pd
 
 import mlrun.feature_store as fs
 from mlrun.data_types import InferOptions
+from mlrun.data_types.infer import DFStatsAccumulator, get_df_stats
+from mlrun.datastore.sources import CSVSource
 from mlrun.datastore.targets import ParquetTarget
 from mlrun.feature_store.api import infer_from_static_df
 from tests.conftest import tests_root_directory
@@ -99,3 +102,101 @@ def test_backwards_compatibility_step_vs_state():
     assert (
         deepdiff.DeepDiff(from_dict_feature_set.to_dict(), quotes_set.to_dict()) == {}
     )
+
+
+def _assert_stats_equal(stats, expected):
+    assert stats.keys() == expected.keys()
+    for column, column_stats in expected.items():
+        for stat, value in column_stats.items():
+            if stat in ["hist", "top", "freq"] and stat not in stats[column]:
+                continue
+            if stat == "hist":
+                # the accumulated histograms are approximated (from finer bins)
+                counts, bins = stats[column][stat]
+                assert np.allclose(bins, value[1]), f"{column} {stat}"
+                error = np.abs(np.cumsum(counts) - np.cumsum(value[0]))
+                assert error.max() <= 0.02 * sum(value[0]), f"{column} {stat}"
+            elif isinstance(value, float):
+                assert np.isclose(stats[column][stat], value), f"{column} {stat}"
+            else:
+                assert stats[column][stat] == value, f"{column} {stat}"
+
+
+def test_stats_accumulator():
+    df = pd.read_csv(this_dir + "testdata.csv")
+    options = InferOptions.Stats + InferOptions.Histogram
+    stats = DFStatsAccumulator(options)
+    for start in range(0, len(df), 17):
+        stats.update(df.iloc[start : start + 17])
+    _assert_stats_equal(stats.get_stats(), get_df_stats(df, options))
+
+
+def test_stats_accumulator_merge():
+    df = pd.read_csv(this_dir + "testdata.csv")
+    options = InferOptions.Stats + InferOptions.Histogram
+    expected = DFStatsAccumulator(options).update(df).get_stats()
+
+    # merge (serialized) sketches of chunks in a different order
+    stats = DFStatsAccumulator(options)
+    for start in reversed(range(0, len(df), 13)):
+        chunk_stats = DFStatsAccumulator(options).update(df.iloc[start : start + 13])
+        stats.merge(DFStatsAccumulator.from_dict(chunk_stats.to_dict(), options))
+    result = stats.get_stats()
+    for column, column_stats in expected.items():
+        # the top value of equal frequencies depends on the order
+        column_stats.pop("top", None)
+        assert result[column].get("hist") == column_stats.get("hist"), column
+    _assert_stats_equal(result, expected)
+
+    # the number of unique values is approximated when it exceeds max_values
+    ids = pd.DataFrame({"id": [f"id{i}" for i in range(5000)]})
+    stats = DFStatsAccumulator(options, max_values=100)
+    for start in range(0, len(ids), 1000):
+        stats.update(ids.iloc[start : start + 1000])
+    assert abs(stats.get_stats()["id"]["unique"] - 5000) < 250
+
+
+def test_chunked_ingest(monkeypatch, tmpdir):
+    monkeypatch.setattr(fs.FeatureSet, "save", lambda *args, **kwargs: None)
+    monkeypatch.setattr(fs.FeatureSet, "purge_targets", lambda *args, **kwargs: None)
+    results = {}
+    for chunk_size in [None, 17]:
+        featureset = fs.FeatureSet(
+            "testdata", entities=[fs.Entity("patient_id")], engine="pandas"
+        )
+        source = CSVSource("mycsv", path=this_dir + "testdata.csv")
+        target = ParquetTarget(path=f"{tmpdir}/{chunk_size}.parquet")
+        fs.ingest(featureset, source, targets=[target], chunk_size=chunk_size)
+        results[chunk_size] = (pd.read_parquet(target.path), featureset)
+
+    df, featureset = results[None]
+    chunked_df, chunked_featureset = results[17]
+    pd.testing.assert_frame_equal(chunked_df, df)
+    assert chunked_featureset.spec.features.keys() == featureset.spec.features.keys()
+    _assert_stats_equal(chunked_featureset.status.stats, featureset.status.stats)
+
+
+def test_append_ingest_stats(monkeypatch, tmpdir):
+    monkeypatch.setattr(fs.FeatureSet, "save", lambda *args, **kwargs: None)
+    monkeypatch.setattr(fs.FeatureSet, "purge_targets", lambda *args, **kwargs: None)
+    df = pd.read_csv(this_dir + "testdata.csv")
+    featureset = fs.FeatureSet(
+        "testdata", entities=[fs.Entity("patient_id")], engine="pandas"
+    )
+    target = ParquetTarget(path=f"{tmpdir}/appended/")
+    half = len(df) // 2
+    fs.ingest(featureset, df.iloc[:half], targets=[target])
+    # the stats of a (non chunked) ingestion are exact
+    options = InferOptions.Stats + InferOptions.Histogram + InferOptions.Index
+    assert featureset.status.stats == get_df_stats(
+        df.iloc[:half].set_index("patient_id"), options
+    )
+    # and the sketches are only built (from the stored data) when appending
+    assert not featureset.status.stats_sketch
+
+    fs.ingest(featureset, df.iloc[half:], targets=[target], overwrite=False)
+    # the stats of the appended data are merged with the stats of the existing data
+    expected = get_df_stats(df.set_index("patient_id"), options)
+    _assert_stats_equal(featureset.status.stats, expected)
+    assert featureset.status.stats["hr"]["count"] == len(df)
+    assert featureset.status.stats_sketch
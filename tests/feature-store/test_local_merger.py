@@ -0,0 +1,146 @@
+# Copyright 2018 Iguazio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mlrun.datastore.base import split_df
+from mlrun.feature_store import Entity, FeatureSet, FeatureVector
+from mlrun.feature_store.retrieval import LocalFeatureMerger
+from mlrun.utils import logger
+
+
+def _generate_data(entity_rows, featuresets_count, featureset_rows, keys=100):
+    rng = np.random.default_rng(7)
+    start = pd.Timestamp("2021-01-01")
+    entity_df = pd.DataFrame(
+        {
+            "key": rng.integers(0, keys, entity_rows),
+            "time": start + pd.to_timedelta(rng.integers(0, 10 ** 6, entity_rows), "s"),
+        }
+    )
+    featuresets = []
+    featureset_dfs = []
+    for i in range(featuresets_count):
+        featuresets.append(
+            FeatureSet(f"set{i}", entities=[Entity("key")], timestamp_key=f"time{i}")
+        )
+        featureset_df = pd.DataFrame(
+            {
+                "key": rng.integers(0, keys, featureset_rows),
+                f"time{i}": start
+                + pd.to_timedelta(rng.integers(0, 10 ** 6, featureset_rows), "s"),
+                f"value{i}": rng.random(featureset_rows),
+                "shared": rng.integers(0, 10, featureset_rows),
+            }
+        )
+        # timestamps are unique per key so the as-of match is deterministic
+        featureset_df = featureset_df.drop_duplicates(subset=["key", f"time{i}"])
+        featureset_dfs.append(featureset_df.set_index("key"))
+    return entity_df, featuresets, featureset_dfs
+
+
+def _reference_asof_join(entity_df, featuresets, featureset_dfs):
+    merged_df = entity_df.sort_values(by="time")
+    for featureset, featureset_df in zip(featuresets, featureset_dfs):
+        timestamp_key = featureset.spec.timestamp_key
+        featureset_df = featureset_df.reset_index().sort_values(by=timestamp_key)
+        merged_df = pd.merge_asof(
+            merged_df,
+            featureset_df,
+            left_on="time",
+            right_on=timestamp_key,
+            by=list(featureset.spec.entities.keys()),
+        )
+    return merged_df
+
+
+def test_multi_featureset_asof_join():
+    entity_df, featuresets, featureset_dfs = _generate_data(1000, 3, 500)
+    expected = _reference_asof_join(entity_df, featuresets, featureset_dfs)
+
+    merger = LocalFeatureMerger(None)
+    merger.merge(entity_df.copy(), "time", featuresets, featureset_dfs)
+    result = merger.get_df()
+
+    assert list(result.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_chunked_merge():
+    entity_df, featuresets, featureset_dfs = _generate_data(1000, 3, 500)
+    expected = _reference_asof_join(entity_df, featuresets, featureset_dfs)
+    for featureset, featureset_df in zip(featuresets, featureset_dfs):
+        featureset.to_dataframe_chunks = lambda columns=None, chunksize=None, filters=None, df=featureset_df: split_df(
+            df, chunksize
+        )
+    columns = [[(column, None) for column in df.columns] for df in featureset_dfs]
+
+    merger = LocalFeatureMerger(FeatureVector())
+    merger._partition(entity_df.copy(), "time", featuresets, columns, chunk_size=100)
+    chunks = list(merger.get_df_chunks())
+    assert len(chunks) > 1
+
+    # chunks are ordered by key hash, compare the rows regardless of order
+    def sort(df):
+        return df.sort_values(by=["key", "time"], kind="mergesort").reset_index(
+            drop=True
+        )
+
+    result = pd.concat(chunks, ignore_index=True)
+    assert list(result.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(sort(result), sort(expected), check_dtype=False)
+
+
+def test_chunked_merge_buckets_by_largest_input():
+    entity_df, featuresets, featureset_dfs = _generate_data(100, 2, 1000, keys=1000)
+    for featureset, featureset_df in zip(featuresets, featureset_dfs):
+        featureset.to_dataframe_chunks = lambda columns=None, chunksize=None, filters=None, df=featureset_df: split_df(
+            df, chunksize
+        )
+    columns = [[(column, None) for column in df.columns] for df in featureset_dfs]
+
+    merger = LocalFeatureMerger(FeatureVector())
+    merger._partition(entity_df.copy(), "time", featuresets, columns, chunk_size=100)
+    # the feature sets (not the entity rows) determine the bucket size
+    assert merger._buckets == 10
+
+
+@pytest.mark.skipif(
+    not os.environ.get("MLRUN_RUN_BENCHMARKS"), reason="benchmarks are not enabled"
+)
+def test_multi_featureset_asof_join_benchmark():
+    entity_df, featuresets, featureset_dfs = _generate_data(
+        3 * 10 ** 6, 10, 10 ** 6, keys=10 ** 4
+    )
+
+    start = time.monotonic()
+    _reference_asof_join(entity_df, featuresets, featureset_dfs)
+    reference_time = time.monotonic() - start
+
+    start = time.monotonic()
+    merger = LocalFeatureMerger(None)
+    merger.merge(entity_df, "time", featuresets, featureset_dfs)
+    merge_time = time.monotonic() - start
+
+    logger.info(
+        "as-of join benchmark",
+        entity_rows=len(entity_df),
+        featuresets=len(featuresets),
+        reference_secs=round(reference_time, 2),
+        merger_secs=round(merge_time, 2),
+    )
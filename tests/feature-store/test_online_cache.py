@@ -0,0 +1,178 @@
+# Copyright 2018 Iguazio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from inspect import signature
+from types import SimpleNamespace
+
+from storey import QueryByKey, Table
+from storey.drivers import Driver
+
+from mlrun.feature_store import (
+    Entity,
+    FeatureSet,
+    FeatureVector,
+    OnlineFeatureCache,
+    feature_vector,
+    get_online_feature_service,
+)
+from mlrun.feature_store.retrieval import online
+from mlrun.feature_store.retrieval.online import invalidate_online_cache
+from mlrun.features import Feature
+
+
+def test_online_cache_lru():
+    cache = OnlineFeatureCache(max_entries=2)
+    cache.set("stocks", "a", {"x": 1})
+    cache.set("stocks", "b", {"x": 2})
+    assert cache.get("stocks", "a") == {"x": 1}
+    # "b" is the least recently used entity
+    cache.set("stocks", "c", {"x": 3})
+    assert cache.get("stocks", "b") is None
+    assert cache.get("stocks", "c") == {"x": 3}
+    assert cache.stats() == {
+        "hits": 2,
+        "misses": 1,
+        "evictions": 1,
+        "entries": 2,
+        "bytes": cache.stats()["bytes"],
+    }
+
+
+def test_online_cache_max_bytes():
+    cache = OnlineFeatureCache(max_bytes=1000)
+    for i in range(100):
+        cache.set("stocks", i, {"x": i})
+    stats = cache.stats()
+    assert 0 < stats["bytes"] <= 1000
+    assert stats["entries"] < 100 and stats["evictions"] == 100 - stats["entries"]
+
+
+def test_online_cache_ttl():
+    cache = OnlineFeatureCache(ttl=100, featureset_ttl={"quotes": 0.1})
+    cache.set("stocks", "a", {"x": 1})
+    cache.set("quotes", "a", {"y": 1})
+    time.sleep(0.2)
+    assert cache.get("stocks", "a") == {"x": 1}
+    assert cache.get("quotes", "a") is None
+
+
+def test_online_cache_invalidation():
+    cache = OnlineFeatureCache()
+    cache.set("stocks", "a", {"x": 1})
+    cache.set("quotes", "a", {"y": 1})
+    invalidate_online_cache("stocks")
+    assert cache.get("stocks", "a") is None
+    assert cache.get("quotes", "a") == {"y": 1}
+
+
+class _DictDriver(Driver):
+    """online target driver which reads the entities from a dict"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.loads = []
+
+    async def _load_aggregates_by_key(self, container, table_path, key):
+        self.loads.append(key)
+        return None, self.rows.get(key)
+
+
+def _mock_stocks_target(monkeypatch, rows):
+    stocks = FeatureSet("stocks", entities=[Entity("ticker")])
+    stocks.metadata.project = "test-project"
+    for name in ["name", "exchange"]:
+        stocks.spec.features[name] = Feature(name=name)
+    driver = _DictDriver(rows)
+    monkeypatch.setattr(FeatureVector, "save", lambda *args, **kwargs: None)
+    monkeypatch.setattr(
+        feature_vector, "get_feature_set_by_uri", lambda uri, project=None: stocks
+    )
+    monkeypatch.setattr(
+        online,
+        "get_online_target",
+        lambda featureset: SimpleNamespace(
+            get_table_object=lambda: Table("stocks", driver)
+        ),
+    )
+    return driver
+
+
+def test_cached_query_in_online_service(monkeypatch):
+    driver = _mock_stocks_target(
+        monkeypatch, {"GOOG": {"name": "Alphabet Inc", "exchange": "NASDAQ"}}
+    )
+    vector = FeatureVector("vector", ["stocks.*"])
+    service = get_online_feature_service(vector, cache=True)
+    try:
+        rows = [{"ticker": "GOOG"}, {"ticker": "AAPL"}]
+        expected = [{"name": "Alphabet Inc", "exchange": "NASDAQ"}, None]
+        assert service.get(rows) == expected
+        assert service.get(rows) == expected
+    finally:
+        service.close()
+
+    # the entity was read once, the missing entity was not cached
+    assert driver.loads == ["GOOG", "AAPL", "AAPL"]
+    assert service.cache.stats()["entries"] == 1
+    assert service.cache.get("stocks", "GOOG", project="test-project")
+
+    invalidate_online_cache("stocks", "test-project")
+    assert service.cache.stats()["entries"] == 0
+
+
+def test_cached_query_shared_by_vectors(monkeypatch):
+    driver = _mock_stocks_target(
+        monkeypatch, {"GOOG": {"name": "Alphabet Inc", "exchange": "NASDAQ"}}
+    )
+    cache = OnlineFeatureCache()
+    services = [
+        get_online_feature_service(
+            FeatureVector("names", ["stocks.name"]), cache=cache
+        ),
+        get_online_feature_service(
+            FeatureVector("companies", ["stocks.name as company", "stocks.exchange"]),
+            cache=cache,
+        ),
+    ]
+    try:
+        rows = [{"ticker": "GOOG"}]
+        # each vector gets its own columns and aliases from the shared entry
+        for _ in range(2):
+            assert services[0].get(rows) == [{"name": "Alphabet Inc"}]
+            assert services[1].get(rows) == [
+                {"company": "Alphabet Inc", "exchange": "NASDAQ"}
+            ]
+    finally:
+        for service in services:
+            service.close()
+    assert driver.loads == ["GOOG"]
+
+
+def test_cached_query_storey_internals():
+    # CachedQueryByKey replaces these storey internals, fail when they change
+    assert list(signature(QueryByKey._emit_event).parameters) == [
+        "self",
+        "key",
+        "event",
+    ]
+    for name in ["_lazy_load_key_with_aggregates", "_get_static_attrs"]:
+        assert callable(getattr(Table, name, None)), f"storey Table.{name} is missing"
+    step = QueryByKey(
+        ["name"], Table("stocks", _DictDriver({})), key="ticker", aliases={"name": "n"}
+    )
+    assert step._aggrs == []
+    assert step._enrich_with == ["name"]
+    assert step._aliases == {"name": "n"}
+    assert step._augmentation_fn({}, {"x": 1}) == {"x": 1}
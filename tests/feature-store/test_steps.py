@@ -0,0 +1,106 @@
+# Copyright 2018 Iguazio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import pandas as pd
+import pytest
+
+from mlrun.feature_store.steps import (
+    DateExtractor,
+    Imputer,
+    MapValues,
+    OneHotEncoder,
+    do_rows,
+)
+
+data = pd.DataFrame(
+    {
+        "name": ["ab", "cd", "ef", "ab", "cd"],
+        "age": [5, 17, 33, 61, 90],
+        "score": [1.5, np.nan, 3.0, np.nan, 2.5],
+        "time": pd.to_datetime(
+            [
+                "2021-01-01 10:00",
+                "2021-02-28 13:30",
+                "2021-06-15 01:00",
+                "2021-12-31 23:59",
+                "2020-02-29 08:00",
+            ]
+        ),
+    }
+)
+
+
+def _compare(step, df=data):
+    expected = do_rows(step._do_storey, df.copy())
+    result = step.do(df.copy())
+    assert isinstance(result, pd.DataFrame)
+    assert list(result.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(
+        result, expected, check_dtype=False, check_index_type=False
+    )
+    return result
+
+
+@pytest.mark.parametrize("with_original_features", [False, True])
+def test_map_values(with_original_features):
+    step = MapValues(
+        mapping={
+            "name": {"ab": "AB", "ef": "EF"},
+            "age": {
+                "ranges": [
+                    {"range": [0, 18], "value": "child"},
+                    {"range": [18, 65], "value": "adult"},
+                    {"range": [60, 100], "value": "senior"},
+                ]
+            },
+        },
+        with_original_features=with_original_features,
+    )
+    result = _compare(step, data[["name", "age"]])
+    age_column = "age_mapped" if with_original_features else "age"
+    assert list(result[age_column]) == ["child", "child", "adult", "adult", "senior"]
+
+
+def test_imputer():
+    step = Imputer(mapping={"score": 0.5}, default_value="na")
+    df = data[["name", "score"]].copy()
+    df.loc[1, "name"] = None
+    result = step.do(df)
+    assert list(result["score"]) == [1.5, 0.5, 3.0, 0.5, 2.5]
+    assert list(result["name"]) == ["ab", "na", "ef", "ab", "cd"]
+
+    # without nulls the vectorized and per row results are identical
+    _compare(step, data[["name", "age"]])
+
+
+def test_one_hot_encoder():
+    step = OneHotEncoder(mapping={"name": ["ab", "cd", "ef"]})
+    result = _compare(step, data[["name", "age"]])
+    assert list(result.columns) == ["name_ab", "name_cd", "name_ef", "age"]
+    assert list(result["name_cd"]) == [0, 1, 0, 0, 1]
+
+
+@pytest.mark.parametrize("timestamp_col", [None, "time"])
+def test_date_extractor(timestamp_col):
+    parts = ["hour", "day_of_week", "dayofyear", "is_leap_year", "quarter", "week"]
+    step = DateExtractor(parts=parts, timestamp_col=timestamp_col)
+    df = data if timestamp_col else data.rename(columns={"time": "timestamp"})
+    _compare(step, df)
+
+    # the timestamp can be an index level
+    result = step.do(df.set_index(timestamp_col or "timestamp"))
+    assert list(result[f"{timestamp_col or 'timestamp'}_hour"]) == [10, 13, 1, 23, 8]
+
+    with pytest.raises(ValueError):
+        step.do(data[["name"]])
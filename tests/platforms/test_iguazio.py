@@ -1,4 +1,7 @@
+import json
 import os
+import threading
+import time
 from http import HTTPStatus
 from unittest.mock import Mock
 
@@ -9,6 +12,7 @@ import requests
 import mlrun
 import mlrun.errors
 from mlrun.platforms import add_or_refresh_credentials
+from mlrun.platforms.iguazio import OutputStream, _BackgroundPusher
 
 
 def test_add_or_refresh_credentials_iguazio_2_8_success(monkeypatch):
@@ -369,3 +373,86 @@ def test_mount_v3io_extended():
                 )
                 == {}
             )
+
+
+def test_output_stream_background_push():
+    stream = OutputStream(
+        "/container/stream",
+        create=False,
+        background=True,
+        batch_size=2,
+        flush_interval=0.1,
+    )
+    stream._v3io_client = Mock()
+
+    def pushed_batches():
+        return [
+            [json.loads(record["data"])["id"] for record in call[1]["records"]]
+            for call in stream._v3io_client.put_records.call_args_list
+        ]
+
+    # full batches are pushed, the rest is pushed on flush
+    stream.push([{"id": index} for index in range(3)])
+    stream.flush()
+    assert pushed_batches() == [[0, 1], [2]]
+
+    # partial batches are pushed after the flush interval
+    stream.push({"id": 3})
+    deadline = time.monotonic() + 5
+    while len(pushed_batches()) < 3 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert pushed_batches() == [[0, 1], [2], [3]]
+
+
+def test_background_pusher_drops_records_when_full():
+    started = threading.Event()
+    release = threading.Event()
+    pushed = []
+
+    def put_records(records):
+        started.set()
+        release.wait(5)
+        pushed.extend(records)
+
+    pusher = _BackgroundPusher(
+        put_records, queue_size=2, batch_size=1, when_full="drop"
+    )
+    pusher.push([0])
+    started.wait(5)
+    # the first record is being pushed, the queue has room for two more
+    pusher.push([1, 2, 3])
+    assert pusher.dropped == 1
+    release.set()
+    pusher.close()
+    assert pushed == [0, 1, 2]
+    assert pusher.stats() == {"pushed": 3, "dropped": 1, "failed": 0}
+
+
+def test_background_pusher_flush_and_close_when_full():
+    started = threading.Event()
+    release = threading.Event()
+    pushed = []
+
+    def put_records(records):
+        started.set()
+        release.wait(5)
+        pushed.extend(records)
+
+    pusher = _BackgroundPusher(
+        put_records, queue_size=1, batch_size=1, when_full="drop"
+    )
+    pusher.push([0])
+    started.wait(5)
+    pusher.push([1])
+    # the queue is full, flush and close don't wait for free space
+    start = time.monotonic()
+    pusher.flush(timeout=0.2)
+    pusher.close(timeout=0.2)
+    assert time.monotonic() - start < 2
+    assert pushed == []
+
+    # the queued records are pushed, and the background thread stops, once the queue is drained
+    release.set()
+    pusher._thread.join(5)
+    assert not pusher._thread.is_alive()
+    assert pushed == [0, 1]
@@ -1,4 +1,9 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import mlrun
+from mlrun.serving.remote import AsyncRemoteHttpStep
 from mlrun.utils import logger
 from tests.conftest import results
 
@@ -86,3 +91,42 @@ def test_on_error():
     assert (
         resp["error"] and resp["origin_state"] == "Raiser"
     ), f"error wasnt caught, resp={resp}"
+
+
+class _EchoHTTPRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        data = json.dumps({"path": self.path, "body": body}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_async_remote_step():
+    http_server = ThreadingHTTPServer(("127.0.0.1", 0), _EchoHTTPRequestHandler)
+    threading.Thread(target=http_server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{http_server.server_address[1]}"
+
+    function = mlrun.new_function("tests", kind="serving")
+    graph = function.set_topology("flow", engine="async")
+    graph.to("$remote", "remote", url=url, max_in_flight=4, timeout=10).to(
+        name="final", class_name="Echo"
+    ).respond()
+    server = function.to_mock_server()
+
+    remote_step = graph["remote"]
+    assert isinstance(remote_step.async_object, AsyncRemoteHttpStep)
+
+    try:
+        resp = server.test("/x", body={"inputs": [5]})
+        assert resp == {"path": "/x", "body": {"inputs": [5]}}
+    finally:
+        server.wait_for_completion()
+        http_server.shutdown()
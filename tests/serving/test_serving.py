@@ -1,15 +1,20 @@
+import asyncio
 import json
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 
+import pytest
 from nuclio_sdk import Context as NuclioContext
 
 import mlrun
 from mlrun.runtimes import nuclio_init_hook
 from mlrun.runtimes.serving import serving_subkind
-from mlrun.serving import V2ModelServer
+from mlrun.serving import ModelRouter, V2ModelServer
+from mlrun.serving.async_steps import AsyncHandlerStep
 from mlrun.serving.server import GraphContext, MockEvent, create_graph_server
 from mlrun.serving.states import RouterStep, TaskStep
+from mlrun.serving.v2_serving import _PredictBatcher
 from mlrun.utils import logger
 
 
@@ -104,6 +109,31 @@ class EnsembleModelTestingClass(ModelTestingClass):
         return resp
 
 
+class SlowEnsembleModelTestingClass(EnsembleModelTestingClass):
+    def predict(self, request):
+        time.sleep(self.get_param("sleep", 0))
+        return super().predict(request)
+
+
+class AsyncEnsembleModelTestingClass(EnsembleModelTestingClass):
+    async def do_event(self, event, *args, **kwargs):
+        await asyncio.sleep(0.01)
+        return super().do_event(event, *args, **kwargs)
+
+
+class BatchingModelTestingClass(V2ModelServer):
+    batch_sizes = []
+
+    def load(self):
+        print("loading")
+
+    def predict(self, request):
+        # simulate a vectorized model with a fixed per call overhead
+        time.sleep(0.005)
+        self.batch_sizes.append(len(request["inputs"]))
+        return [value * 2 for value in request["inputs"]]
+
+
 class RaiserTestingClass(V2ModelServer):
     def load(self):
         print("loading..")
@@ -176,6 +206,233 @@ def test_ensemble_infer():
     run_model("", 1250.0)
 
 
+def _generate_slow_ensemble_spec(**class_args):
+    slow_ensemble = RouterStep(
+        class_name="mlrun.serving.routers.VotingEnsemble",
+        class_args={
+            "vote_type": "regression",
+            "prediction_col_name": "predictions",
+            **class_args,
+        },
+    )
+    slow_ensemble.routes = generate_test_routes("SlowEnsembleModelTestingClass")
+    slow_ensemble.routes["m3:v2"].class_args["sleep"] = 3
+    return generate_spec(slow_ensemble.to_dict())
+
+
+def test_ensemble_infer_with_timeout():
+    context = init_ctx(_generate_slow_ensemble_spec(route_timeout=1))
+    event = MockEvent(testdata, path="/v2/models/infer")
+    resp = context.mlrun_handler(context, event)
+    data = json.loads(resp.body)
+    # the slow model (m3:v2) is excluded from the vote
+    assert data["outputs"] == {"predictions": [1000.0]}
+
+
+def test_ensemble_infer_with_quorum():
+    context = init_ctx(_generate_slow_ensemble_spec(quorum=3))
+    event = MockEvent(testdata, path="/v2/models/infer")
+    start = time.monotonic()
+    resp = context.mlrun_handler(context, event)
+    data = json.loads(resp.body)
+    assert time.monotonic() - start < 3, "ensemble waited for the slow model"
+    assert data["outputs"] == {"predictions": [1000.0]}
+
+
+def test_ensemble_infer_asyncio_executor():
+    context = init_ctx(_generate_slow_ensemble_spec(executor_type="asyncio"))
+    event = MockEvent(testdata, path="/v2/models/infer")
+    resp = context.mlrun_handler(context, event)
+    data = json.loads(resp.body)
+    assert data["outputs"] == {"predictions": [1250.0]}
+
+
+def test_ensemble_asyncio_executor_async_models():
+    ensemble = RouterStep(
+        class_name="mlrun.serving.routers.VotingEnsemble",
+        class_args={
+            "vote_type": "regression",
+            "prediction_col_name": "predictions",
+            "executor_type": "asyncio",
+        },
+    )
+    ensemble.routes = generate_test_routes("AsyncEnsembleModelTestingClass")
+    context = init_ctx(generate_spec(ensemble.to_dict()))
+    resp = context.mlrun_handler(context, MockEvent(testdata, path="/v2/models/infer"))
+    assert json.loads(resp.body)["outputs"] == {"predictions": [1250.0]}
+    # the async models are awaited on the loop, not in the pool threads
+    assert not context.server.graph._object._pool._threads
+    context.server.graph._object.close()
+
+
+def test_ensemble_skips_saturated_model():
+    context = init_ctx(
+        _generate_slow_ensemble_spec(route_timeout=1, max_concurrent_requests=1)
+    )
+    context.mlrun_handler(context, MockEvent(testdata, path="/v2/models/infer"))
+
+    # the slow model call is still in flight, the next request doesnt wait for it
+    start = time.monotonic()
+    resp = context.mlrun_handler(context, MockEvent(testdata, path="/v2/models/infer"))
+    assert time.monotonic() - start < 1, "ensemble waited for the saturated model"
+    assert json.loads(resp.body)["outputs"] == {"predictions": [1000.0]}
+
+
+def test_ensemble_close():
+    context = init_ctx(ensemble_spec)
+    ensemble = context.server.graph._object
+    context.mlrun_handler(context, MockEvent(testdata, path="/v2/models/infer"))
+    pool = ensemble._pool
+
+    ensemble.close()
+    assert pool._shutdown, "models pool was not shutdown"
+
+    # the pool is re-created on the next request
+    resp = context.mlrun_handler(context, MockEvent(testdata, path="/v2/models/infer"))
+    assert json.loads(resp.body)["outputs"] == {"predictions": [1250.0]}
+    ensemble.close()
+
+
+def _generate_batching_spec(max_batch_size):
+    return generate_spec(
+        {
+            "kind": "router",
+            "routes": {
+                "m1": {
+                    "class_name": "BatchingModelTestingClass",
+                    "class_args": {
+                        "model_path": "",
+                        "max_batch_size": max_batch_size,
+                        "max_wait_ms": 20,
+                    },
+                },
+            },
+        }
+    )
+
+
+def _run_concurrent_requests(context, count, workers=16):
+    def infer(value):
+        event = MockEvent(json.dumps({"inputs": [value]}), path="/v2/models/m1/infer")
+        resp = context.mlrun_handler(context, event)
+        return json.loads(resp.body)["outputs"]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(infer, range(count)))
+
+
+def test_v2_micro_batching():
+    BatchingModelTestingClass.batch_sizes = []
+    context = init_ctx(_generate_batching_spec(8))
+    outputs = _run_concurrent_requests(context, 64)
+    assert outputs == [[value * 2] for value in range(64)], "wrong batched outputs"
+    sizes = BatchingModelTestingClass.batch_sizes
+    assert sum(sizes) == 64, "not all the inputs were predicted"
+    assert max(sizes) > 1, "requests were not batched"
+    assert max(sizes) <= 8, "batch exceeded max_batch_size"
+
+
+class _BatchRecorder:
+    def __init__(self):
+        self.requests = []
+
+    def predict(self, request):
+        self.requests.append(request)
+        return [value * request.get("multiplier", 1) for value in request["inputs"]]
+
+
+def test_v2_micro_batching_batches():
+    model = _BatchRecorder()
+    batcher = _PredictBatcher(model, max_batch_size=4, max_wait_ms=200)
+    requests = [
+        {"id": 1, "inputs": [1, 2, 3]},
+        {"id": 2, "inputs": [4, 5]},  # exceeds max_batch_size with the 1st request
+        {"id": 3, "inputs": [6], "multiplier": 10},  # different fields
+        {"id": 4},  # bad request, fails alone
+        {"id": 5, "inputs": [7], "multiplier": 10},
+    ]
+    futures = [batcher._submit(request) for request in requests]
+
+    assert futures[0].result() == [1, 2, 3]
+    assert futures[1].result() == [4, 5]
+    assert futures[2].result() == [60]
+    with pytest.raises(KeyError):
+        futures[3].result()
+    assert futures[4].result() == [70]
+    assert [request["inputs"] for request in model.requests] == [
+        [1, 2, 3],
+        [4, 5],
+        [6, 7],
+    ]
+
+
+@pytest.mark.parametrize("with_router", [False, True])
+def test_v2_micro_batching_async_flow(with_router):
+    BatchingModelTestingClass.batch_sizes = []
+    function = mlrun.new_function("tests", kind="serving")
+    graph = function.set_topology("flow", engine="async")
+    class_args = {"model_path": "", "max_batch_size": 8, "max_wait_ms": 20}
+    if with_router:
+        router = graph.add_step("*", name="router").respond()
+        router.add_route("m1", class_name="BatchingModelTestingClass", **class_args)
+        path = "/v2/models/m1/infer"
+    else:
+        graph.to("BatchingModelTestingClass", "m1", **class_args).respond()
+        path = "/infer"
+    server = function.to_mock_server()
+
+    def infer(value):
+        return server.test(path, body={"inputs": [value]})["outputs"]
+
+    try:
+        step = graph["router" if with_router else "m1"]
+        assert isinstance(step.async_object, AsyncHandlerStep)
+        # concurrent events are handled concurrently by the flow (and batched)
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            outputs = list(executor.map(infer, range(64)))
+    finally:
+        server.wait_for_completion()
+    assert outputs == [[value * 2] for value in range(64)], "wrong batched outputs"
+    sizes = BatchingModelTestingClass.batch_sizes
+    assert sum(sizes) == 64, "not all the inputs were predicted"
+    assert max(sizes) > 1, "requests were not batched"
+    assert max(sizes) <= 8, "batch exceeded max_batch_size"
+
+
+class _CustomRouter(ModelRouter):
+    def _handle_event(self, event):
+        event.body = {"handled_by": "custom"}
+        return event
+
+
+def test_router_async_custom_handle_event():
+    # routers with their own event handling are not bypassed in async flows
+    router = _CustomRouter(GraphContext(), "router", routes={})
+    assert router.max_in_flight is None
+    event = MockEvent({"inputs": [1]}, path="/v2/models/m1/infer")
+    event = asyncio.run(router.do_event_async(event))
+    assert event.body == {"handled_by": "custom"}
+
+
+@pytest.mark.skipif(
+    not os.environ.get("MLRUN_RUN_BENCHMARKS"), reason="benchmarks are not enabled"
+)
+def test_v2_micro_batching_benchmark():
+    # throughput vs batch size, the outputs must be the same for every batch size
+    count = 256
+    for max_batch_size in [1, 4, 16, 64]:
+        context = init_ctx(_generate_batching_spec(max_batch_size))
+        start = time.monotonic()
+        outputs = _run_concurrent_requests(context, count, workers=64)
+        throughput = count / (time.monotonic() - start)
+        logger.info(
+            "micro-batching throughput",
+            max_batch_size=max_batch_size,
+            requests_per_sec=round(throughput, 1),
+        )
+        assert outputs == [[value * 2] for value in range(count)]
+
+
 def test_v2_infer():
     def run_model(url, expected):
         event = MockEvent(testdata, path=f"/v2/models/{url}/infer")
@@ -159,6 +159,17 @@ class TestFeatureStore(TestMLRunSystem):
         assert (
             len(resp2[0]) == features_size - 1
         ), "unexpected online vector size"  # -1 label
+
+        # duplicate and missing entities in a bulk lookup
+        resp = svc.get([{"ticker": "AAPL"}, {"ticker": "a"}, {"ticker": "AAPL"}])
+        assert resp[1] is None
+        assert resp[0] == resp[2] and resp[0] is not resp[2]
+        df = svc.get_df(
+            pd.DataFrame({"ticker": ["AAPL", "a", "MSFT"]}, index=["x", "y", "z"])
+        )
+        assert list(df.index) == ["x", "y", "z"]
+        assert df.loc["x", "name"] == "Apple Inc" and df.loc["y"].isnull().all()
+        assert df.shape[1] >= features_size - 1, "unexpected online vector size"
         svc.close()
 
     def test_ingest_and_query(self):
@@ -15,10 +15,13 @@ from os import listdir
 from tempfile import TemporaryDirectory
 from unittest.mock import Mock
 
+import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 import pytest
 
 import mlrun
+import mlrun.datastore.utils
 import mlrun.errors
 from tests.conftest import rundb_path
 
@@ -220,3 +223,57 @@ def test_fsspec():
         assert len(files) == 2, "2 test files were not written"
         assert files[0].endswith("x.txt"), "wrong file name"
         assert fs.open(tmpdir + "/1x.txt", "r").read() == "123", "wrong file content"
+
+
+def test_parquet_filters():
+    keys_df = pd.DataFrame({"key": range(100), "value": [x * 10 for x in range(100)]})
+    with TemporaryDirectory() as tmpdir:
+        path = tmpdir + "/data.parquet"
+        keys_df.to_parquet(path, row_group_size=10)
+
+        filters = [("key", "in", [5, 7, 42]), ("value", ">", 60)]
+        parquet_file = pq.ParquetFile(path)
+        assert mlrun.datastore.utils.filter_row_groups(parquet_file, filters) == [
+            0,
+            4,
+        ], "row groups were not skipped using statistics"
+
+        data_item = mlrun.get_dataitem(path)
+        result = data_item.as_df(columns=["value"], filters=filters)
+        assert list(result.columns) == ["value"], "filter column was not dropped"
+        assert result["value"].tolist() == [70, 420], "wrong filtered rows"
+
+        chunks = list(data_item.as_df_chunks(chunksize=1, filters=filters))
+        assert [chunk["key"].tolist() for chunk in chunks] == [[7], [42]]
+
+        csv_path = tmpdir + "/data.csv"
+        keys_df.to_csv(csv_path, index=False)
+        result = mlrun.get_dataitem(csv_path).as_df(filters=[("key", "<", 3)])
+        assert result["key"].tolist() == [0, 1, 2], "wrong filtered csv rows"
+
+
+def test_memory_mapped_reads(tmp_path):
+    keys_df = pd.DataFrame({"key": range(100), "value": [x * 10 for x in range(100)]})
+    for format in ["parquet", "feather"]:
+        path = str(tmp_path / f"data.{format}")
+        getattr(keys_df, f"to_{format}")(path)
+        result = mlrun.get_dataitem(path).as_df(
+            columns=["value"], filters=[("key", "<", 3)]
+        )
+        assert result["value"].tolist() == [0, 10, 20], f"wrong {format} rows"
+        pd.testing.assert_frame_equal(mlrun.get_dataitem(path).as_df(), keys_df)
+
+    path = str(tmp_path / "data.npy")
+    array = np.arange(1000, dtype="float32")
+    np.save(path, array)
+    data_item = mlrun.get_dataitem(path)
+    mapped = data_item.as_ndarray(mmap_mode="r")
+    assert isinstance(mapped, np.memmap)
+    np.testing.assert_array_equal(mapped, array)
+
+    view = data_item.get(as_memoryview=True)
+    assert isinstance(view, memoryview) and view.readonly
+    assert view.tobytes() == data_item.get()
+    assert data_item.get(size=10, offset=5, as_memoryview=True) == data_item.get(
+        size=10, offset=5
+    )
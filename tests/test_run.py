@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import gc
 import pathlib
 from unittest.mock import Mock
 
@@ -316,3 +317,71 @@ def test_local_args():
     print(state)
     print(log)
     assert log.find(", '--xyz', '789']") != -1, "params not detected in argv"
+
+
+def test_context_db_updates_coalescing(monkeypatch):
+    db = Mock()
+    monkeypatch.setattr(mlrun.mlconf, "run_db_updates_interval", "3600")
+    context = mlrun.MLClientCtx.from_dict(
+        {
+            "metadata": {"name": "coalesce", "uid": "some-uid", "project": "prj"},
+            "spec": {"output_path": out_path},
+        },
+        rundb=db,
+    )
+    # the first update is stored
+    assert db.store_run.call_count == 1
+
+    for epoch in range(100):
+        context.log_result(f"loss-{epoch}", epoch, commit=True)
+        context.log_artifact(f"chart-{epoch}", body="abc", upload=False)
+    assert db.store_run.call_count == 1
+    assert db.update_run.call_count == 0
+    assert db.store_artifact.call_count == db.store_artifacts.call_count == 0
+
+    # state changes are sent immediately, only the changed fields are sent
+    context.set_state("completed", commit=False)
+    context.commit()
+    assert db.store_artifacts.call_count == 1
+    assert len(db.store_artifacts.call_args[0][0]) == 100
+    assert db.update_run.call_count == 1
+    updates = db.update_run.call_args[0][0]
+    assert updates["status.state"] == "completed"
+    assert len(updates["status.results"]) == 100
+    assert "spec.parameters" not in updates
+    assert db.store_run.call_count == 1
+
+    # commit() sends the pending updates immediately
+    context.log_result("accuracy", 0.9)
+    context.commit()
+    assert db.update_run.call_count == 2
+    assert db.update_run.call_args[0][0]["status.results"]["accuracy"] == 0.9
+
+
+def test_context_run_updates():
+    stored = {"status": {"state": "error", "error": "failed"}, "spec": {"x": 1}}
+    assert mlrun.execution._run_updates(
+        stored, {"status": {"state": "running", "error": "failed"}, "spec": {"x": 1}}
+    ) == {"status.state": "running"}
+    # removed fields would be stored as null, the run is stored again
+    assert (
+        mlrun.execution._run_updates(
+            stored, {"status": {"state": "running"}, "spec": {"x": 1}}
+        )
+        is None
+    )
+
+
+def test_context_pending_db_updates_are_flushed(monkeypatch):
+    db = Mock()
+    monkeypatch.setattr(mlrun.mlconf, "run_db_updates_interval", "3600")
+    context = mlrun.MLClientCtx.from_dict(
+        {"metadata": {"name": "pending", "uid": "pending-uid", "project": "prj"}},
+        rundb=db,
+    )
+    context.log_result("accuracy", 0.9, commit=True)
+    # the released context is referenced until its updates are sent
+    del context
+    gc.collect()
+    mlrun.execution._flush_pending_db_updates()
+    assert db.update_run.call_args[0][0]["status.results"] == {"accuracy": 0.9}